@@ -14,7 +14,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.core.database import Base
 from app.core.config import settings
-from app.models import client, transaction, operation  # Import models to ensure they are registered
+from app.models import client, transaction, operation, transaction_daily_stats, kpi_counters  # Import models to ensure they are registered
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,35 @@
+"""Add client search indexes
+
+Revision ID: 2d7e5b9a4c61
+Revises: 9f3a6c2e8d15
+Create Date: 2026-10-18 12:26:54.118730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7e5b9a4c61'
+down_revision: Union[str, Sequence[str], None] = '9f3a6c2e8d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index('idx_client_name_trgm', 'clients', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_client_region_trgm', 'clients', ['region'], unique=False, postgresql_using='gin', postgresql_ops={'region': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_client_name_prefix', 'clients', [sa.text('(lower(name) COLLATE "C")'), 'client_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_client_name_prefix', table_name='clients', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_client_region_trgm', table_name='clients', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_client_name_trgm', table_name='clients', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""Index operations by coalesced last_updated
+
+Revision ID: 3c8e5a1f7b92
+Revises: f2a9c7d4e813
+Create Date: 2026-10-18 23:02:47.660318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e5a1f7b92'
+down_revision: Union[str, Sequence[str], None] = 'f2a9c7d4e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # last_updated is nullable, and a row comparison skips NULL keys, so the operations
+    # keyset orders by COALESCE(last_updated, '-infinity') instead
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_operation_updated_id', table_name='operations', postgresql_concurrently=True, if_exists=True)
+        op.create_index('idx_operation_updated_id', 'operations', [sa.text("COALESCE(last_updated, '-infinity'::timestamp)"), 'operation_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_operation_updated_id', table_name='operations', postgresql_concurrently=True, if_exists=True)
+        op.create_index('idx_operation_updated_id', 'operations', ['last_updated', 'operation_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,148 @@
+"""Partition transactions by month
+
+Revision ID: 5e1b7c3d9a20
+Revises: 2d7e5b9a4c61
+Create Date: 2026-10-18 18:12:40.207315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1b7c3d9a20'
+down_revision: Union[str, Sequence[str], None] = '2d7e5b9a4c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Created on the partitioned parent, so every partition gets its own copy
+TRANSACTION_INDEXES = [
+    ('idx_transaction_client_date', ['client_id', 'transaction_date']),
+    ('idx_transaction_timestamp', ['transaction_date']),
+    ('idx_transaction_date_id', ['transaction_date', 'transaction_id']),
+    ('ix_transactions_client_id', ['client_id']),
+    ('ix_transactions_sla_breach_flag', ['sla_breach_flag']),
+    ('ix_transactions_status', ['status']),
+    ('ix_transactions_transaction_date', ['transaction_date']),
+    ('ix_transactions_transaction_id', ['transaction_id']),
+]
+
+# Months ahead of the current one that get a partition up front
+MONTHS_AHEAD = 3
+
+# Creates the missing monthly partitions between two months (inclusive). Rows that
+# already sit in the default partition for a new month are moved into it first.
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_transaction_partitions(first_month date, last_month date)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date := date_trunc('month', first_month);
+    month_end date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    -- One caller at a time, so concurrent app instances don't race on CREATE TABLE
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_transaction_partitions'));
+    WHILE month_start <= last_month LOOP
+        month_end := month_start + interval '1 month';
+        partition_name := 'transactions_' || to_char(month_start, 'YYYY_MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM transactions_default WHERE transaction_date >= %L AND transaction_date < %L RETURNING *) '
+                || 'INSERT INTO %I SELECT * FROM moved',
+                month_start, month_end, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rebuilt rather than altered: an existing table can't be turned into a partitioned one.
+    # The primary key has to include the partition key, so it becomes (transaction_id, transaction_date).
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_unpartitioned_pkey")
+    op.execute("""
+        CREATE TABLE transactions (
+            transaction_id VARCHAR NOT NULL,
+            client_id INTEGER,
+            amount DOUBLE PRECISION,
+            currency VARCHAR,
+            status VARCHAR,
+            transaction_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            sla_breach_flag BOOLEAN,
+            CONSTRAINT transactions_pkey PRIMARY KEY (transaction_id, transaction_date),
+            CONSTRAINT transactions_client_id_fkey FOREIGN KEY (client_id) REFERENCES clients (client_id)
+        ) PARTITION BY RANGE (transaction_date)
+    """)
+    # Catches rows for months without a partition yet; ensure_transaction_partitions moves them out
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    # A partition for every month that has data, and for the months ahead
+    op.execute("""
+        SELECT ensure_transaction_partitions(CAST(month AS DATE), CAST(month AS DATE))
+        FROM (SELECT DISTINCT date_trunc('month', transaction_date) AS month FROM transactions_unpartitioned) months
+        WHERE month IS NOT NULL
+        ORDER BY month
+    """)
+    op.execute(f"""
+        SELECT ensure_transaction_partitions(
+            CAST(date_trunc('month', timezone('utc', now())) AS DATE),
+            CAST(date_trunc('month', timezone('utc', now())) + interval '{MONTHS_AHEAD} months' AS DATE)
+        )
+    """)
+    op.execute("""
+        INSERT INTO transactions (transaction_id, client_id, amount, currency, status, transaction_date, sla_breach_flag)
+        SELECT transaction_id, client_id, amount, currency, status, COALESCE(transaction_date, timezone('utc', now())), sla_breach_flag
+        FROM transactions_unpartitioned
+    """)
+    op.drop_table('transactions_unpartitioned')
+    # Built after the copy, which is much faster than maintaining them row by row
+    for name, columns in TRANSACTION_INDEXES:
+        op.create_index(name, 'transactions', columns, unique=False)
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_partitioned_pkey")
+    for name, _ in TRANSACTION_INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+    op.create_table('transactions',
+    sa.Column('transaction_id', sa.String(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('currency', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('transaction_date', sa.DateTime(), nullable=True),
+    sa.Column('sla_breach_flag', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.client_id'], name='transactions_client_id_fkey'),
+    sa.PrimaryKeyConstraint('transaction_id', name='transactions_pkey')
+    )
+    # Ids are only unique per (id, date) while partitioned; keep the first row of each id
+    op.execute("""
+        INSERT INTO transactions (transaction_id, client_id, amount, currency, status, transaction_date, sla_breach_flag)
+        SELECT DISTINCT ON (transaction_id) transaction_id, client_id, amount, currency, status, transaction_date, sla_breach_flag
+        FROM transactions_partitioned
+        ORDER BY transaction_id, transaction_date
+    """)
+    op.execute("DROP TABLE transactions_partitioned")
+    op.execute("DROP FUNCTION ensure_transaction_partitions(date, date)")
+    for name, columns in TRANSACTION_INDEXES:
+        op.create_index(name, 'transactions', columns, unique=False)
+    op.execute("ANALYZE transactions")
@@ -0,0 +1,50 @@
+"""Add transaction_daily_stats rollup
+
+Revision ID: 7b2d4f9c1a03
+Revises: e1997e7f093b
+Create Date: 2026-10-18 10:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d4f9c1a03'
+down_revision: Union[str, Sequence[str], None] = 'e1997e7f093b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('volume', sa.Float(), nullable=False),
+    sa.Column('txn_count', sa.Integer(), nullable=False),
+    sa.Column('failed_count', sa.Integer(), nullable=False),
+    sa.Column('breach_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('day')
+    )
+    # Seed from existing rows; scripts/backfill_daily_stats.py rebuilds it later if needed
+    op.execute("""
+        INSERT INTO transaction_daily_stats (day, volume, txn_count, failed_count, breach_count, updated_at)
+        SELECT
+            CAST(transaction_date AS DATE),
+            COALESCE(SUM(amount), 0),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE status = 'Failed'),
+            COUNT(*) FILTER (WHERE sla_breach_flag),
+            NOW()
+        FROM transactions
+        WHERE transaction_date IS NOT NULL
+        GROUP BY CAST(transaction_date AS DATE)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_daily_stats')
@@ -0,0 +1,33 @@
+"""Add client prefix search indexes
+
+Revision ID: 7e4c1b9d2a36
+Revises: 3c8e5a1f7b92
+Create Date: 2026-10-19 10:14:52.308417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e4c1b9d2a36'
+down_revision: Union[str, Sequence[str], None] = '3c8e5a1f7b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Search reads name prefix and region prefix matches first, in index order
+    with op.get_context().autocommit_block():
+        op.create_index('idx_client_name_prefix', 'clients', [sa.text('(lower(name) COLLATE "C")'), 'client_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_client_region_prefix', 'clients', [sa.text('(lower(region) COLLATE "C")'), 'client_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_client_region_prefix', table_name='clients', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_client_name_prefix', table_name='clients', postgresql_concurrently=True, if_exists=True)
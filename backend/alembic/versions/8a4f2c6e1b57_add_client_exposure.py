@@ -0,0 +1,59 @@
+"""Add client_exposure rollup
+
+Revision ID: 8a4f2c6e1b57
+Revises: 5e1b7c3d9a20
+Create Date: 2026-10-18 19:05:33.481726
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4f2c6e1b57'
+down_revision: Union[str, Sequence[str], None] = '5e1b7c3d9a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('client_exposure',
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('total_exposure', sa.Float(), nullable=False),
+    sa.Column('txn_count', sa.Integer(), nullable=False),
+    sa.Column('region_rank', sa.Integer(), nullable=True),
+    sa.Column('exposure_quartile', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('client_id')
+    )
+    # Seed from existing rows and rank them; scripts/rebuild_client_exposure.py rebuilds it later if needed
+    op.execute("""
+        INSERT INTO client_exposure (client_id, total_exposure, txn_count, updated_at)
+        SELECT client_id, COALESCE(SUM(amount), 0), COUNT(*), NOW()
+        FROM transactions
+        WHERE client_id IS NOT NULL
+        GROUP BY client_id
+    """)
+    op.execute("""
+        UPDATE client_exposure e
+        SET region_rank = r.region_rank, exposure_quartile = r.exposure_quartile
+        FROM (
+            SELECT
+                e.client_id,
+                DENSE_RANK() OVER (PARTITION BY c.region ORDER BY e.total_exposure DESC) AS region_rank,
+                NTILE(4) OVER (ORDER BY e.total_exposure DESC, e.client_id) AS exposure_quartile
+            FROM client_exposure e
+            JOIN clients c ON c.client_id = e.client_id
+        ) r
+        WHERE e.client_id = r.client_id
+    """)
+    op.create_index('idx_client_exposure_total', 'client_exposure', ['total_exposure'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_client_exposure_total', table_name='client_exposure')
+    op.drop_table('client_exposure')
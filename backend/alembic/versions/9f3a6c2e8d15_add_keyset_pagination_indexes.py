@@ -0,0 +1,33 @@
+"""Add keyset pagination indexes
+
+Revision ID: 9f3a6c2e8d15
+Revises: c4e8a1d2f6b7
+Create Date: 2026-10-18 11:47:05.331862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3a6c2e8d15'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a1d2f6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so large tables stay writable; CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('idx_transaction_date_id', 'transactions', ['transaction_date', 'transaction_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_operation_updated_id', 'operations', ['last_updated', 'operation_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_operation_updated_id', table_name='operations', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_transaction_date_id', table_name='transactions', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,46 @@
+"""Add transaction_ids uniqueness guard
+
+Revision ID: b6d3f1a8e240
+Revises: 8a4f2c6e1b57
+Create Date: 2026-10-18 21:40:12.583104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d3f1a8e240'
+down_revision: Union[str, Sequence[str], None] = '8a4f2c6e1b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Since partitioning only (transaction_id, transaction_date) was unique, so a resent
+    # transaction with a different date was stored again. Keep the earliest copy of each id.
+    removed = op.get_bind().execute(sa.text("""
+        DELETE FROM transactions t
+        USING (
+            SELECT tableoid, ctid, ROW_NUMBER() OVER (PARTITION BY transaction_id ORDER BY transaction_date) AS copy
+            FROM transactions
+        ) d
+        WHERE t.tableoid = d.tableoid AND t.ctid = d.ctid AND d.copy > 1
+    """)).rowcount
+    if removed:
+        # The rollups counted the duplicates too
+        print(f"Removed {removed} duplicate transactions; rebuild the rollups with scripts/backfill_daily_stats.py, "
+              "scripts/rebuild_client_exposure.py and scripts/reconcile_kpis.py --fix")
+    op.create_table('transaction_ids',
+    sa.Column('transaction_id', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('transaction_id')
+    )
+    op.execute("INSERT INTO transaction_ids (transaction_id) SELECT transaction_id FROM transactions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_ids')
@@ -0,0 +1,47 @@
+"""Add kpi_counters
+
+Revision ID: c4e8a1d2f6b7
+Revises: 7b2d4f9c1a03
+Create Date: 2026-10-18 11:02:17.548392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1d2f6b7'
+down_revision: Union[str, Sequence[str], None] = '7b2d4f9c1a03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('kpi_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total_volume', sa.Float(), nullable=False),
+    sa.Column('total_transactions', sa.Integer(), nullable=False),
+    sa.Column('breach_count', sa.Integer(), nullable=False),
+    sa.Column('high_risk_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Seed the single row from existing data
+    op.execute("""
+        INSERT INTO kpi_counters (id, total_volume, total_transactions, breach_count, high_risk_count, updated_at)
+        SELECT
+            1,
+            (SELECT COALESCE(SUM(amount), 0) FROM transactions),
+            (SELECT COUNT(*) FROM transactions),
+            (SELECT COUNT(*) FROM transactions WHERE sla_breach_flag = true),
+            (SELECT COUNT(*) FROM clients WHERE risk_rating = 'High'),
+            NOW()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('kpi_counters')
@@ -0,0 +1,32 @@
+"""Drop client name prefix index
+
+Revision ID: f2a9c7d4e813
+Revises: b6d3f1a8e240
+Create Date: 2026-10-18 22:31:05.117942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c7d4e813'
+down_revision: Union[str, Sequence[str], None] = 'b6d3f1a8e240'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Short search terms match name or region substrings again, in client_id order,
+    # so nothing searches by name prefix any more
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_client_name_prefix', table_name='clients', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('idx_client_name_prefix', 'clients', [sa.text('(lower(name) COLLATE "C")'), 'client_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,190 @@
+import io
+import os
+import threading
+from typing import IO, Iterator, List, Sequence
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer
+from sqlalchemy.sql import Select
+from app.core.copy_io import copy_query_to_csv
+from app.core.database import SessionLocal
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for the arrow/parquet formats
+    pa = None
+
+COLUMNAR_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+class ColumnarUnavailable(RuntimeError):
+    pass
+
+def require_pyarrow():
+    if pa is None:
+        raise ColumnarUnavailable("Arrow and Parquet support requires the 'pyarrow' package")
+
+def arrow_type(column: Column):
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+def arrow_schema(columns: Sequence[Column]):
+    return pa.schema([pa.field(column.name, arrow_type(column)) for column in columns])
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that keeps what the Arrow writers emit until it is drained
+    into the response, so encoded output never piles up beyond one batch.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+class _CopyPipe:
+    """
+    COPY output read through an OS pipe while a thread runs the COPY, so Arrow
+    parses each block as Postgres produces it rather than after the whole result.
+    """
+
+    def __init__(self, query: Select):
+        read_fd, write_fd = os.pipe()
+        self.reader = os.fdopen(read_fd, "rb")
+        self._writer = os.fdopen(write_fd, "wb")
+        self._error = None
+        self._thread = threading.Thread(target=self._copy, args=(query,), daemon=True)
+        self._thread.start()
+
+    def _copy(self, query: Select):
+        db = SessionLocal()
+        try:
+            copy_query_to_csv(db, query, self._writer)
+            self._writer.flush()
+        except Exception as e:
+            self._error = e
+        finally:
+            db.close()
+            # EOF for the reader (or nothing, if it is already gone)
+            try:
+                self._writer.close()
+            except OSError:
+                pass
+
+    def finish(self):
+        """
+        Wait for the COPY after the reader hit EOF and raise its error, if any, so a
+        failed query isn't mistaken for a short result.
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        # Closing the read end makes a COPY still writing fail with a broken pipe and stop
+        self.reader.close()
+        self._thread.join()
+
+def _csv_batches(data: IO[bytes], schema, block_size: int):
+    """
+    Parse COPY CSV into record batches in Arrow's C++ reader, typed by schema.
+    """
+    return pa_csv.open_csv(
+        data,
+        read_options=pa_csv.ReadOptions(column_names=schema.names, block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=schema,
+            true_values=["t"],
+            false_values=["f"],
+            # COPY writes NULL as an unquoted empty field and empty strings quoted.
+            # Only that is null: Arrow's default list would also null "NA", "null", ...
+            null_values=[""],
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+
+def columnar_export(fmt: str, query: Select, columns: Sequence[Column], block_size: int = 8 * 1024 * 1024) -> Iterator[bytes]:
+    """
+    Stream the result of `query` as an Arrow IPC stream or a Parquet file.
+    Postgres writes CSV with COPY into a pipe, Arrow parses it column-wise in blocks
+    of block_size bytes, and each batch is encoded and handed out before the next is
+    read, so at most about one block is held. Each Parquet row group holds one block.
+    Sync generator: StreamingResponse runs it on the threadpool.
+    """
+    require_pyarrow()
+    schema = arrow_schema(columns)
+    copy = _CopyPipe(query)
+    try:
+        sink = _ChunkSink()
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(sink, schema)
+        else:
+            writer = pa_ipc.new_stream(sink, schema)
+        with writer:
+            # An empty result (or a COPY that failed at once) is no CSV at all, which
+            # Arrow's reader rejects; the output is then just the schema
+            if copy.reader.peek(1):
+                for batch in _csv_batches(copy.reader, schema, block_size):
+                    writer.write_batch(batch)
+                    yield sink.drain()
+            # Before the footer/end-of-stream goes out, so a failed COPY leaves the output incomplete
+            copy.finish()
+        yield sink.drain()
+    finally:
+        copy.close()
+
+def parquet_batches(source: IO[bytes], columns: Sequence[Column], batch_size: int) -> Iterator["pa.Table"]:
+    """
+    Read a Parquet file in batches, keeping the model's columns (in model order)
+    and casting them to its types. Columns missing from the file come back null.
+    Raises ValueError for files that can't be read or converted.
+    """
+    require_pyarrow()
+    schema = arrow_schema(columns)
+    try:
+        parquet_file = pq.ParquetFile(source)
+        present = [name for name in schema.names if name in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=present):
+            table = pa.Table.from_batches([batch])
+            arrays = [
+                table.column(field.name).cast(field.type) if field.name in present else pa.nulls(table.num_rows, field.type)
+                for field in schema
+            ]
+            yield pa.Table.from_arrays(arrays, schema=schema)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, OSError) as e:
+        raise ValueError(f"Unreadable Parquet input: {e}")
+
+def table_to_csv(table) -> io.BytesIO:
+    """
+    Headerless CSV in the shape COPY ... FROM STDIN WITH (FORMAT csv) reads.
+    """
+    buffer = io.BytesIO()
+    pa_csv.write_csv(table, buffer, write_options=pa_csv.WriteOptions(include_header=False))
+    buffer.seek(0)
+    return buffer
@@ -43,6 +43,73 @@ class Settings(BaseSettings):
             path=f"{values.get('POSTGRES_DB') or ''}",
         ).unicode_string()
 
+    # Per-connection asyncpg prepared statement cache; 0 disables it (needed behind
+    # poolers that can't track prepared statements, e.g. PgBouncer < 1.21 in transaction mode)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+
+    # Response cache for the dashboard/risk endpoints ("memory" per worker, or "redis" shared).
+    # With "memory", a write only invalidates the worker (or script) that made it; other
+    # workers serve their entries until the TTL, so use "redis" with more than one worker
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30
+    RISK_OVERVIEW_CACHE_TTL_SECONDS: float = 30
+
+    # Per-section timeout for composite endpoints whose queries run in parallel
+    ANALYTICS_SUBQUERY_TIMEOUT_SECONDS: float = 10
+
+    # Rows fetched per server-side cursor round trip (and encoded per chunk) by bulk exports
+    EXPORT_BATCH_SIZE: int = 5000
+    # Rows read from an uploaded file and COPYed into staging per batch by bulk ingest
+    INGEST_BATCH_SIZE: int = 50000
+    # Row errors listed per batch in bulk ingest responses (the counts are always complete)
+    INGEST_MAX_ERRORS_PER_BATCH: int = 20
+
+    # Upper bound on records accepted by the /ml/*/batch endpoints
+    ML_BATCH_MAX_SIZE: int = 10000
+
+    # Serve the logistic-regression models from flat NumPy arrays instead of the sklearn Pipeline
+    ML_COMPILED_INFERENCE: bool = True
+
+    # Rows the dashboard KPI running totals are spread over, so concurrent inserts don't
+    # all wait on one counter row (reads sum them)
+    KPI_COUNTER_STRIPES: int = 16
+
+    # Monthly transactions partitions kept created ahead of the current month
+    TRANSACTION_PARTITION_MONTHS_AHEAD: int = 3
+    # How often the API creates upcoming partitions and splits the default partition (0 disables)
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 86400
+    # How often client_exposure ranks/quartiles are recomputed from the running totals (0 disables);
+    # one worker process recomputes at a time
+    EXPOSURE_RANK_INTERVAL_SECONDS: float = 300
+    # In-memory columnar snapshot answering the dashboard trend/region/rating reads
+    # (about 14 bytes per transaction, per worker process); SQL is used while it loads
+    ANALYTICS_SNAPSHOT_ENABLED: bool = False
+    ANALYTICS_SNAPSHOT_REFRESH_SECONDS: float = 5
+    # New clients are picked up on every refresh; changed or deleted ones by a full check this often
+    ANALYTICS_SNAPSHOT_CLIENT_CHECK_SECONDS: float = 300
+    # Poll interval for hot-reloading retrained artifacts from app/ml_models (0 disables the watcher)
+    ML_MODEL_WATCH_INTERVAL_SECONDS: float = 0
+    # Shared secret for POST /ml/reload (sent as X-Admin-Token); while unset the endpoint answers 403
+    ML_ADMIN_TOKEN: str | None = None
+
+    # Optional LRU/TTL cache in front of the single-record predict methods
+    ML_CACHE_ENABLED: bool = False
+    ML_CACHE_MAX_SIZE: int = 10000
+    ML_CACHE_TTL_SECONDS: float = 300  # 0 = entries never expire
+    # Round amount to this step before scoring and caching (0 = exact amounts)
+    ML_CACHE_AMOUNT_BUCKET: float = 0
+
+    # Process pool for model inference (0 = run on the API process threadpool)
+    ML_INFERENCE_WORKERS: int = 0
+    # Outstanding inference calls allowed before /ml routes answer 503
+    ML_INFERENCE_MAX_PENDING: int = 256
+
+    # Bearer token required by GET /metrics; leave unset to allow unauthenticated scrapes
+    METRICS_TOKEN: str | None = None
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,46 @@
+import psycopg2
+from typing import IO, Sequence
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+def _cursor(db: Session):
+    # psycopg2 cursor on the session's connection, so COPY runs in the session's transaction
+    return db.connection().connection.cursor()
+
+def _literal_sql(db: Session, query: Select, cursor) -> str:
+    compiled = query.compile(dialect=db.get_bind().dialect)
+    return cursor.mogrify(str(compiled), compiled.params).decode()
+
+def copy_query_to_csv(db: Session, query: Select, out: IO[bytes]):
+    """
+    Write the result of a select as headerless CSV with COPY ... TO STDOUT.
+    Postgres formats the rows, so no Python object is built per row.
+    NULL is an empty unquoted field, booleans are t/f.
+    """
+    cursor = _cursor(db)
+    try:
+        cursor.copy_expert(f"COPY ({_literal_sql(db, query, cursor)}) TO STDOUT WITH (FORMAT csv)", out)
+    finally:
+        cursor.close()
+
+def copy_csv_into(db: Session, table: str, columns: Sequence[str], data: IO[bytes]):
+    """
+    Load headerless CSV into table(columns) with COPY ... FROM STDIN.
+    Raises ValueError when Postgres rejects the data (bad value, missing key, ...).
+    """
+    cursor = _cursor(db)
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", data)
+    except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+        raise ValueError(f"Rejected by COPY: {str(e).strip()}")
+    finally:
+        cursor.close()
+
+def create_staging_table(db: Session, table: str) -> str:
+    """
+    Session-private copy of `table`'s columns and defaults (no constraints or
+    indexes), dropped at commit. Returns its name.
+    """
+    staging = f"staging_{table}"
+    db.connection().exec_driver_sql(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+    return staging
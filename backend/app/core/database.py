@@ -1,10 +1,49 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.request_timing import install_db_timing
+
+pool_checkout = metrics.histogram(
+    "finsight_db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waiting for a free slot and the pre-ping.",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+)
+pool_timeouts = metrics.counter(
+    "finsight_db_pool_timeouts_total", "Checkouts that gave up because the pool stayed exhausted.", ["pool"]
+)
+
+class CheckoutTimingMixin:
+    """
+    Times every checkout, so waits caused by a saturated pool show up in pool_checkout.
+    """
+    pool_label = "default"
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_timeouts.inc(pool=self.pool_label)
+            raise
+        finally:
+            pool_checkout.observe(time.perf_counter() - started, pool=self.pool_label)
+
+class TimedQueuePool(CheckoutTimingMixin, QueuePool):
+    pool_label = "sync"
+
+class TimedAsyncQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pool_label = "async"
 
 # Configure engine with connection pooling for production
 engine = create_engine(
     settings.sqlalchemy_database_uri,
+    poolclass=TimedQueuePool,
     pool_pre_ping=True,
     pool_size=20,
     max_overflow=10,
@@ -12,6 +51,54 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_uri(uri: str) -> str:
+    """
+    Same database, asyncpg driver. libpq-only query options are translated or
+    dropped because asyncpg rejects unknown connect arguments.
+    """
+    url = make_url(uri).set(drivername="postgresql+asyncpg")
+    sslmode = url.query.get("sslmode")
+    url = url.difference_update_query(["sslmode", "channel_binding"])
+    if sslmode:
+        url = url.update_query_dict({"ssl": sslmode})
+    # asyncpg prepares each statement on first use per connection and reuses it from this cache
+    url = url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)})
+    return url.render_as_string(hide_password=False)
+
+# Async engine used by the API routes; the sync engine above stays for scripts and Alembic
+async_engine = create_async_engine(
+    async_database_uri(settings.sqlalchemy_database_uri),
+    poolclass=TimedAsyncQueuePool,
+    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=10,
+    echo=False
+)
+# Per-request DB time and query count, reported in meta and Server-Timing
+install_db_timing(engine)
+install_db_timing(async_engine.sync_engine)
+def _pool_samples(read):
+    return [(("sync",), read(engine.pool)), (("async",), read(async_engine.pool))]
+
+metrics.gauge(
+    "finsight_db_pool_size", "Configured pool_size.", ["pool"],
+    collect=lambda: _pool_samples(lambda pool: pool.size())
+)
+metrics.gauge(
+    "finsight_db_pool_max_overflow", "Configured max_overflow.", ["pool"],
+    collect=lambda: _pool_samples(lambda pool: pool._max_overflow)
+)
+metrics.gauge(
+    "finsight_db_pool_checked_out", "Connections currently checked out.", ["pool"],
+    collect=lambda: _pool_samples(lambda pool: pool.checkedout())
+)
+# QueuePool.overflow() counts from -pool_size; only connections beyond pool_size are overflow
+metrics.gauge(
+    "finsight_db_pool_overflow", "Overflow connections currently open beyond pool_size.", ["pool"],
+    collect=lambda: _pool_samples(lambda pool: max(pool.overflow(), 0))
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -20,3 +107,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Sequence
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Column
+from sqlalchemy.sql import Select
+from app.core.columnar import COLUMNAR_FORMATS, ColumnarUnavailable, columnar_export, require_pyarrow
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import errors
+
+RowBatches = AsyncIterator[List[Sequence[Any]]]
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+async def encode_csv(columns: Sequence[str], batches: RowBatches) -> AsyncIterator[bytes]:
+    """
+    Header line, then one chunk per batch.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([[_plain(value) for value in row] for row in batch])
+        yield buffer.getvalue().encode()
+
+async def encode_ndjson(columns: Sequence[str], batches: RowBatches) -> AsyncIterator[bytes]:
+    """
+    One JSON object per line, one chunk per batch.
+    """
+    async for batch in batches:
+        lines = [
+            json.dumps({column: _plain(value) for column, value in zip(columns, row)}, separators=(",", ":"))
+            for row in batch
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+# format -> (encoder, media type, file extension)
+ROW_FORMATS: Dict[str, tuple] = {
+    "csv": (encode_csv, "text/csv", "csv"),
+    "ndjson": (encode_ndjson, "application/x-ndjson", "ndjson"),
+}
+
+# For Query(pattern=...) on export endpoints
+EXPORT_FORMAT_PATTERN = "^(csv|ndjson|arrow|parquet)$"
+
+async def stream_rows(query: Select, batch_size: int) -> RowBatches:
+    """
+    Rows of `query` in batches from a server-side cursor (yield_per), on a session
+    of its own since it has to stay open for as long as the body streams.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield batch
+
+async def logged_stream(name: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Once streaming has started the status code is already sent, so a failure can
+    only abort the body; log it so a truncated download can be traced.
+    """
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        print(f"Export {name} failed mid-stream: {e}")
+        errors.inc(source="export")
+        raise
+
+def logged_sync_stream(name: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    try:
+        yield from chunks
+    except Exception as e:
+        print(f"Export {name} failed mid-stream: {e}")
+        errors.inc(source="export")
+        raise
+
+def export_response(name: str, fmt: str, query: Select, columns: Sequence[Column]) -> StreamingResponse:
+    """
+    Stream `query` as an attachment in one of the export formats.
+    csv/ndjson are encoded row-wise from a server-side cursor; arrow/parquet are
+    built column-wise from COPY output (see app.core.columnar).
+    """
+    if fmt in COLUMNAR_FORMATS:
+        try:
+            require_pyarrow()
+        except ColumnarUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        media_type, extension = COLUMNAR_FORMATS[fmt]
+        body = logged_sync_stream(name, columnar_export(fmt, query, columns))
+    else:
+        encoder, media_type, extension = ROW_FORMATS[fmt]
+        names = [column.name for column in columns]
+        body = logged_stream(name, encoder(names, stream_rows(query, settings.EXPORT_BATCH_SIZE)))
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'}
+    )
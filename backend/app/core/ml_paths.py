@@ -0,0 +1,11 @@
+import os
+
+# Where the API loads model artifacts from and scripts/train_models.py writes them.
+# Kept apart from the ML service so the training script can import it cheaply.
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ml_models")
+
+# Names the generation directory (under MODELS_DIR) holding the current artifacts.
+# train_models.py writes each generation to its own directory and then replaces this
+# file, so one rename switches all three models at once. Without it the artifacts
+# are read from MODELS_DIR itself.
+MANIFEST_FILE = "manifest.json"
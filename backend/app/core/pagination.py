@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+class InvalidCursorError(ValueError):
+    pass
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque keyset cursor: the sort key of the last row served, as URL-safe base64 JSON.
+    """
+    payload = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, types: Sequence[Callable[[Any], Any]]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor, converting each key with the matching
+    entry of `types` (e.g. datetime.fromisoformat, str, int).
+    Raises InvalidCursorError for anything that doesn't round-trip.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of keys")
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+
+def keyset_page(rows: List[Any], limit: int, key: Callable[[Any], Sequence[Any]]) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a limit + 1 fetch to one page and build the cursor for the next one
+    (None when this is the last page).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
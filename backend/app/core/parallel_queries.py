@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+
+SubQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+subquery_failures = metrics.counter(
+    "finsight_subquery_failures_total", "Parallel dashboard sections that timed out or failed.",
+    ["section", "reason"]
+)
+
+async def _run_one(query: SubQuery, timeout_seconds: float) -> Any:
+    # Own session, so each sub-query checks out its own pooled connection
+    async with AsyncSessionLocal() as session:
+        return await asyncio.wait_for(query(session), timeout_seconds)
+
+async def run_parallel(queries: Dict[str, SubQuery], timeout_seconds: float) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Run independent read queries concurrently, one pooled connection each.
+    Returns (results, failed): results by name for the ones that finished, and a
+    short reason ("timeout" or "error") for the ones that didn't. One slow or
+    failing sub-query never discards the others.
+    """
+    names = list(queries)
+    outcomes = await asyncio.gather(
+        *(_run_one(queries[name], timeout_seconds) for name in names),
+        return_exceptions=True
+    )
+
+    results: Dict[str, Any] = {}
+    failed: Dict[str, str] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            print(f"Sub-query {name} timed out after {timeout_seconds}s")
+            failed[name] = "timeout"
+            subquery_failures.inc(section=name, reason="timeout")
+        elif isinstance(outcome, BaseException):
+            print(f"Sub-query {name} failed: {outcome}")
+            failed[name] = "error"
+            subquery_failures.inc(section=name, reason="error")
+        else:
+            results[name] = outcome
+    return results, failed
@@ -0,0 +1,178 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+@dataclass
+class RequestTimings:
+    """
+    Wall-clock breakdown of one request. DB time is summed over queries, so
+    sections run in parallel can add up to more than the request's total.
+    """
+    started: float = field(default_factory=time.perf_counter)
+    db_ms: float = 0.0
+    db_queries: int = 0
+    ml_ms: float = 0.0
+    serialization_ms: float = 0.0
+    # perf_counter when the endpoint function returned, for the serialization split
+    endpoint_returned: Optional[float] = None
+    # Full path template of the matched route, e.g. /api/v1/clients/{client_id}
+    route: Optional[str] = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def meta(self) -> Dict[str, Any]:
+        return {
+            "execution_time_ms": int(self.elapsed_ms()),
+            "db_time_ms": round(self.db_ms, 2),
+            "db_query_count": self.db_queries,
+            "ml_time_ms": round(self.ml_ms, 2),
+        }
+
+    def server_timing(self, total_ms: float) -> str:
+        return ", ".join([
+            f"total;dur={total_ms:.2f}",
+            f'db;dur={self.db_ms:.2f};desc="{self.db_queries} queries"',
+            f"ml;dur={self.ml_ms:.2f}",
+            f"serialize;dur={self.serialization_ms:.2f}",
+        ])
+
+# Shared by everything the request awaits or hands to the threadpool, which copy the context
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current() -> Optional[RequestTimings]:
+    return _current.get()
+
+def add_ml_time(ms: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.ml_ms += ms
+
+def add_serialization_time(ms: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.serialization_ms += ms
+
+def with_timing_meta(payload: Any) -> Any:
+    """
+    Merge the request's timings into an APIResponse-shaped dict, keeping any
+    meta the route already set (e.g. partial/failed).
+    """
+    timings = _current.get()
+    if timings is None or not isinstance(payload, dict) or "success" not in payload:
+        return payload
+    return {**payload, "meta": {**(payload.get("meta") or {}), **timings.meta()}}
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    timings = _current.get()
+    if timings is not None:
+        timings.db_ms += (time.perf_counter() - started) * 1000
+        timings.db_queries += 1
+
+def _handle_error(exception_context):
+    stack = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if stack:
+        stack.pop()
+
+def install_db_timing(engine: Engine):
+    """
+    Count queries and time spent in the driver against the current request.
+    For an AsyncEngine pass its .sync_engine.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    def finish(result):
+        timings = _current.get()
+        if timings is not None:
+            timings.endpoint_returned = time.perf_counter()
+        return with_timing_meta(result)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return finish(await endpoint(*args, **kwargs))
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return finish(endpoint(*args, **kwargs))
+    return wrapper
+
+class TimedRoute(APIRoute):
+    """
+    Route class that fills `meta` of APIResponse bodies with the request's timings
+    and attributes the time between the endpoint returning and the response being
+    ready (response model validation, encoding, rendering) to serialization.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = _current.get()
+            if timings is not None:
+                timings.route = self.full_path(request)
+            response = await handler(request)
+            if timings is not None and timings.endpoint_returned is not None:
+                timings.serialization_ms += (time.perf_counter() - timings.endpoint_returned) * 1000
+            return response
+
+        return timed_handler
+
+    def full_path(self, request: Request) -> str:
+        # self.path may or may not carry the include_router prefix depending on the
+        # FastAPI version; recover the prefix from the part of the URL it matched
+        own_part = self.path_format.format(**request.path_params)
+        path = request.scope["path"]
+        prefix = path[:-len(own_part)] if own_part and path.endswith(own_part) else ""
+        return prefix + self.path_format
+
+class RequestTimingMiddleware:
+    """
+    Starts a RequestTimings for every HTTP request and reports it in a
+    Server-Timing header, which browser dev tools show per request.
+    """
+
+    def __init__(self, app, timing_allow_origin: Optional[Callable[[str], bool]] = None):
+        self.app = app
+        self.timing_allow_origin = timing_allow_origin
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        origin = next((value.decode() for name, value in scope["headers"] if name == b"origin"), None)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.server_timing(timings.elapsed_ms()).encode()))
+                # Cross-origin pages only see the breakdown when allowed to
+                if origin and self.timing_allow_origin and self.timing_allow_origin(origin):
+                    headers.append((b"timing-allow-origin", origin.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.metrics import metrics, errors
+from app.core.request_timing import with_timing_meta, add_serialization_time
+
+try:
+    import redis
+except ImportError:  # optional: only needed for RESPONSE_CACHE_BACKEND=redis
+    redis = None
+
+# (etag, serialized body)
+CacheEntry = Tuple[str, bytes]
+
+# Namespaces, one per cached endpoint
+DASHBOARD = "dashboard"
+RISK_OVERVIEW = "risk_overview"
+
+class MemoryCacheBackend:
+    """
+    Per-process LRU with per-entry expiry. Each worker keeps its own entries, and
+    invalidate() only clears the calling process: a write served by one API worker,
+    or made by a script (rebuild_client_exposure.py, reconcile_kpis.py, ...), leaves
+    the other workers' entries to expire on their TTL. Use the redis backend when
+    running more than one worker or when scripts must take effect immediately.
+    """
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, CacheEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._entries.get((namespace, key))
+            if item is None:
+                return None
+            expires_at, entry = item
+            if time.monotonic() >= expires_at:
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return entry
+
+    def set(self, namespace: str, key: str, entry: CacheEntry, ttl_seconds: float):
+        with self._lock:
+            self._entries[(namespace, key)] = (time.monotonic() + ttl_seconds, entry)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[cache_key]
+
+class RedisCacheBackend:
+    """
+    Shared across workers. Invalidation bumps a per-namespace version that is part
+    of every key, so it is O(1); superseded entries simply expire.
+    """
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "finsight:response:"):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        version = self.client.get(f"{self.prefix}{namespace}:version") or b"0"
+        return f"{self.prefix}{namespace}:{version.decode()}:{key}"
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        raw = self.client.get(self._key(namespace, key))
+        if raw is None:
+            return None
+        etag, _, body = raw.partition(b"\n")
+        return etag.decode(), body
+
+    def set(self, namespace: str, key: str, entry: CacheEntry, ttl_seconds: float):
+        etag, body = entry
+        self.client.set(self._key(namespace, key), etag.encode() + b"\n" + body, px=int(ttl_seconds * 1000))
+
+    def invalidate(self, namespace: str):
+        self.client.incr(f"{self.prefix}{namespace}:version")
+
+def is_complete(payload: Dict[str, Any]) -> bool:
+    """
+    cache_if predicate for composite endpoints: don't keep partial results around.
+    """
+    return not (payload.get("meta") or {}).get("partial")
+
+def make_etag(encoded: Any) -> str:
+    """
+    Weak ETag over the response minus `meta`, so per-build timings don't change
+    the tag of otherwise identical data.
+    """
+    if isinstance(encoded, dict):
+        encoded = {k: v for k, v in encoded.items() if k != "meta"}
+    digest = hashlib.sha256(json.dumps(encoded, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as If-None-Match requires
+    return "*" in candidates or _opaque(etag) in [_opaque(tag) for tag in candidates]
+
+class ResponseCache:
+    """
+    TTL cache of serialized JSON responses, keyed by endpoint namespace and query string.
+    Backend errors are logged and treated as misses so the cache never takes an endpoint down.
+    """
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self._inflight: Dict[Tuple[str, str], asyncio.Lock] = {}
+        # (namespace, "hit"/"miss") -> count
+        self.lookups: Dict[Tuple[str, str], int] = {}
+
+    async def _call(self, method: str, *args):
+        fn = getattr(self.backend, method)
+        try:
+            if self.backend.blocking:
+                return await run_in_threadpool(fn, *args)
+            return fn(*args)
+        except Exception as e:
+            print(f"Response cache {method} failed: {e}")
+            errors.inc(source="response_cache")
+            return None
+
+    def invalidate(self, *namespaces: str):
+        """
+        Drop cached responses for the given endpoints; called after writes that change them.
+        With the memory backend this only reaches the calling process (see MemoryCacheBackend).
+        """
+        for namespace in namespaces:
+            try:
+                self.backend.invalidate(namespace)
+            except Exception as e:
+                print(f"Response cache invalidate failed: {e}")
+                errors.inc(source="response_cache")
+
+    async def invalidate_async(self, *namespaces: str):
+        for namespace in namespaces:
+            await self._call("invalidate", namespace)
+
+    def hit_ratios(self) -> Dict[str, float]:
+        ratios = {}
+        for namespace in {namespace for namespace, _ in list(self.lookups)}:
+            hits = self.lookups.get((namespace, "hit"), 0)
+            ratios[namespace] = hits / (hits + self.lookups.get((namespace, "miss"), 0))
+        return ratios
+
+    async def _build(self, build, model, cache_if) -> Tuple[CacheEntry, bool]:
+        """
+        Build and serialize a response. Returns the entry and whether it may be stored.
+        """
+        payload = with_timing_meta(await build())
+        cacheable = cache_if is None or cache_if(payload)
+        serialize_started = time.perf_counter()
+        if model is not None:
+            payload = model.model_validate(payload)
+        encoded = jsonable_encoder(payload)
+        body = json.dumps(encoded, separators=(",", ":")).encode()
+        add_serialization_time((time.perf_counter() - serialize_started) * 1000)
+        return (make_etag(encoded), body), cacheable
+
+    async def respond(
+        self,
+        request: Request,
+        namespace: str,
+        ttl_seconds: float,
+        build: Callable[[], Awaitable[Dict[str, Any]]],
+        model: Optional[Type] = None,
+        cache_if: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Response:
+        """
+        Serve the endpoint from cache, building and storing it on a miss.
+        `model` is the endpoint's response model, applied before serializing.
+        `cache_if` can veto storing a built payload (e.g. a partial result).
+        Answers 304 when If-None-Match carries the current ETag.
+        A hit keeps the meta timings of the build that produced it.
+        """
+        key = str(request.url.query)
+        status = "HIT"
+        if not self.enabled:
+            # Nothing to share, so concurrent requests build independently as without the cache
+            status = "MISS"
+            entry, _ = await self._build(build, model, cache_if)
+        else:
+            entry = await self._call("get", namespace, key)
+        if entry is None:
+            # One build per key at a time: concurrent pollers wait for it instead of stampeding the DB
+            lock = self._inflight.setdefault((namespace, key), asyncio.Lock())
+            async with lock:
+                entry = await self._call("get", namespace, key)
+                if entry is None:
+                    status = "MISS"
+                    entry, cacheable = await self._build(build, model, cache_if)
+                    if cacheable:
+                        await self._call("set", namespace, key, entry, ttl_seconds)
+            self._inflight.pop((namespace, key), None)
+
+        lookup = (namespace, status.lower())
+        self.lookups[lookup] = self.lookups.get(lookup, 0) + 1
+        etag, body = entry
+        # no-cache: browsers keep the copy but revalidate every poll, which costs a 304
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache", "X-Cache": status}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+def _backend():
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+response_cache = ResponseCache(_backend(), enabled=settings.RESPONSE_CACHE_ENABLED)
+
+metrics.counter(
+    "finsight_response_cache_lookups_total", "Cached endpoint responses served from cache (hit) or built (miss).",
+    ["namespace", "result"],
+    collect=lambda: [(key, count) for key, count in list(response_cache.lookups.items())]
+)
+metrics.gauge(
+    "finsight_response_cache_hit_ratio", "Share of cached endpoint responses served from cache since startup.",
+    ["namespace"],
+    collect=lambda: [((namespace,), ratio) for namespace, ratio in response_cache.hit_ratios().items()]
+)
@@ -0,0 +1,138 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import metrics
+
+SQL_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'sql'))
+
+class QueryParameterError(ValueError):
+    pass
+
+class SqlQuery:
+    """
+    One app/sql/*.sql file: the text() clause built once, its bind parameters and call stats.
+    Reusing the same clause object lets SQLAlchemy hit its compiled cache, and with
+    asyncpg the statement is prepared once per connection and then reused.
+    """
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql
+        self.clause = text(sql)
+        self.params = frozenset(self.clause.compile().params)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def bind(self, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        params = params or {}
+        missing = self.params - params.keys()
+        unknown = params.keys() - self.params
+        if missing or unknown:
+            raise QueryParameterError(
+                f"{self.name}: missing parameters {sorted(missing)}, unexpected parameters {sorted(unknown)}"
+            )
+        return params
+
+    def record(self, elapsed_ms: float, failed: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.errors += int(failed)
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "total_ms": round(self.total_ms, 3),
+                "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+                "max_ms": round(self.max_ms, 3),
+            }
+
+class SqlRegistry:
+    """
+    Loads every .sql file in app/sql once and runs them by name (file name without .sql).
+    Bind parameters are checked against the statement before it reaches the database.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._queries: Dict[str, SqlQuery] = {}
+        self._load_lock = threading.Lock()
+
+    def load(self):
+        with self._load_lock:
+            if self._queries:
+                return
+            queries = {}
+            for file_name in sorted(os.listdir(self.directory)):
+                if not file_name.endswith(".sql"):
+                    continue
+                with open(os.path.join(self.directory, file_name)) as f:
+                    name = file_name[:-len(".sql")]
+                    queries[name] = SqlQuery(name, f.read().strip().rstrip(";"))
+            self._queries = queries
+            print(f"Loaded {len(queries)} SQL queries from {self.directory}")
+
+    def get(self, name: str) -> SqlQuery:
+        if not self._queries:
+            self.load()
+        query = self._queries.get(name)
+        if query is None:
+            raise KeyError(f"Unknown SQL query: {name}")
+        return query
+
+    def execute(self, db: Session, name: str, params: Optional[Dict[str, Any]] = None):
+        query = self.get(name)
+        bound = query.bind(params)
+        started = time.perf_counter()
+        try:
+            result = db.execute(query.clause, bound)
+        except Exception:
+            query.record((time.perf_counter() - started) * 1000, failed=True)
+            raise
+        query.record((time.perf_counter() - started) * 1000)
+        return result
+
+    async def execute_async(self, db: AsyncSession, name: str, params: Optional[Dict[str, Any]] = None):
+        query = self.get(name)
+        bound = query.bind(params)
+        started = time.perf_counter()
+        try:
+            result = await db.execute(query.clause, bound)
+        except Exception:
+            query.record((time.perf_counter() - started) * 1000, failed=True)
+            raise
+        query.record((time.perf_counter() - started) * 1000)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        if not self._queries:
+            self.load()
+        return {name: query.stats() for name, query in self._queries.items()}
+
+sql_registry = SqlRegistry(SQL_DIR)
+
+def _query_samples(read):
+    return [((name,), read(query)) for name, query in list(sql_registry._queries.items())]
+
+metrics.counter(
+    "finsight_sql_query_calls_total", "Executions of each app/sql query.", ["query"],
+    collect=lambda: _query_samples(lambda query: query.calls)
+)
+metrics.counter(
+    "finsight_sql_query_errors_total", "Failed executions of each app/sql query.", ["query"],
+    collect=lambda: _query_samples(lambda query: query.errors)
+)
+metrics.counter(
+    "finsight_sql_query_seconds_total", "Time spent executing each app/sql query.", ["query"],
+    collect=lambda: _query_samples(lambda query: query.total_ms / 1000)
+)
@@ -1,34 +1,91 @@
-from fastapi import FastAPI
+import re
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from typing import Optional
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.sql_registry import sql_registry
+from app.core.request_timing import RequestTimingMiddleware
+from app.core.metrics import metrics, MetricsMiddleware
+from app.services.ml_service import ml_service
+from app.services.inference_executor import inference_executor
+from app.services.partition_service import partition_maintenance
+from app.services.exposure_service import exposure_ranking
+from app.services.analytics_snapshot import analytics_snapshot
 
-from app.routers import analytics_router, ml_router, transaction_router, client_router, risk_router, operation_router
+from app.routers import analytics_router, ml_router, transaction_router, client_router, risk_router, operation_router, ingest_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse app/sql once up front rather than on the first request
+    sql_registry.load()
+    # Models load in the background; /ml routes answer 503 until they are ready
+    ml_service.start_background_load()
+    if settings.ML_MODEL_WATCH_INTERVAL_SECONDS > 0:
+        ml_service.start_watcher(settings.ML_MODEL_WATCH_INTERVAL_SECONDS)
+    inference_executor.start()
+    if settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS > 0:
+        partition_maintenance.start(settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+    if settings.EXPOSURE_RANK_INTERVAL_SECONDS > 0:
+        exposure_ranking.start(settings.EXPOSURE_RANK_INTERVAL_SECONDS)
+    if settings.ANALYTICS_SNAPSHOT_ENABLED:
+        analytics_snapshot.start(settings.ANALYTICS_SNAPSHOT_REFRESH_SECONDS, settings.ANALYTICS_SNAPSHOT_CLIENT_CHECK_SECONDS)
+    yield
+    analytics_snapshot.stop()
+    exposure_ranking.stop()
+    partition_maintenance.stop()
+    ml_service.stop_watcher()
+    inference_executor.shutdown()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
+CORS_ORIGINS = [
+    "http://localhost:3000",
+    "https://finsight-alpha-liart.vercel.app",
+]
+CORS_ORIGIN_REGEX = r"https://finsight-.*\.vercel\.app"
+
+def is_allowed_origin(origin: str) -> bool:
+    return origin in CORS_ORIGINS or re.fullmatch(CORS_ORIGIN_REGEX, origin) is not None
+
 # Set all CORS enabled origins
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "https://finsight-alpha-liart.vercel.app",
-    ],
-    allow_origin_regex=r"https://finsight-.*\.vercel\.app",
+    allow_origins=CORS_ORIGINS,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read the per-stage breakdown
+    expose_headers=["Server-Timing"],
 )
 
+app.add_middleware(MetricsMiddleware)
+# Outermost, so the total covers CORS handling as well
+app.add_middleware(RequestTimingMiddleware, timing_allow_origin=is_allowed_origin)
+
 app.include_router(analytics_router.router, prefix=f"{settings.API_V1_STR}/analytics", tags=["analytics"])
 app.include_router(ml_router.router, prefix=f"{settings.API_V1_STR}/ml", tags=["ml"])
 app.include_router(transaction_router.router, prefix=f"{settings.API_V1_STR}/transactions", tags=["transactions"])
 app.include_router(client_router.router, prefix=f"{settings.API_V1_STR}/clients", tags=["clients"])
 app.include_router(risk_router.router, prefix=f"{settings.API_V1_STR}/risk", tags=["risk"])
 app.include_router(operation_router.router, prefix=f"{settings.API_V1_STR}/operations", tags=["operations"])
+app.include_router(ingest_router.router, prefix=f"{settings.API_V1_STR}/ingest", tags=["ingest"])
 
 @app.get("/")
 def root():
     return {"message": "Welcome to FinSight 2.0 API"}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics(authorization: Optional[str] = Header(None)):
+    """
+    Prometheus scrape endpoint (text exposition format).
+    """
+    if settings.METRICS_TOKEN and authorization != f"Bearer {settings.METRICS_TOKEN}":
+        raise HTTPException(status_code=403, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
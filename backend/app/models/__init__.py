@@ -1,3 +1,7 @@
 from app.models.client import Client
 from app.models.transaction import Transaction
 from app.models.operation import Operation
+from app.models.transaction_daily_stats import TransactionDailyStats
+from app.models.kpi_counters import KpiCounters
+from app.models.client_exposure import ClientExposure
+from app.models.transaction_id import TransactionId
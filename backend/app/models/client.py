@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -16,4 +16,9 @@ class Client(Base):
 
     __table_args__ = (
         Index("idx_client_region_risk", "region", "risk_rating"),
+        # Search: trigram GIN for substring matches, C-collation B-trees for prefix matches
+        Index("idx_client_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("idx_client_region_trgm", "region", postgresql_using="gin", postgresql_ops={"region": "gin_trgm_ops"}),
+        Index("idx_client_name_prefix", text('(lower(name) COLLATE "C")'), "client_id"),
+        Index("idx_client_region_prefix", text('(lower(region) COLLATE "C")'), "client_id"),
     )
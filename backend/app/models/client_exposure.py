@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Float, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+class ClientExposure(Base):
+    """
+    Running exposure per client, one row per client with transactions.
+    total_exposure/txn_count are updated in the same transaction as each insert;
+    region_rank/exposure_quartile are recomputed periodically over the whole table
+    (NULL until the first recompute after a client's first transaction).
+    Rebuilt by scripts/rebuild_client_exposure.py.
+    """
+    __tablename__ = "client_exposure"
+
+    client_id = Column(Integer, primary_key=True)
+    total_exposure = Column(Float, nullable=False, default=0)
+    txn_count = Column(Integer, nullable=False, default=0)
+    region_rank = Column(Integer)
+    exposure_quartile = Column(Integer)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Top-N by exposure is a backward scan of this index
+        Index("idx_client_exposure_total", "total_exposure"),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class KpiCounters(Base):
+    """
+    Running totals behind the dashboard KPIs, striped over KPI_COUNTER_STRIPES rows (id is
+    the stripe) and summed on read. Updated in the same transaction as each insert;
+    scripts/reconcile_kpis.py checks the sums against kpis.sql.
+    """
+    __tablename__ = "kpi_counters"
+
+    id = Column(Integer, primary_key=True)
+    total_volume = Column(Float, nullable=False, default=0)
+    total_transactions = Column(Integer, nullable=False, default=0)
+    breach_count = Column(Integer, nullable=False, default=0)
+    high_risk_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
 from datetime import datetime
 from app.core.database import Base
 
@@ -13,4 +13,6 @@ class Operation(Base):
 
     __table_args__ = (
         Index("idx_operation_region_status", "region", "status"),
+        # Keyset order; NULL last_updated sorts as the oldest (see operation_repo)
+        Index("idx_operation_updated_id", text("COALESCE(last_updated, '-infinity'::timestamp)"), "operation_id"),
     )
@@ -4,6 +4,9 @@ from datetime import datetime
 from app.core.database import Base
 
 class Transaction(Base):
+    # Range-partitioned by month on transaction_date (see the partitioning migration).
+    # The database primary key is (transaction_id, transaction_date); transaction_ids
+    # keeps transaction_id itself unique, so the ORM keys rows by transaction_id alone.
     __tablename__ = "transactions"
 
     transaction_id = Column(String, primary_key=True, index=True)
@@ -11,7 +14,7 @@ class Transaction(Base):
     amount = Column(Float)
     currency = Column(String)
     status = Column(String, index=True)  # Completed, Pending, Failed
-    transaction_date = Column(DateTime, default=datetime.utcnow, index=True)
+    transaction_date = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     sla_breach_flag = Column(Boolean, default=False, index=True)
     
     client = relationship("Client", back_populates="transactions")
@@ -19,4 +22,5 @@ class Transaction(Base):
     __table_args__ = (
         Index("idx_transaction_timestamp", "transaction_date"),
         Index("idx_transaction_client_date", "client_id", "transaction_date"),
+        Index("idx_transaction_date_id", "transaction_date", "transaction_id"),
     )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class TransactionDailyStats(Base):
+    """
+    One row per calendar day of transaction activity.
+    Maintained incrementally on insert/ingest and rebuilt by scripts/backfill_daily_stats.py.
+    """
+    __tablename__ = "transaction_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    volume = Column(Float, nullable=False, default=0)
+    txn_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    breach_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String
+from app.core.database import Base
+
+class TransactionId(Base):
+    """
+    Every transaction_id in transactions, claimed in the same transaction as the insert.
+    The partitioned table can only enforce (transaction_id, transaction_date), so this
+    unpartitioned table is what keeps the id itself unique.
+    """
+    __tablename__ = "transaction_ids"
+
+    transaction_id = Column(String, primary_key=True)
@@ -1,54 +1,46 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
+from app.core.sql_registry import sql_registry
+from app.repositories.kpi_repo import kpi_repo
+from app.services.analytics_snapshot import analytics_snapshot
 
+# Queries live in app/sql and run through the registry, shared by the sync and async paths.
+# Trends, the regional breakdown and the rating distribution are answered from the
+# in-memory analytics snapshot instead once it is enabled and loaded.
 class AnalyticsRepository:
     def get_kpis(self, db: Session) -> Dict[str, Any]:
         """
-        Executes complex KPI aggregation query using raw SQL.
+        Headline KPIs from the kpi_counters running totals (a sum over a few stripe rows).
+        sla_breach_rate is a percentage, as in kpis.sql.
         """
-        query = text("SELECT * FROM kpis_view") # Placeholder, will be replaced by actual SQL file content
-        # For now, return dummy data until SQL files are integrated
-        return {
-            "total_volume": 1234567.89,
-            "total_transactions": 5432,
-            "high_risk_count": 120,
-            "sla_breach_rate": 0.05
-        }
+        return kpi_repo.get_kpis(db)
 
     def get_transaction_trends(self, db: Session, days: int = 30) -> List[Dict[str, Any]]:
         """
         Fetch daily transaction volume and count for the last N days.
-        Uses the 'idx_transaction_timestamp' index.
+        Reads the transaction_daily_stats rollup, one row per day.
         """
+        if analytics_snapshot.ready:
+            return self._trend_rows(analytics_snapshot.transaction_trends(days))
+
         # Since we are using historic CSV data, we might not have data for "last 7 days" relative to NOW.
         # For this demo, let's just get the last 30 days of AVAILABLE data in the DB.
-        
-        # First, find the latest date in the DB
-        max_date_query = text("SELECT MAX(transaction_date) FROM transactions")
-        max_date = db.execute(max_date_query).scalar()
-        
+
+        # First, find the latest day in the DB
+        max_date = sql_registry.execute(db, "latest_stats_day").scalar()
+
         if not max_date:
             return []
 
-        # Query for usage of index
-        query = text("""
-            SELECT 
-                TO_CHAR(transaction_date, 'YYYY-MM-DD') as day, 
-                SUM(amount) as volume, 
-                COUNT(*) as count
-            FROM transactions 
-            WHERE transaction_date >= :start_date
-            GROUP BY TO_CHAR(transaction_date, 'YYYY-MM-DD')
-            ORDER BY day ASC
-        """)
-        
         # Go back 30 days from the latest data point
         start_date = max_date - timedelta(days=days)
-        
-        result = db.execute(query, {"start_date": start_date}).fetchall()
-        
+
+        result = sql_registry.execute(db, "daily_trend", {"start_date": start_date}).fetchall()
+        return self._trend_rows(result)
+
+    def _trend_rows(self, result) -> List[Dict[str, Any]]:
         trends = []
         for row in result:
              trends.append({
@@ -61,93 +53,110 @@ class AnalyticsRepository:
     def get_risk_exposure(self, db: Session) -> List[Dict[str, Any]]:
         """
         Identify high-risk clients and their total exposure.
+        Reads the client_exposure rollup, ranks included.
         """
-        query = text("""
-            SELECT 
-                c.client_id,
-                c.name,
-                c.region,
-                c.risk_rating,
-                SUM(t.amount) as total_exposure
-            FROM clients c
-            JOIN transactions t ON c.client_id = t.client_id
-            WHERE c.risk_rating IN ('High', 'Medium')
-            GROUP BY c.client_id, c.name, c.region, c.risk_rating
-            ORDER BY total_exposure DESC
-            LIMIT 50
-        """)
-        
-        result = db.execute(query).fetchall()
-        
-        exposure = []
-        for i, row in enumerate(result):
-            exposure.append({
+        result = sql_registry.execute(db, "top_client_exposure").fetchall()
+        return self._exposure_rows(result)
+
+    def _exposure_rows(self, result) -> List[Dict[str, Any]]:
+        # Ranks are None for clients whose first transaction came after the last recompute
+        return [
+            {
                 "client_id": row[0],
                 "name": row[1],
                 "region": row[2],
                 "risk_rating": row[3],
                 "total_exposure": float(row[4]),
-                "region_rank": i + 1,        # Simple rank for now
-                "exposure_quartile": 1       # Placeholder
-            })
-            
-        return exposure
+                "region_rank": row[5],
+                "exposure_quartile": row[6]
+            }
+            for row in result
+        ]
+
     def get_risk_metrics(self, db: Session) -> Dict[str, Any]:
         """
         Aggregates risk data for the Risk Monitor dashboard.
         """
-        # 1. Risk by Region (Heatmap data)
-        region_query = text("""
-            SELECT c.region, SUM(t.amount) as total_exposure, COUNT(DISTINCT c.client_id) as client_count
-            FROM transactions t
-            JOIN clients c ON t.client_id = c.client_id
-            GROUP BY c.region
-        """)
-        region_data = db.execute(region_query).fetchall()
-        
-        # 2. Risk Rating Distribution
-        rating_query = text("""
-            SELECT risk_rating, COUNT(*) as count
-            FROM clients
-            GROUP BY risk_rating
-        """)
-        rating_data = db.execute(rating_query).fetchall()
-        
-        # 3. Recent High Risk Transactions
-        recent_txns_query = text("""
-            SELECT 
-                t.transaction_id, 
-                c.name as client_name, 
-                t.amount, 
-                c.region, 
-                t.transaction_date,
-                t.status
-            FROM transactions t
-            JOIN clients c ON t.client_id = c.client_id
-            WHERE t.amount > 50000 OR t.status = 'Failed'
-            ORDER BY t.transaction_date DESC
-            LIMIT 10
-        """)
-        recent_txns = db.execute(recent_txns_query).fetchall()
-        
+        if analytics_snapshot.ready:
+            region_data = analytics_snapshot.regional_risk()
+            rating_data = analytics_snapshot.rating_distribution()
+        else:
+            region_data = sql_registry.execute(db, "regional_risk").fetchall()
+            rating_data = sql_registry.execute(db, "risk_rating_distribution").fetchall()
+        recent_txns = sql_registry.execute(db, "flagged_transactions").fetchall()
+        return self._risk_metrics(region_data, rating_data, recent_txns)
+
+    def _risk_metrics(self, region_data, rating_data, recent_txns) -> Dict[str, Any]:
         return {
-            "regional_risk": [
-                {"region": row[0], "exposure": float(row[1]), "count": int(row[2])} 
-                for row in region_data
-            ],
-            "risk_distribution": [
-                {"rating": row[0], "count": int(row[1])} 
-                for row in rating_data
-            ],
-            "flagged_transactions": [
-                {
-                    "id": row[0], 
-                    "client": row[1], 
-                    "amount": float(row[2]), 
-                    "region": row[3],
-                    "date": row[4],
-                    "status": row[5]
-                }
-                for row in recent_txns
-            ]
+            "regional_risk": self._regional_risk_rows(region_data),
+            "risk_distribution": self._rating_rows(rating_data),
+            "flagged_transactions": self._flagged_rows(recent_txns)
         }
+
+    def _regional_risk_rows(self, region_data) -> List[Dict[str, Any]]:
+        return [
+            {"region": row[0], "exposure": float(row[1]), "count": int(row[2])}
+            for row in region_data
+        ]
+
+    def _rating_rows(self, rating_data) -> List[Dict[str, Any]]:
+        return [
+            {"rating": row[0], "count": int(row[1])}
+            for row in rating_data
+        ]
+
+    def _flagged_rows(self, recent_txns) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": row[0],
+                "client": row[1],
+                "amount": float(row[2]),
+                "region": row[3],
+                "date": row[4],
+                "status": row[5]
+            }
+            for row in recent_txns
+        ]
+
+    async def get_kpis_async(self, db: AsyncSession) -> Dict[str, Any]:
+        return await kpi_repo.get_kpis_async(db)
+
+    async def get_transaction_trends_async(self, db: AsyncSession, days: int = 30) -> List[Dict[str, Any]]:
+        if analytics_snapshot.ready:
+            return self._trend_rows(analytics_snapshot.transaction_trends(days))
+        max_date = (await sql_registry.execute_async(db, "latest_stats_day")).scalar()
+        if not max_date:
+            return []
+        start_date = max_date - timedelta(days=days)
+        result = await sql_registry.execute_async(db, "daily_trend", {"start_date": start_date})
+        return self._trend_rows(result.fetchall())
+
+    async def get_risk_exposure_async(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        result = await sql_registry.execute_async(db, "top_client_exposure")
+        return self._exposure_rows(result.fetchall())
+
+    async def get_regional_risk_async(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        if analytics_snapshot.ready:
+            return self._regional_risk_rows(analytics_snapshot.regional_risk())
+        result = await sql_registry.execute_async(db, "regional_risk")
+        return self._regional_risk_rows(result.fetchall())
+
+    async def get_rating_distribution_async(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        if analytics_snapshot.ready:
+            return self._rating_rows(analytics_snapshot.rating_distribution())
+        result = await sql_registry.execute_async(db, "risk_rating_distribution")
+        return self._rating_rows(result.fetchall())
+
+    async def get_flagged_transactions_async(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        result = await sql_registry.execute_async(db, "flagged_transactions")
+        return self._flagged_rows(result.fetchall())
+
+    async def get_risk_metrics_async(self, db: AsyncSession) -> Dict[str, Any]:
+        if analytics_snapshot.ready:
+            region_data = analytics_snapshot.regional_risk()
+            rating_data = analytics_snapshot.rating_distribution()
+        else:
+            region_data = (await sql_registry.execute_async(db, "regional_risk")).fetchall()
+            rating_data = (await sql_registry.execute_async(db, "risk_rating_distribution")).fetchall()
+        recent_txns = (await sql_registry.execute_async(db, "flagged_transactions")).fetchall()
+        return self._risk_metrics(region_data, rating_data, recent_txns)
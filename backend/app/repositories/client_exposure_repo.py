@@ -0,0 +1,147 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import List, Dict, Any, Iterable
+from app.core.response_cache import response_cache, DASHBOARD, RISK_OVERVIEW
+
+# Adds one client's delta onto its row, creating it on the client's first transaction.
+# The ranks are left alone; they are only written by RANK_EXPOSURE_QUERY.
+UPSERT_EXPOSURE_DELTA_QUERY = text("""
+    INSERT INTO client_exposure (client_id, total_exposure, txn_count, updated_at)
+    VALUES (:client_id, :exposure, :txn_count, NOW())
+    ON CONFLICT (client_id) DO UPDATE SET
+        total_exposure = client_exposure.total_exposure + EXCLUDED.total_exposure,
+        txn_count = client_exposure.txn_count + EXCLUDED.txn_count,
+        updated_at = NOW()
+""")
+
+# The same for per-client deltas a bulk merge staged in a temporary table, applied
+# in client_id order like the sorted deltas above
+UPSERT_STAGED_EXPOSURE_QUERY = """
+    INSERT INTO client_exposure (client_id, total_exposure, txn_count, updated_at)
+    SELECT client_id, total_exposure, txn_count, NOW()
+    FROM {staging}
+    ORDER BY client_id
+    ON CONFLICT (client_id) DO UPDATE SET
+        total_exposure = client_exposure.total_exposure + EXCLUDED.total_exposure,
+        txn_count = client_exposure.txn_count + EXCLUDED.txn_count,
+        updated_at = NOW()
+"""
+
+# Only rebuild() takes this: it clears and refills the table, so writers wait for it
+# to commit rather than add onto rows that are about to be replaced. Reads are not blocked.
+LOCK_EXPOSURE_QUERY = text("LOCK TABLE client_exposure IN EXCLUSIVE MODE")
+
+# Same ranking as risk_exposure.sql, computed over the rollup instead of all transactions.
+# client_id breaks ties so equal exposures don't swap quartiles between runs, and only
+# rows whose rank moved are written. Those rows are locked in client_id order first,
+# the order writers lock them in, so the recompute can't deadlock with them and writers
+# only ever wait on the rows being re-ranked.
+RANK_EXPOSURE_QUERY = text("""
+    WITH ranked AS (
+        SELECT
+            e.client_id,
+            DENSE_RANK() OVER (PARTITION BY c.region ORDER BY e.total_exposure DESC) AS region_rank,
+            NTILE(4) OVER (ORDER BY e.total_exposure DESC, e.client_id) AS exposure_quartile
+        FROM client_exposure e
+        JOIN clients c ON c.client_id = e.client_id
+    ),
+    changed AS MATERIALIZED (
+        SELECT e.client_id, r.region_rank, r.exposure_quartile
+        FROM client_exposure e
+        JOIN ranked r ON r.client_id = e.client_id
+        WHERE e.region_rank IS DISTINCT FROM r.region_rank OR e.exposure_quartile IS DISTINCT FROM r.exposure_quartile
+        ORDER BY e.client_id
+        FOR UPDATE OF e
+    )
+    UPDATE client_exposure e
+    SET region_rank = changed.region_rank, exposure_quartile = changed.exposure_quartile
+    FROM changed
+    WHERE e.client_id = changed.client_id
+""")
+
+# Held for as long as a process is the one recomputing ranks (see ExposureRanking)
+TRY_RANKING_LOCK_QUERY = text("SELECT pg_try_advisory_lock(hashtext('client_exposure_ranks'))")
+RELEASE_RANKING_LOCK_QUERY = text("SELECT pg_advisory_unlock(hashtext('client_exposure_ranks'))")
+
+CLEAR_EXPOSURE_QUERY = text("DELETE FROM client_exposure")
+
+REBUILD_EXPOSURE_QUERY = text("""
+    INSERT INTO client_exposure (client_id, total_exposure, txn_count, updated_at)
+    SELECT client_id, COALESCE(SUM(amount), 0), COUNT(*), NOW()
+    FROM transactions
+    WHERE client_id IS NOT NULL
+    GROUP BY client_id
+""")
+
+class ClientExposureRepository:
+    def _deltas(self, transactions: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        Collapse inserted transactions into one delta per client, sorted by client_id
+        so concurrent writers lock the rows in the same order.
+        """
+        deltas: Dict[int, Dict[str, Any]] = {}
+        for txn in transactions:
+            if txn.client_id is None:
+                continue
+            delta = deltas.setdefault(txn.client_id, {"client_id": txn.client_id, "exposure": 0.0, "txn_count": 0})
+            delta["exposure"] += float(txn.amount or 0)
+            delta["txn_count"] += 1
+        return [deltas[client_id] for client_id in sorted(deltas)]
+
+    def record_transactions(self, db: Session, transactions: Iterable[Any]):
+        """
+        Fold newly inserted transactions into the per-client totals.
+        Runs inside the caller's transaction; the caller commits.
+        """
+        deltas = self._deltas(transactions)
+        if deltas:
+            db.execute(UPSERT_EXPOSURE_DELTA_QUERY, deltas)
+
+    async def record_transactions_async(self, db: AsyncSession, transactions: Iterable[Any]):
+        deltas = self._deltas(transactions)
+        if deltas:
+            await db.execute(UPSERT_EXPOSURE_DELTA_QUERY, deltas)
+
+    def record_staged(self, db: Session, staging: str):
+        """
+        Apply per-client deltas (client_id, total_exposure, txn_count) staged by a
+        bulk load. Runs inside the caller's transaction; the caller commits.
+        """
+        db.execute(text(UPSERT_STAGED_EXPOSURE_QUERY.format(staging=staging)))
+
+    def recompute_ranks(self, db: Session) -> int:
+        """
+        Recompute region_rank and exposure_quartile from the current totals.
+        Returns the number of clients whose rank changed.
+        """
+        try:
+            changed = db.execute(RANK_EXPOSURE_QUERY).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if changed:
+            response_cache.invalidate(DASHBOARD)
+        return changed
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Rebuild the totals from the transactions table, then rank them.
+        The table lock is taken before the scan, so inserts that commit meanwhile are
+        either visible to it or applied on top of the rebuilt totals afterwards.
+        Returns the number of client rows written.
+        """
+        try:
+            db.execute(LOCK_EXPOSURE_QUERY)
+            db.execute(CLEAR_EXPOSURE_QUERY)
+            written = db.execute(REBUILD_EXPOSURE_QUERY).rowcount
+            db.execute(RANK_EXPOSURE_QUERY)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        response_cache.invalidate(DASHBOARD, RISK_OVERVIEW)
+        return written
+
+client_exposure_repo = ClientExposureRepository()
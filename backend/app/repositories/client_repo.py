@@ -1,24 +1,229 @@
+from sqlalchemy import select, func, cast, literal_column, tuple_, Float, Integer, String
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from app.core.pagination import InvalidCursorError, decode_cursor, keyset_page
+from app.core.response_cache import response_cache, DASHBOARD, RISK_OVERVIEW
 from app.models.client import Client
 from app.schemas.client_schema import ClientCreate
+from app.repositories.kpi_repo import kpi_repo
+
+# Below this length a term yields no trigrams, so only the prefix indexes can help:
+# short terms match a name or region prefix, longer ones any substring of either
+SEARCH_MIN_TRIGRAM_LENGTH = 3
+# Substring matches are ranked by similarity when there are at most this many
+SEARCH_RANK_LIMIT = 1000
+
+# Search results come in tiers, each read in an order an index (or a small sort) can
+# serve, and a tier is only queried if the ones before it didn't fill the page:
+#   0 name prefix        (lower(name), client_id)    idx_client_name_prefix
+#   1 region prefix      (lower(region), client_id)  idx_client_region_prefix
+#   2 other substring    similarity desc, client_id  trigram GIN, at most SEARCH_RANK_LIMIT rows
+#   3 other substring    client_id                   when there are more than that
+# Terms shorter than SEARCH_MIN_TRIGRAM_LENGTH only have tiers 0 and 1.
+NAME_PREFIX, REGION_PREFIX, SUBSTRING_RANKED, SUBSTRING_BY_ID = range(4)
+
+EXPORT_COLUMNS = tuple(Client.__table__.columns)
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 class ClientRepository:
+    def _name_key(self):
+        # Matches the prefix indexes: C collation lets the B-tree serve both LIKE 'x%' and the order
+        return func.lower(Client.name).collate("C")
+
+    def _region_key(self):
+        return func.lower(Client.region).collate("C")
+
+    def _tier_filter(self, tier: int, term: str):
+        """
+        Rows of `tier`: each match belongs to the first tier it qualifies for.
+        IS NOT TRUE keeps rows whose name or region is NULL.
+        """
+        prefix = f"{escape_like(term)}%"
+        name_prefix = self._name_key().like(prefix, escape="\\")
+        region_prefix = self._region_key().like(prefix, escape="\\")
+        if tier == NAME_PREFIX:
+            return name_prefix
+        if tier == REGION_PREFIX:
+            return region_prefix & name_prefix.is_not(True)
+        substring = f"%{escape_like(term)}%"
+        return (
+            (Client.name.ilike(substring, escape="\\") | Client.region.ilike(substring, escape="\\"))
+            & name_prefix.is_not(True) & region_prefix.is_not(True)
+        )
+
+    def _substring_count_query(self, term: str):
+        """
+        Substring matches outside the prefix tiers, counted up to SEARCH_RANK_LIMIT + 1,
+        which decides between SUBSTRING_RANKED and SUBSTRING_BY_ID.
+        """
+        matches = select(Client.client_id).filter(self._tier_filter(SUBSTRING_RANKED, term)).limit(SEARCH_RANK_LIMIT + 1)
+        return select(func.count()).select_from(matches.subquery())
+
+    def _substring_tier(self, matches: int) -> Optional[int]:
+        if not matches:
+            return None
+        return SUBSTRING_RANKED if matches <= SEARCH_RANK_LIMIT else SUBSTRING_BY_ID
+
+    def _search_tiers(self, term: str, after: Optional[Tuple]) -> List[Optional[int]]:
+        """
+        Tiers left to read, in order; None stands for the substring tier, whose
+        variant is picked with _substring_count_query once it is reached (and which
+        is skipped when that finds no match).
+        """
+        tiers = [NAME_PREFIX, REGION_PREFIX]
+        if len(term) >= SEARCH_MIN_TRIGRAM_LENGTH:
+            tiers.append(None)
+        if not after:
+            return tiers
+        if after[0] >= SUBSTRING_RANKED:
+            # A cursor inside a substring tier keeps paging that variant
+            return [after[0]]
+        return tiers[after[0]:]
+
+    def _search_tier_query(self, tier: int, term: str, after: Optional[Tuple], limit: int):
+        """
+        Up to `limit` rows of `tier` after the (tier, rank, key, client_id) cursor
+        `after`, as (Client, tier, rank, key) in tier order.
+        """
+        rank = literal_column("CAST(0 AS FLOAT)", Float)
+        key = literal_column("''", String)
+        if tier == NAME_PREFIX:
+            key = self._name_key()
+            order = {"key": key, "client_id": Client.client_id}
+        elif tier == REGION_PREFIX:
+            key = self._region_key()
+            order = {"key": key, "client_id": Client.client_id}
+        elif tier == SUBSTRING_RANKED:
+            # Negated so every tier pages in ascending order; float8 so the cursor round-trips exactly
+            rank = cast(-func.similarity(Client.name, term), Float)
+            order = {"rank": rank, "client_id": Client.client_id}
+        else:
+            order = {"client_id": Client.client_id}
+
+        query = (
+            select(Client, literal_column(str(tier), Integer).label("tier"), rank.label("rank"), key.label("key"))
+            .filter(self._tier_filter(tier, term))
+            .order_by(*order.values())
+        )
+        if after and after[0] == tier:
+            # Only the tier's own sort columns, so the comparison matches its index
+            last = dict(zip(("rank", "key", "client_id"), after[1:]))
+            query = query.filter(tuple_(*order.values()) > tuple_(*[last[name] for name in order]))
+        return query.limit(limit)
+
+    def _search(self, db: Session, term: str, limit: int, after: Optional[Tuple] = None) -> List:
+        rows = []
+        for tier in self._search_tiers(term, after):
+            if tier is None:
+                tier = self._substring_tier(db.execute(self._substring_count_query(term)).scalar())
+                if tier is None:
+                    break
+            rows += db.execute(self._search_tier_query(tier, term, after, limit - len(rows))).all()
+            if len(rows) >= limit:
+                break
+        return rows
+
+    async def _search_async(self, db: AsyncSession, term: str, limit: int, after: Optional[Tuple] = None) -> List:
+        rows = []
+        for tier in self._search_tiers(term, after):
+            if tier is None:
+                tier = self._substring_tier((await db.execute(self._substring_count_query(term))).scalar())
+                if tier is None:
+                    break
+            rows += (await db.execute(self._search_tier_query(tier, term, after, limit - len(rows)))).all()
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def _search_term(self, search: Optional[str]) -> str:
+        return (search or "").strip().lower()
+
+    def _list_query(self, limit: int, cursor: Optional[str] = None, skip: int = 0):
+        """
+        Plain listing: client_id order, keyset on client_id when a cursor is given.
+        """
+        query = select(Client).order_by(Client.client_id)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, (int,))
+            query = query.filter(Client.client_id > last_id)
+        return query.offset(skip).limit(limit)
+
+    def _search_after(self, cursor: Optional[str]) -> Optional[Tuple]:
+        if not cursor:
+            return None
+        mode, *after = decode_cursor(cursor, (str, int, float, str, int))
+        if mode != "search" or after[0] not in (NAME_PREFIX, REGION_PREFIX, SUBSTRING_RANKED, SUBSTRING_BY_ID):
+            raise InvalidCursorError("Invalid cursor: it belongs to a different listing")
+        return tuple(after)
+
+    def _search_page(self, rows: List, limit: int):
+        """
+        Trim a limit + 1 search fetch to a page of clients; the cursor is the last
+        row's (tier, rank, key, client_id).
+        """
+        page, next_cursor = keyset_page(rows, limit, lambda row: ("search", row.tier, row.rank, row.key, row[0].client_id))
+        return [row[0] for row in page], next_cursor
+
+    def export_query(self, region: Optional[str] = None, risk_rating: Optional[str] = None):
+        """
+        Plain columns for bulk exports, in client_id order.
+        """
+        query = select(*EXPORT_COLUMNS).order_by(Client.client_id)
+        if region:
+            query = query.filter(Client.region == region)
+        if risk_rating:
+            query = query.filter(Client.risk_rating == risk_rating)
+        return query
+
     def get_client(self, db: Session, client_id: int):
         return db.query(Client).filter(Client.client_id == client_id).first()
 
     def get_clients(self, db: Session, skip: int = 0, limit: int = 100, search: str = None):
-        query = db.query(Client)
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (Client.name.ilike(search_pattern)) | 
-                (Client.region.ilike(search_pattern))
-            )
-        return query.offset(skip).limit(limit).all()
+        term = self._search_term(search)
+        if not term:
+            return db.execute(self._list_query(limit, skip=skip)).scalars().all()
+        return [row[0] for row in self._search(db, term, skip + limit)[skip:]]
+
+    def get_clients_page(self, db: Session, limit: int = 100, cursor: Optional[str] = None, search: str = None):
+        term = self._search_term(search)
+        if not term:
+            return keyset_page(db.execute(self._list_query(limit + 1, cursor)).scalars().all(), limit, lambda client: (client.client_id,))
+        return self._search_page(self._search(db, term, limit + 1, self._search_after(cursor)), limit)
 
     def create_client(self, db: Session, client: ClientCreate):
         db_client = Client(**client.dict())
         db.add(db_client)
+        kpi_repo.record_clients(db, [db_client])
         db.commit()
+        response_cache.invalidate(DASHBOARD, RISK_OVERVIEW)
         db.refresh(db_client)
         return db_client
+
+    async def get_client_async(self, db: AsyncSession, client_id: int):
+        return await db.get(Client, client_id)
+
+    async def get_clients_async(self, db: AsyncSession, skip: int = 0, limit: int = 100, search: str = None):
+        term = self._search_term(search)
+        if not term:
+            result = await db.execute(self._list_query(limit, skip=skip))
+            return result.scalars().all()
+        return [row[0] for row in (await self._search_async(db, term, skip + limit))[skip:]]
+
+    async def get_clients_page_async(self, db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, search: str = None):
+        term = self._search_term(search)
+        if not term:
+            result = await db.execute(self._list_query(limit + 1, cursor))
+            return keyset_page(result.scalars().all(), limit, lambda client: (client.client_id,))
+        return self._search_page(await self._search_async(db, term, limit + 1, self._search_after(cursor)), limit)
+
+    async def create_client_async(self, db: AsyncSession, client: ClientCreate):
+        db_client = Client(**client.dict())
+        db.add(db_client)
+        await kpi_repo.record_clients_async(db, [db_client])
+        await db.commit()
+        await response_cache.invalidate_async(DASHBOARD, RISK_OVERVIEW)
+        await db.refresh(db_client)
+        return db_client
@@ -0,0 +1,110 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import List, Dict, Any, Iterable, Optional
+from datetime import date, datetime, timedelta
+from app.core.response_cache import response_cache, DASHBOARD
+
+# Adds one day's delta onto the existing row, creating it on the first transaction of the day
+UPSERT_DAILY_DELTA_QUERY = text("""
+    INSERT INTO transaction_daily_stats (day, volume, txn_count, failed_count, breach_count, updated_at)
+    VALUES (:day, :volume, :txn_count, :failed_count, :breach_count, NOW())
+    ON CONFLICT (day) DO UPDATE SET
+        volume = transaction_daily_stats.volume + EXCLUDED.volume,
+        txn_count = transaction_daily_stats.txn_count + EXCLUDED.txn_count,
+        failed_count = transaction_daily_stats.failed_count + EXCLUDED.failed_count,
+        breach_count = transaction_daily_stats.breach_count + EXCLUDED.breach_count,
+        updated_at = NOW()
+""")
+
+class DailyStatsRepository:
+    def _deltas(self, transactions: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        Collapse inserted transactions into one delta per day, so a batch costs
+        one upsert per distinct day rather than one per row.
+        """
+        deltas: Dict[date, Dict[str, Any]] = {}
+        for txn in transactions:
+            day = (txn.transaction_date or datetime.utcnow()).date()
+            delta = deltas.setdefault(day, {"day": day, "volume": 0.0, "txn_count": 0, "failed_count": 0, "breach_count": 0})
+            delta["volume"] += float(txn.amount or 0)
+            delta["txn_count"] += 1
+            delta["failed_count"] += int(txn.status == "Failed")
+            delta["breach_count"] += int(bool(txn.sla_breach_flag))
+        return [deltas[day] for day in sorted(deltas)]
+
+    def record_transactions(self, db: Session, transactions: Iterable[Any]):
+        """
+        Fold newly inserted transactions into the rollup.
+        Runs inside the caller's transaction; the caller commits.
+        """
+        self.record_deltas(db, self._deltas(transactions))
+
+    def record_deltas(self, db: Session, deltas: List[Dict[str, Any]]):
+        """
+        Apply per-day deltas (day, volume, txn_count, failed_count, breach_count)
+        already aggregated elsewhere, e.g. in SQL by a bulk load. Applied in day
+        order whatever order they come in, so concurrent writers lock the rows in
+        the same order and can't deadlock.
+        """
+        if deltas:
+            db.execute(UPSERT_DAILY_DELTA_QUERY, sorted(deltas, key=lambda delta: delta["day"]))
+
+    async def record_transactions_async(self, db: AsyncSession, transactions: Iterable[Any]):
+        deltas = self._deltas(transactions)
+        if deltas:
+            await db.execute(UPSERT_DAILY_DELTA_QUERY, deltas)
+
+    def _backfill_queries(self, start_day: Optional[date], end_day: Optional[date]):
+        day_filters, txn_filters, params = [], [], {}
+        if start_day:
+            day_filters.append("day >= :start_day")
+            txn_filters.append("transaction_date >= :start_ts")
+            params["start_day"] = start_day
+            params["start_ts"] = datetime.combine(start_day, datetime.min.time())
+        if end_day:
+            day_filters.append("day <= :end_day")
+            txn_filters.append("transaction_date < :end_ts")
+            params["end_day"] = end_day
+            params["end_ts"] = datetime.combine(end_day + timedelta(days=1), datetime.min.time())
+
+        delete_query = "DELETE FROM transaction_daily_stats"
+        if day_filters:
+            delete_query += " WHERE " + " AND ".join(day_filters)
+
+        # Range predicates on transaction_date (not on a cast) so idx_transaction_timestamp is usable
+        # and only the monthly partitions in range are scanned
+        insert_query = """
+            INSERT INTO transaction_daily_stats (day, volume, txn_count, failed_count, breach_count, updated_at)
+            SELECT
+                CAST(transaction_date AS DATE) as day,
+                COALESCE(SUM(amount), 0) as volume,
+                COUNT(*) as txn_count,
+                COUNT(*) FILTER (WHERE status = 'Failed') as failed_count,
+                COUNT(*) FILTER (WHERE sla_breach_flag) as breach_count,
+                NOW()
+            FROM transactions
+            WHERE transaction_date IS NOT NULL
+        """
+        for condition in txn_filters:
+            insert_query += f" AND {condition}"
+        insert_query += " GROUP BY CAST(transaction_date AS DATE)"
+        return text(delete_query), text(insert_query), params
+
+    def backfill(self, db: Session, start_day: Optional[date] = None, end_day: Optional[date] = None) -> int:
+        """
+        Rebuild the rollup from the transactions table for an inclusive day range
+        (everything when no range is given). Returns the number of day rows written.
+        """
+        delete_query, insert_query, params = self._backfill_queries(start_day, end_day)
+        try:
+            db.execute(delete_query, params)
+            written = db.execute(insert_query, params).rowcount
+            db.commit()
+            response_cache.invalidate(DASHBOARD)
+            return written
+        except Exception:
+            db.rollback()
+            raise
+
+daily_stats_repo = DailyStatsRepository()
@@ -0,0 +1,175 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import IO, Dict, Any, List
+from app.core.columnar import parquet_batches, table_to_csv
+from app.core.copy_io import copy_csv_into, create_staging_table
+from app.core.response_cache import response_cache, DASHBOARD, RISK_OVERVIEW
+from app.models.client import Client
+from app.models.operation import Operation
+from app.models.transaction import Transaction
+from app.repositories.client_exposure_repo import client_exposure_repo
+from app.repositories.daily_stats_repo import daily_stats_repo
+from app.repositories.kpi_repo import kpi_repo
+
+# New rows only. Each id is claimed in transaction_ids first: the partitioned table's
+# key is (transaction_id, transaction_date), so it can't reject an id resent with another
+# date. Rows whose id is already taken, repeats within the staged batch, and rows whose
+# client is unknown are skipped. The rollup deltas are aggregated from what was actually
+# inserted: the daily ones are returned, the per-client ones are staged in {exposure}
+# and applied after the daily and KPI deltas, the same lock order as a single insert.
+MERGE_TRANSACTIONS_QUERY = """
+    WITH eligible AS (
+        SELECT DISTINCT ON (s.transaction_id) s.*
+        FROM {staging} s
+        WHERE s.client_id IS NULL OR EXISTS (SELECT 1 FROM clients c WHERE c.client_id = s.client_id)
+        ORDER BY s.transaction_id
+    ),
+    claimed AS (
+        INSERT INTO transaction_ids (transaction_id)
+        SELECT transaction_id FROM eligible
+        ON CONFLICT (transaction_id) DO NOTHING
+        RETURNING transaction_id
+    ),
+    inserted AS (
+        INSERT INTO transactions (transaction_id, client_id, amount, currency, status, transaction_date, sla_breach_flag)
+        SELECT e.transaction_id, e.client_id, e.amount, e.currency, e.status,
+               COALESCE(e.transaction_date, timezone('utc', now())), COALESCE(e.sla_breach_flag, false)
+        FROM eligible e
+        JOIN claimed USING (transaction_id)
+        RETURNING client_id, amount, status, transaction_date, sla_breach_flag
+    ),
+    exposure AS (
+        INSERT INTO {exposure} (client_id, total_exposure, txn_count)
+        SELECT client_id, COALESCE(SUM(amount), 0), COUNT(*)
+        FROM inserted
+        WHERE client_id IS NOT NULL
+        GROUP BY client_id
+    )
+    SELECT
+        CAST(transaction_date AS DATE) AS day,
+        COALESCE(SUM(amount), 0) AS volume,
+        COUNT(*) AS txn_count,
+        COUNT(*) FILTER (WHERE status = 'Failed') AS failed_count,
+        COUNT(*) FILTER (WHERE sla_breach_flag) AS breach_count
+    FROM inserted
+    GROUP BY CAST(transaction_date AS DATE)
+    ORDER BY 1
+"""
+
+# Staged transactions the merge will skip because their client doesn't exist
+UNKNOWN_CLIENTS_QUERY = """
+    SELECT COUNT(*) FROM {staging} s
+    WHERE s.client_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM clients c WHERE c.client_id = s.client_id)
+"""
+
+MERGE_CLIENTS_QUERY = """
+    WITH inserted AS (
+        INSERT INTO clients (client_id, name, region, risk_rating, joined_date)
+        SELECT client_id, name, region, risk_rating, COALESCE(joined_date, timezone('utc', now()))
+        FROM {staging}
+        ON CONFLICT (client_id) DO NOTHING
+        RETURNING risk_rating
+    )
+    SELECT COUNT(*) AS inserted, COUNT(*) FILTER (WHERE risk_rating = 'High') AS high_risk
+    FROM inserted
+"""
+
+MERGE_OPERATIONS_QUERY = """
+    WITH inserted AS (
+        INSERT INTO operations (operation_id, region, status, last_updated, details)
+        SELECT operation_id, region, status, COALESCE(last_updated, timezone('utc', now())), details
+        FROM {staging}
+        ON CONFLICT (operation_id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT COUNT(*) FROM inserted
+"""
+
+# Staging columns the merge fills in when missing; LIKE copies their NOT NULL
+DEFAULTED_COLUMNS = {
+    "transactions": ["transaction_date"],
+}
+
+class IngestRepository:
+    """
+    Bulk loads: rows are COPYed into a temporary staging table and merged into the
+    target in one statement, so a load costs a few round trips and one commit
+    whatever its size.
+    """
+
+    models = {
+        "transactions": Transaction,
+        "clients": Client,
+        "operations": Operation,
+    }
+
+    def _merge(self, db: Session, table: str, staging: str) -> int:
+        """
+        Merge staged rows into `table` and fold the new rows into the rollups.
+        Returns the number of rows inserted.
+        """
+        if table == "transactions":
+            exposure = create_staging_table(db, "client_exposure")
+            merge = MERGE_TRANSACTIONS_QUERY.format(staging=staging, exposure=exposure)
+            deltas = [dict(row._mapping) for row in db.execute(text(merge))]
+            daily_stats_repo.record_deltas(db, deltas)
+            kpi_repo.record_delta(
+                db,
+                volume=sum(float(d["volume"]) for d in deltas),
+                transactions=sum(d["txn_count"] for d in deltas),
+                breaches=sum(d["breach_count"] for d in deltas),
+            )
+            client_exposure_repo.record_staged(db, exposure)
+            return sum(d["txn_count"] for d in deltas)
+        if table == "clients":
+            inserted, high_risk = db.execute(text(MERGE_CLIENTS_QUERY.format(staging=staging))).one()
+            kpi_repo.record_delta(db, high_risk=high_risk)
+            return inserted
+        return db.execute(text(MERGE_OPERATIONS_QUERY.format(staging=staging))).scalar()
+
+    def _staging(self, db: Session, table: str) -> str:
+        staging = create_staging_table(db, table)
+        for column in DEFAULTED_COLUMNS.get(table, []):
+            db.execute(text(f"ALTER TABLE {staging} ALTER COLUMN {column} DROP NOT NULL"))
+        return staging
+
+    def columns(self, table: str) -> List[str]:
+        return [column.name for column in self.models[table].__table__.columns]
+
+    def load_transaction_batch(self, db: Session, data: IO[bytes]) -> Dict[str, int]:
+        """
+        COPY one headerless CSV batch (columns in model order) through staging into
+        transactions. Runs in the caller's transaction; the caller commits, which
+        also drops the staging table.
+        Returns {"inserted", "unknown_client"}; the rest of the batch were duplicates.
+        """
+        staging = self._staging(db, "transactions")
+        copy_csv_into(db, staging, self.columns("transactions"), data)
+        unknown_client = db.execute(text(UNKNOWN_CLIENTS_QUERY.format(staging=staging))).scalar()
+        inserted = self._merge(db, "transactions", staging)
+        return {"inserted": inserted, "unknown_client": unknown_client}
+
+    def load_parquet(self, db: Session, table: str, source: IO[bytes], batch_size: int) -> Dict[str, Any]:
+        """
+        Load a Parquet file into `table`, reading and COPYing it batch by batch.
+        Existing ids are left untouched. All or nothing: any rejected value
+        rolls the whole load back (ValueError).
+        Returns {"received", "inserted", "skipped"}.
+        """
+        columns = list(self.models[table].__table__.columns)
+        received = 0
+        try:
+            staging = self._staging(db, table)
+            for batch in parquet_batches(source, columns, batch_size):
+                copy_csv_into(db, staging, self.columns(table), table_to_csv(batch))
+                received += batch.num_rows
+            inserted = self._merge(db, table, staging)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if inserted:
+            response_cache.invalidate(DASHBOARD, RISK_OVERVIEW)
+        return {"received": received, "inserted": inserted, "skipped": received - inserted}
+
+ingest_repo = IngestRepository()
@@ -0,0 +1,166 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import Dict, Any, Iterable, Optional
+import random
+import zlib
+from app.core.config import settings
+from app.core.sql_registry import sql_registry
+from app.core.response_cache import response_cache, DASHBOARD
+
+# The totals are striped over KPI_COUNTER_STRIPES rows so concurrent inserts update
+# different rows instead of all queueing on one; a delta lands on one stripe and the
+# totals are the sum of all of them. Upsert so a stripe is created on its first delta.
+ADD_KPI_DELTA_QUERY = text("""
+    INSERT INTO kpi_counters (id, total_volume, total_transactions, breach_count, high_risk_count, updated_at)
+    VALUES (:stripe, :volume, :transactions, :breaches, :high_risk, NOW())
+    ON CONFLICT (id) DO UPDATE SET
+        total_volume = kpi_counters.total_volume + EXCLUDED.total_volume,
+        total_transactions = kpi_counters.total_transactions + EXCLUDED.total_transactions,
+        breach_count = kpi_counters.breach_count + EXCLUDED.breach_count,
+        high_risk_count = kpi_counters.high_risk_count + EXCLUDED.high_risk_count,
+        updated_at = NOW()
+""")
+
+KPI_COUNTERS_QUERY = text("""
+    SELECT
+        COALESCE(SUM(total_volume), 0),
+        COALESCE(SUM(total_transactions), 0),
+        COALESCE(SUM(breach_count), 0),
+        COALESCE(SUM(high_risk_count), 0)
+    FROM kpi_counters
+""")
+
+# Volume is a float sum, so allow for rounding differences in summation order
+VOLUME_TOLERANCE = 0.01
+
+class KpiRepository:
+    def _stripe(self, key: Optional[Any] = None) -> int:
+        """
+        The counter row a delta is added to: a hash of `key` (a transaction or client id),
+        or a random stripe for deltas aggregated over many rows.
+        """
+        stripes = max(settings.KPI_COUNTER_STRIPES, 1)
+        if key is None:
+            return random.randrange(stripes)
+        return zlib.crc32(str(key).encode()) % stripes
+
+    def _delta(self, volume: float = 0.0, transactions: int = 0, breaches: int = 0, high_risk: int = 0, stripe: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            "stripe": self._stripe() if stripe is None else stripe,
+            "volume": volume, "transactions": transactions, "breaches": breaches, "high_risk": high_risk
+        }
+
+    def _transaction_delta(self, transactions: Iterable[Any]) -> Dict[str, Any]:
+        transactions = list(transactions)
+        delta = self._delta(stripe=self._stripe(transactions[0].transaction_id) if transactions else None)
+        for txn in transactions:
+            delta["volume"] += float(txn.amount or 0)
+            delta["transactions"] += 1
+            delta["breaches"] += int(bool(txn.sla_breach_flag))
+        return delta
+
+    def _client_delta(self, clients: Iterable[Any]) -> Dict[str, Any]:
+        clients = list(clients)
+        return self._delta(
+            high_risk=sum(1 for client in clients if client.risk_rating == "High"),
+            stripe=self._stripe(clients[0].client_id) if clients else None
+        )
+
+    def record_transactions(self, db: Session, transactions: Iterable[Any]):
+        """
+        Add newly inserted transactions to the running totals.
+        Runs inside the caller's transaction; the caller commits.
+        """
+        delta = self._transaction_delta(transactions)
+        if delta["transactions"]:
+            db.execute(ADD_KPI_DELTA_QUERY, delta)
+
+    def record_delta(self, db: Session, volume: float = 0.0, transactions: int = 0, breaches: int = 0, high_risk: int = 0):
+        """
+        Add totals aggregated elsewhere, e.g. in SQL by a bulk load.
+        """
+        if transactions or high_risk:
+            db.execute(ADD_KPI_DELTA_QUERY, self._delta(volume, transactions, breaches, high_risk))
+
+    async def record_transactions_async(self, db: AsyncSession, transactions: Iterable[Any]):
+        delta = self._transaction_delta(transactions)
+        if delta["transactions"]:
+            await db.execute(ADD_KPI_DELTA_QUERY, delta)
+
+    def record_clients(self, db: Session, clients: Iterable[Any]):
+        delta = self._client_delta(clients)
+        if delta["high_risk"]:
+            db.execute(ADD_KPI_DELTA_QUERY, delta)
+
+    async def record_clients_async(self, db: AsyncSession, clients: Iterable[Any]):
+        delta = self._client_delta(clients)
+        if delta["high_risk"]:
+            await db.execute(ADD_KPI_DELTA_QUERY, delta)
+
+    def _kpis(self, row) -> Dict[str, Any]:
+        total_volume, total_transactions, breach_count, high_risk_count = row
+        return {
+            "total_volume": float(total_volume),
+            "total_transactions": int(total_transactions),
+            "high_risk_count": int(high_risk_count),
+            # Percentage, as in kpis.sql
+            "sla_breach_rate": breach_count / total_transactions * 100 if total_transactions else 0.0
+        }
+
+    def get_kpis(self, db: Session) -> Dict[str, Any]:
+        return self._kpis(db.execute(KPI_COUNTERS_QUERY).first())
+
+    async def get_kpis_async(self, db: AsyncSession) -> Dict[str, Any]:
+        return self._kpis((await db.execute(KPI_COUNTERS_QUERY)).first())
+
+    def _recompute(self, db: Session) -> Dict[str, Any]:
+        row = sql_registry.execute(db, "kpis").mappings().first()
+        return {
+            "total_volume": float(row["total_volume"] or 0),
+            "total_transactions": int(row["total_transactions"] or 0),
+            "breach_count": int(row["breach_count"] or 0),
+            "high_risk_count": int(row["high_risk_count"] or 0),
+        }
+
+    def reconcile(self, db: Session, fix: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Recompute the totals with the full-scan kpis.sql and compare them with the counters.
+        Returns {field: {"counter", "actual", "drift"}}.
+        Both are read in one REPEATABLE READ snapshot without locking anything, so
+        inserts carry on during the scan; an insert updates its counter stripe in its
+        own transaction, so it is either in both reads or in neither. With fix=True the
+        drift is then added as a delta, which leaves the deltas of inserts that
+        committed after the snapshot in place.
+        """
+        try:
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            counters = db.execute(KPI_COUNTERS_QUERY).first()
+            actual = self._recompute(db)
+        finally:
+            db.rollback()
+
+        stored = dict(zip(["total_volume", "total_transactions", "breach_count", "high_risk_count"], counters))
+        report = {}
+        for field, value in actual.items():
+            drift = value - stored[field]
+            if field == "total_volume" and abs(drift) < VOLUME_TOLERANCE:
+                drift = 0.0
+            report[field] = {"counter": stored[field], "actual": value, "drift": drift}
+
+        if fix and any(values["drift"] for values in report.values()):
+            try:
+                db.execute(ADD_KPI_DELTA_QUERY, self._delta(
+                    volume=report["total_volume"]["drift"],
+                    transactions=report["total_transactions"]["drift"],
+                    breaches=report["breach_count"]["drift"],
+                    high_risk=report["high_risk_count"]["drift"],
+                ))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            response_cache.invalidate(DASHBOARD)
+        return report
+
+kpi_repo = KpiRepository()
@@ -1,6 +1,62 @@
+from sqlalchemy import select, tuple_, func, literal_column
+from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import decode_cursor, keyset_page
 from app.models.operation import Operation
 
+# last_updated is nullable; rows without one sort as the oldest. The expression matches
+# idx_operation_updated_id, and a NULL key is carried in cursors as null.
+NEVER_UPDATED = literal_column("'-infinity'::timestamp")
+UPDATED_KEY = func.coalesce(Operation.last_updated, NEVER_UPDATED)
+
+OPERATION_ORDER = (UPDATED_KEY.desc(), Operation.operation_id.desc())
+
+EXPORT_COLUMNS = tuple(Operation.__table__.columns)
+
 class OperationRepository:
+    def _operations_page_query(self, limit: int, cursor: Optional[str]):
+        """
+        Keyset page over (last_updated, operation_id), served by idx_operation_updated_id.
+        Operations never updated come last.
+        """
+        query = select(Operation).order_by(*OPERATION_ORDER)
+        if cursor:
+            last_updated, last_id = decode_cursor(cursor, (self._cursor_timestamp, str))
+            bound = NEVER_UPDATED if last_updated is None else last_updated
+            query = query.filter(tuple_(UPDATED_KEY, Operation.operation_id) < tuple_(bound, last_id))
+        return query.limit(limit + 1)
+
+    def _cursor_timestamp(self, value: Optional[str]) -> Optional[datetime]:
+        return None if value is None else datetime.fromisoformat(value)
+
+    def export_query(self, region: Optional[str] = None, status: Optional[str] = None):
+        """
+        Plain columns for bulk exports, oldest update first.
+        """
+        query = select(*EXPORT_COLUMNS).order_by(UPDATED_KEY, Operation.operation_id)
+        if region:
+            query = query.filter(Operation.region == region)
+        if status:
+            query = query.filter(Operation.status == status)
+        return query
+
+    def _operation_key(self, operation: Operation):
+        return (operation.last_updated, operation.operation_id)
+
     def get_operations(self, db: Session, skip: int = 0, limit: int = 50):
-        return db.query(Operation).order_by(Operation.last_updated.desc()).offset(skip).limit(limit).all()
+        return db.query(Operation).order_by(*OPERATION_ORDER).offset(skip).limit(limit).all()
+
+    def get_operations_page(self, db: Session, limit: int = 50, cursor: Optional[str] = None):
+        rows = db.execute(self._operations_page_query(limit, cursor)).scalars().all()
+        return keyset_page(rows, limit, self._operation_key)
+
+    async def get_operations_async(self, db: AsyncSession, skip: int = 0, limit: int = 50):
+        query = select(Operation).order_by(*OPERATION_ORDER).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_operations_page_async(self, db: AsyncSession, limit: int = 50, cursor: Optional[str] = None):
+        result = await db.execute(self._operations_page_query(limit, cursor))
+        return keyset_page(result.scalars().all(), limit, self._operation_key)
@@ -0,0 +1,63 @@
+from datetime import date
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import List, Dict, Any
+
+# ensure_transaction_partitions() is created by the partitioning migration
+ENSURE_AHEAD_QUERY = text("""
+    SELECT ensure_transaction_partitions(
+        CAST(date_trunc('month', timezone('utc', now())) AS DATE),
+        CAST(date_trunc('month', timezone('utc', now())) + make_interval(months => :months_ahead) AS DATE)
+    )
+""")
+
+ENSURE_RANGE_QUERY = text("SELECT ensure_transaction_partitions(:first_month, :last_month)")
+
+# Months that have rows in the default partition, i.e. no partition of their own yet
+DEFAULT_MONTHS_QUERY = text("""
+    SELECT DISTINCT CAST(date_trunc('month', transaction_date) AS DATE) AS month
+    FROM transactions_default
+    ORDER BY month
+""")
+
+IS_PARTITIONED_QUERY = text("SELECT relkind = 'p' FROM pg_class WHERE oid = CAST('transactions' AS regclass)")
+
+PARTITIONS_QUERY = text("""
+    SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bounds, GREATEST(c.reltuples, 0)::bigint AS estimated_rows
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = CAST('transactions' AS regclass)
+    ORDER BY c.relname
+""")
+
+class PartitionRepository:
+    """
+    Monthly range partitions of transactions. Runs in the caller's transaction;
+    the caller commits.
+    """
+
+    def is_partitioned(self, db: Session) -> bool:
+        return bool(db.execute(IS_PARTITIONED_QUERY).scalar())
+
+    def ensure_range(self, db: Session, first_month: date, last_month: date) -> int:
+        """
+        Create the missing partitions for first_month..last_month (inclusive).
+        Returns the number created.
+        """
+        return db.execute(ENSURE_RANGE_QUERY, {"first_month": first_month, "last_month": last_month}).scalar()
+
+    def ensure_partitions(self, db: Session, months_ahead: int) -> int:
+        """
+        Partitions for the current month and the next months_ahead, plus one for
+        every month that has rows in the default partition (those rows move into it).
+        Returns the number created.
+        """
+        created = db.execute(ENSURE_AHEAD_QUERY, {"months_ahead": months_ahead}).scalar()
+        for month in db.execute(DEFAULT_MONTHS_QUERY).scalars().all():
+            created += self.ensure_range(db, month, month)
+        return created
+
+    def list_partitions(self, db: Session) -> List[Dict[str, Any]]:
+        return [dict(row._mapping) for row in db.execute(PARTITIONS_QUERY)]
+
+partition_repo = PartitionRepository()
@@ -1,23 +1,155 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, select, tuple_
+from datetime import date, datetime, timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import decode_cursor, keyset_page
+from app.core.response_cache import response_cache, DASHBOARD, RISK_OVERVIEW
 from app.models.transaction import Transaction
 from app.schemas.transaction_schema import TransactionCreate
+from app.repositories.client_exposure_repo import client_exposure_repo
+from app.repositories.daily_stats_repo import daily_stats_repo
+from app.repositories.kpi_repo import kpi_repo
+
+# Newest first; transaction_id breaks ties between rows with the same timestamp
+TRANSACTION_ORDER = (Transaction.transaction_date.desc(), Transaction.transaction_id.desc())
+
+# transactions is partitioned by date, so its own key can't keep ids unique; every insert
+# claims its id here first and fails with IntegrityError if it is already taken
+CLAIM_TRANSACTION_ID_QUERY = text("INSERT INTO transaction_ids (transaction_id) VALUES (:transaction_id)")
+
+# For loads that bypass the repository
+REGISTER_TRANSACTION_IDS_QUERY = text("""
+    INSERT INTO transaction_ids (transaction_id)
+    SELECT transaction_id FROM transactions
+    ON CONFLICT (transaction_id) DO NOTHING
+""")
+
+# Columns written by bulk exports, in output order
+EXPORT_COLUMNS = (
+    Transaction.transaction_id,
+    Transaction.client_id,
+    Transaction.amount,
+    Transaction.currency,
+    Transaction.status,
+    Transaction.transaction_date,
+    Transaction.sla_breach_flag,
+)
 
 class TransactionRepository:
+    def _transactions_page_query(self, limit: int, cursor: Optional[str]):
+        """
+        Keyset page over (transaction_date, transaction_id), served by idx_transaction_date_id.
+        Fetches one extra row to tell whether another page follows.
+        """
+        query = select(Transaction).order_by(*TRANSACTION_ORDER)
+        if cursor:
+            last_date, last_id = decode_cursor(cursor, (datetime.fromisoformat, str))
+            query = query.filter(
+                tuple_(Transaction.transaction_date, Transaction.transaction_id) < (last_date, last_id),
+                # Implied by the row comparison, but only a plain range on the partition key
+                # lets the planner skip the newer monthly partitions
+                Transaction.transaction_date <= last_date,
+            )
+        return query.limit(limit + 1)
+
+    def _transaction_key(self, txn: Transaction):
+        return (txn.transaction_date, txn.transaction_id)
+
     def get_transaction(self, db: Session, transaction_id: str):
         return db.query(Transaction).filter(Transaction.transaction_id == transaction_id).first()
 
     def create_transaction(self, db: Session, transaction: TransactionCreate):
+        db.execute(CLAIM_TRANSACTION_ID_QUERY, {"transaction_id": transaction.transaction_id})
         db_transaction = Transaction(**transaction.dict())
         db.add(db_transaction)
+        # Flush first so column defaults are populated, then update the rollups in the same transaction
+        db.flush()
+        daily_stats_repo.record_transactions(db, [db_transaction])
+        kpi_repo.record_transactions(db, [db_transaction])
+        client_exposure_repo.record_transactions(db, [db_transaction])
         db.commit()
+        response_cache.invalidate(DASHBOARD, RISK_OVERVIEW)
         db.refresh(db_transaction)
         return db_transaction
     
+    def register_ids(self, db: Session) -> int:
+        """
+        Claim the ids of transactions loaded without the repository (seeding, COPY).
+        Returns the number of ids added.
+        """
+        added = db.execute(REGISTER_TRANSACTION_IDS_QUERY).rowcount
+        db.commit()
+        return added
+
     def get_transactions_by_client(self, db: Session, client_id: int, skip: int = 0, limit: int = 100):
         return db.query(Transaction).filter(Transaction.client_id == client_id).offset(skip).limit(limit).all()
 
     def get_all_transactions(self, db: Session, skip: int = 0, limit: int = 50):
-        return db.query(Transaction).order_by(Transaction.transaction_date.desc()).offset(skip).limit(limit).all()
+        # Offset mode, kept for existing callers; deep pages scan and discard `skip` rows
+        return db.query(Transaction).order_by(*TRANSACTION_ORDER).offset(skip).limit(limit).all()
+
+    def get_transactions_page(self, db: Session, limit: int = 50, cursor: Optional[str] = None):
+        """
+        Returns (transactions, next_cursor); next_cursor is None on the last page.
+        """
+        rows = db.execute(self._transactions_page_query(limit, cursor)).scalars().all()
+        return keyset_page(rows, limit, self._transaction_key)
+
+    async def get_transaction_async(self, db: AsyncSession, transaction_id: str):
+        return await db.get(Transaction, transaction_id)
+
+    async def create_transaction_async(self, db: AsyncSession, transaction: TransactionCreate):
+        await db.execute(CLAIM_TRANSACTION_ID_QUERY, {"transaction_id": transaction.transaction_id})
+        db_transaction = Transaction(**transaction.dict())
+        db.add(db_transaction)
+        await db.flush()
+        await daily_stats_repo.record_transactions_async(db, [db_transaction])
+        await kpi_repo.record_transactions_async(db, [db_transaction])
+        await client_exposure_repo.record_transactions_async(db, [db_transaction])
+        await db.commit()
+        await response_cache.invalidate_async(DASHBOARD, RISK_OVERVIEW)
+        await db.refresh(db_transaction)
+        return db_transaction
+
+    async def get_transactions_by_client_async(self, db: AsyncSession, client_id: int, skip: int = 0, limit: int = 100):
+        query = select(Transaction).filter(Transaction.client_id == client_id).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_all_transactions_async(self, db: AsyncSession, skip: int = 0, limit: int = 50):
+        query = select(Transaction).order_by(*TRANSACTION_ORDER).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_transactions_page_async(self, db: AsyncSession, limit: int = 50, cursor: Optional[str] = None):
+        result = await db.execute(self._transactions_page_query(limit, cursor))
+        return keyset_page(result.scalars().all(), limit, self._transaction_key)
+
+    def export_query(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        client_id: Optional[int] = None,
+        status: Optional[str] = None,
+        sla_breach: Optional[bool] = None,
+    ):
+        """
+        Plain columns (no ORM objects) in (transaction_date, transaction_id) order,
+        for an inclusive day range. Date bounds are range predicates so
+        idx_transaction_date_id / idx_transaction_client_date can drive the scan.
+        """
+        query = select(*EXPORT_COLUMNS).order_by(Transaction.transaction_date, Transaction.transaction_id)
+        if start_day:
+            query = query.filter(Transaction.transaction_date >= datetime.combine(start_day, datetime.min.time()))
+        if end_day:
+            query = query.filter(Transaction.transaction_date < datetime.combine(end_day + timedelta(days=1), datetime.min.time()))
+        if client_id is not None:
+            query = query.filter(Transaction.client_id == client_id)
+        if status:
+            query = query.filter(Transaction.status == status)
+        if sla_breach is not None:
+            query = query.filter(Transaction.sla_breach_flag == sla_breach)
+        return query
 
 transaction_repo = TransactionRepository()
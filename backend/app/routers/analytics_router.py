@@ -1,27 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Any
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, HTTPException, Request
+from typing import Any, Dict
+from app.core.config import settings
+from app.core.response_cache import response_cache, is_complete, DASHBOARD
+from app.core.sql_registry import sql_registry
 from app.services.analytics_service import analytics_service
 from app.schemas.analytics_schema import AnalyticsResponse
 from app.schemas.common_schema import APIResponse
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/dashboard", response_model=APIResponse[AnalyticsResponse])
-def get_analytics_dashboard(db: Session = Depends(get_db)) -> Any:
+async def get_analytics_dashboard(request: Request) -> Any:
     """
     Get comprehensive analytics dashboard data.
+    Sections are queried in parallel; meta.partial/meta.failed report any that failed.
+    Cached for DASHBOARD_CACHE_TTL_SECONDS and revalidated with ETag/If-None-Match.
     """
-    try:
-        data = analytics_service.get_dashboard_data(db)
+    async def build():
+        data, meta = await analytics_service.get_dashboard_data_async()
         return {
             "success": True,
             "data": data,
-            "meta": {"execution_time_ms": 12}, # Placeholder for timing middleware
+            "meta": meta,
             "error": None
         }
+
+    try:
+        return await response_cache.respond(
+            request, DASHBOARD, settings.DASHBOARD_CACHE_TTL_SECONDS, build, APIResponse[AnalyticsResponse], is_complete
+        )
     except Exception as e:
         # In production, log error and return specific error codes
         print(f"Error: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@router.get("/query-stats", response_model=APIResponse[Dict[str, Any]])
+def get_query_stats() -> Any:
+    """
+    Per-query call counts and latency for the app/sql registry.
+    """
+    return {
+        "success": True,
+        "data": sql_registry.stats(),
+        "error": None
+    }
@@ -1,41 +1,65 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.repositories.client_repo import ClientRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.export_formats import EXPORT_FORMAT_PATTERN, export_response
+from app.core.pagination import InvalidCursorError
+from app.repositories.client_repo import ClientRepository, EXPORT_COLUMNS
 from app.schemas.client_schema import ClientResponse
 from app.schemas.common_schema import APIResponse
-from typing import List
+from typing import List, Optional
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 client_repo = ClientRepository()
 
 @router.get("/", response_model=APIResponse[List[ClientResponse]])
-def get_clients(
+async def get_clients(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     search: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Fetch clients with optional search.
+    Keyset-paginated: pass next_cursor back as `cursor`. `skip` is kept for older clients.
     """
     try:
-        clients = client_repo.get_clients(db, skip=skip, limit=limit, search=search)
+        if skip and not cursor:
+            # Legacy offset mode: deep pages get slower, and no cursor is returned
+            clients = await client_repo.get_clients_async(db, skip=skip, limit=limit, search=search)
+            next_cursor = None
+        else:
+            clients, next_cursor = await client_repo.get_clients_page_async(db, limit=limit, cursor=cursor, search=search)
         return {
             "success": True,
             "data": clients,
-            "error": None
+            "error": None,
+            "next_cursor": next_cursor
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error fetching clients: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+@router.get("/export")
+async def export_clients(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    region: Optional[str] = None,
+    risk_rating: Optional[str] = None,
+):
+    """
+    Stream every matching client as CSV, NDJSON, an Arrow IPC stream or Parquet.
+    """
+    return export_response("clients", format, client_repo.export_query(region=region, risk_rating=risk_rating), EXPORT_COLUMNS)
+
 @router.get("/{client_id}", response_model=APIResponse[ClientResponse])
-def get_client(client_id: int, db: Session = Depends(get_db)):
+async def get_client(client_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Fetch a single client by ID.
     """
-    client = client_repo.get_client(db, client_id)
+    client = await client_repo.get_client_async(db, client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     return {
@@ -0,0 +1,90 @@
+import tempfile
+from typing import Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.columnar import ColumnarUnavailable
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.request_timing import TimedRoute
+from app.repositories.ingest_repo import ingest_repo
+from app.services.ingest_service import ingest_service, INGEST_FORMATS
+from app.schemas.common_schema import APIResponse
+from app.schemas.ingest_schema import BulkIngestResult, IngestResult
+
+router = APIRouter(route_class=TimedRoute)
+
+# Request bodies are buffered in memory up to this size, then on disk
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+CONTENT_TYPE_FORMATS = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+def _run_ingest(source, fmt: str):
+    db = SessionLocal()
+    try:
+        return ingest_service.ingest_transactions(db, source, fmt)
+    finally:
+        db.close()
+
+@router.post("/transactions", response_model=APIResponse[BulkIngestResult])
+async def ingest_transactions(request: Request, format: Optional[str] = Query(None, pattern="^(json|ndjson|csv)$")):
+    """
+    Bulk ingest a transaction feed: a JSON array, NDJSON or CSV (with a header
+    row), picked by `format` or else by Content-Type.
+    Rows are validated in batches of INGEST_BATCH_SIZE; valid rows are COPYed and
+    merged, existing ids are skipped. Each batch commits on its own and reports
+    its received/inserted/duplicate/rejected counts. If the feed is malformed
+    part way through, the committed batches are still returned, with
+    meta.partial set and the reason in meta.failed.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = format or CONTENT_TYPE_FORMATS.get(content_type)
+    if fmt not in INGEST_FORMATS:
+        raise HTTPException(status_code=415, detail="Send JSON, NDJSON or CSV, or pass ?format=")
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        try:
+            result = await run_in_threadpool(_run_ingest, body, fmt)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            print(f"Error ingesting transactions: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+    return {
+        "success": True,
+        "data": result,
+        "meta": {"partial": bool(result["error"]), "failed": {"feed": result["error"]} if result["error"] else None},
+        "error": None
+    }
+
+@router.post("/{table}/parquet", response_model=APIResponse[IngestResult])
+def ingest_parquet(table: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """
+    Bulk load a Parquet file into transactions, clients or operations.
+    Columns are matched by name; rows whose id already exists are skipped.
+    The file is read in INGEST_BATCH_SIZE batches and COPYed, then merged in one statement.
+    """
+    if table not in ingest_repo.models:
+        raise HTTPException(status_code=404, detail=f"Unknown table {table}")
+    try:
+        result = ingest_repo.load_parquet(db, table, file.file, settings.INGEST_BATCH_SIZE)
+    except ColumnarUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error ingesting {table}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+    return {
+        "success": True,
+        "data": result,
+        "error": None
+    }
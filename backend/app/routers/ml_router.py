@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Header
+from pydantic import BaseModel, Field, ValidationError
+from app.core.config import settings
 from app.services.ml_service import ml_service
-from typing import Optional
+from app.services.inference_executor import inference_executor, InferenceQueueFull, InferenceUnavailable
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 class PredictionRequest(BaseModel):
     amount: float
@@ -20,34 +24,177 @@ class PredictionResponse(BaseModel):
     model_version: str
     error: Optional[str] = None
 
+class ScoreResponse(BaseModel):
+    sla_prediction: Optional[int] = None
+    sla_probability: Optional[float] = None
+    failure_prediction: Optional[int] = None
+    failure_probability: Optional[float] = None
+    is_anomaly: Optional[int] = None
+    anomaly_score: Optional[float] = None
+    model_version: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchScoreItem(ScoreResponse):
+    index: int
+
+class ModelStatusResponse(BaseModel):
+    status: str
+    model_version: Optional[str] = None
+    loaded_at: Optional[datetime] = None
+    compiled_inference: bool
+    shared_preprocessing: bool
+    last_error: Optional[str] = None
+    cache: Optional[Dict[str, Any]] = None
+
+class ReloadResponse(ModelStatusResponse):
+    reloaded: bool
+
+class BatchPredictionRequest(BaseModel):
+    # Items are validated one by one so a malformed record only fails its own slot
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=settings.ML_BATCH_MAX_SIZE)
+
+class BatchPredictionItem(BaseModel):
+    index: int
+    prediction: Optional[int] = None
+    probability: Optional[float] = None
+    is_anomaly: Optional[int] = None
+    anomaly_score: Optional[float] = None
+    model_version: Optional[str] = None
+    error: Optional[str] = None
+
 from app.schemas.common_schema import APIResponse
 
-@router.post("/predict-sla", response_model=APIResponse[PredictionResponse])
-def predict_sla(request: PredictionRequest):
-    result = ml_service.predict_sla_breach(request.dict())
+def verify_admin_token(x_admin_token: Optional[str] = Header(None)):
+    # No token configured means the admin endpoints are off, not open
+    if not settings.ML_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set ML_ADMIN_TOKEN to enable them")
+    if x_admin_token != settings.ML_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+    )
+
+async def _infer(method: str, *args) -> Dict[str, Any]:
+    """
+    Run an MLService method on the inference executor and map service errors to 503.
+    """
+    try:
+        result = await inference_executor.run(method, *args)
+    except InferenceQueueFull:
+        raise HTTPException(status_code=503, detail="Inference queue is full, retry later")
+    except InferenceUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
     if "error" in result:
         raise HTTPException(status_code=503, detail=result["error"])
+    return result
+
+async def _run_batch(method: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate each item against PredictionRequest, score the valid ones in a single
+    service call and merge everything back into input order.
+    """
+    results: List[Dict[str, Any]] = [None] * len(items)
+    records = []
+    positions = []
+    for i, item in enumerate(items):
+        try:
+            records.append(PredictionRequest(**item).dict())
+            positions.append(i)
+        except ValidationError as e:
+            results[i] = {"error": _format_validation_error(e)}
+
+    if records:
+        scored = await _infer(method, records)
+        for position, result in zip(positions, scored["results"]):
+            results[position] = result
+
+    return [{"index": i, **result} for i, result in enumerate(results)]
+
+@router.post("/predict-sla", response_model=APIResponse[PredictionResponse])
+async def predict_sla(request: PredictionRequest):
+    result = await _infer("predict_sla_breach", request.dict())
     return {
         "success": True,
         "data": result
     }
 
 @router.post("/predict-failure", response_model=APIResponse[PredictionResponse])
-def predict_failure(request: PredictionRequest):
-    result = ml_service.predict_failure(request.dict())
-    if "error" in result:
-        raise HTTPException(status_code=503, detail=result["error"])
+async def predict_failure(request: PredictionRequest):
+    result = await _infer("predict_failure", request.dict())
     return {
         "success": True,
         "data": result
     }
 
 @router.post("/detect-anomaly", response_model=APIResponse[PredictionResponse])
-def detect_anomaly(request: PredictionRequest):
-    result = ml_service.detect_anomaly(request.dict())
-    if "error" in result:
-        raise HTTPException(status_code=503, detail=result["error"])
+async def detect_anomaly(request: PredictionRequest):
+    result = await _infer("detect_anomaly", request.dict())
     return {
         "success": True,
         "data": result
     }
+
+@router.post("/predict-sla/batch", response_model=APIResponse[List[BatchPredictionItem]])
+async def predict_sla_batch(request: BatchPredictionRequest):
+    return {
+        "success": True,
+        "data": await _run_batch("predict_sla_breach_batch", request.items)
+    }
+
+@router.post("/predict-failure/batch", response_model=APIResponse[List[BatchPredictionItem]])
+async def predict_failure_batch(request: BatchPredictionRequest):
+    return {
+        "success": True,
+        "data": await _run_batch("predict_failure_batch", request.items)
+    }
+
+@router.post("/detect-anomaly/batch", response_model=APIResponse[List[BatchPredictionItem]])
+async def detect_anomaly_batch(request: BatchPredictionRequest):
+    return {
+        "success": True,
+        "data": await _run_batch("detect_anomaly_batch", request.items)
+    }
+
+@router.post("/score", response_model=APIResponse[ScoreResponse])
+async def score(request: PredictionRequest):
+    """
+    SLA breach, failure and anomaly scores for one transaction in a single call.
+    """
+    result = await _infer("score", request.dict())
+    return {
+        "success": True,
+        "data": result
+    }
+
+@router.post("/score/batch", response_model=APIResponse[List[BatchScoreItem]])
+async def score_batch(request: BatchPredictionRequest):
+    return {
+        "success": True,
+        "data": await _run_batch("score_batch", request.items)
+    }
+
+@router.get("/status", response_model=APIResponse[ModelStatusResponse])
+def model_status():
+    """
+    Readiness and loaded artifact version of the ML models.
+    """
+    return {
+        "success": True,
+        "data": ml_service.status_info()
+    }
+
+@router.post("/reload", response_model=APIResponse[ReloadResponse], dependencies=[Depends(verify_admin_token)])
+def reload_models(force: bool = False):
+    """
+    Reload the model artifacts from disk and swap them in without dropping in-flight requests.
+    A no-op when the artifacts haven't changed, unless force is set.
+    """
+    reloaded = ml_service.load(force=force)
+    if not ml_service.is_ready:
+        raise HTTPException(status_code=503, detail=ml_service.last_error or "Model not loaded")
+    return {
+        "success": True,
+        "data": {**ml_service.status_info(), "reloaded": reloaded}
+    }
@@ -1,30 +1,54 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.repositories.operation_repo import OperationRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.export_formats import EXPORT_FORMAT_PATTERN, export_response
+from app.core.pagination import InvalidCursorError
+from app.repositories.operation_repo import OperationRepository, EXPORT_COLUMNS
 from app.schemas.operation_schema import OperationResponse
 from app.schemas.common_schema import APIResponse
-from typing import List
+from typing import List, Optional
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 operation_repo = OperationRepository()
 
 @router.get("/", response_model=APIResponse[List[OperationResponse]])
-def get_operations(
+async def get_operations(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Fetch system operations logs.
+    Keyset-paginated: pass next_cursor back as `cursor`. `skip` is kept for older clients.
     """
     try:
-        operations = operation_repo.get_operations(db, skip=skip, limit=limit)
+        if skip and not cursor:
+            # Legacy offset mode: deep pages get slower, and no cursor is returned
+            operations = await operation_repo.get_operations_async(db, skip=skip, limit=limit)
+            next_cursor = None
+        else:
+            operations, next_cursor = await operation_repo.get_operations_page_async(db, limit=limit, cursor=cursor)
         return {
             "success": True,
             "data": operations,
-            "error": None
+            "error": None,
+            "next_cursor": next_cursor
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error fetching operations: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@router.get("/export")
+async def export_operations(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    region: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """
+    Stream every matching operation as CSV, NDJSON, an Arrow IPC stream or Parquet.
+    """
+    return export_response("operations", format, operation_repo.export_query(region=region, status=status), EXPORT_COLUMNS)
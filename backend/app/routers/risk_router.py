@@ -1,25 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.repositories.analytics_repo import AnalyticsRepository
+from fastapi import APIRouter, HTTPException, Request
+from app.core.config import settings
+from app.core.response_cache import response_cache, is_complete, RISK_OVERVIEW
+from app.services.analytics_service import analytics_service
 from app.schemas.common_schema import APIResponse
 from typing import Any
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
-analytics_repo = AnalyticsRepository()
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/overview", response_model=APIResponse[Any])
-def get_risk_overview(db: Session = Depends(get_db)):
+async def get_risk_overview(request: Request):
     """
     Get aggregated risk metrics for the Risk Monitor.
+    Sections are queried in parallel; meta.partial/meta.failed report any that failed.
+    Cached for RISK_OVERVIEW_CACHE_TTL_SECONDS and revalidated with ETag/If-None-Match.
     """
-    try:
-        data = analytics_repo.get_risk_metrics(db)
+    async def build():
+        data, meta = await analytics_service.get_risk_overview_async()
         return {
             "success": True,
             "data": data,
+            "meta": meta,
             "error": None
         }
+
+    try:
+        return await response_cache.respond(
+            request, RISK_OVERVIEW, settings.RISK_OVERVIEW_CACHE_TTL_SECONDS, build, APIResponse[Any], is_complete
+        )
     except Exception as e:
         print(f"Error fetching risk metrics: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,30 +1,64 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.repositories.transaction_repo import transaction_repo
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.export_formats import EXPORT_FORMAT_PATTERN, export_response
+from app.core.pagination import InvalidCursorError
+from app.repositories.transaction_repo import transaction_repo, EXPORT_COLUMNS
 from app.schemas.common_schema import APIResponse
-from typing import List, Any
+from typing import List, Any, Optional
+from datetime import date
+from app.core.request_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 from app.schemas.transaction_schema import TransactionResponse
 
 @router.get("/", response_model=APIResponse[List[TransactionResponse]])
-def get_transactions(
+async def get_transactions(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Fetch paginated transactions.
+    Keyset-paginated: pass next_cursor back as `cursor`. `skip` is kept for older clients.
     """
     try:
-        transactions = transaction_repo.get_all_transactions(db, skip=skip, limit=limit)
+        if skip and not cursor:
+            # Legacy offset mode: deep pages get slower, and no cursor is returned
+            transactions = await transaction_repo.get_all_transactions_async(db, skip=skip, limit=limit)
+            next_cursor = None
+        else:
+            transactions, next_cursor = await transaction_repo.get_transactions_page_async(db, limit=limit, cursor=cursor)
         return {
             "success": True,
             "data": transactions,
-            "error": None
+            "error": None,
+            "next_cursor": next_cursor
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error fetching transactions: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    start_date: Optional[date] = Query(None, description="First day included"),
+    end_date: Optional[date] = Query(None, description="Last day included"),
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    sla_breach: Optional[bool] = None,
+):
+    """
+    Stream every matching transaction, oldest first, as CSV, NDJSON, an Arrow IPC
+    stream or Parquet. Memory use doesn't grow with the size of the export.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    query = transaction_repo.export_query(
+        start_day=start_date, end_day=end_date, client_id=client_id, status=status, sla_breach=sla_breach
+    )
+    return export_response("transactions", format, query, EXPORT_COLUMNS)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 class KPIResponse(BaseModel):
     total_volume: float
@@ -18,10 +18,11 @@ class HighRiskClient(BaseModel):
     region: str
     risk_rating: str
     total_exposure: float
-    region_rank: int
-    exposure_quartile: int
+    # None until the next rank recompute for clients new to the rollup
+    region_rank: Optional[int] = None
+    exposure_quartile: Optional[int] = None
 
 class AnalyticsResponse(BaseModel):
-    kpis: KPIResponse
+    kpis: Optional[KPIResponse] = None  # None when the KPI section failed (see meta.failed)
     trend: List[TrendPoint]
     risk_distribution: List[HighRiskClient]
@@ -1,13 +1,22 @@
 from pydantic import BaseModel
-from typing import Generic, TypeVar, Optional, Any
+from typing import Generic, TypeVar, Optional, Any, Dict
 
 T = TypeVar("T")
 
 class MetaData(BaseModel):
+    # Wall time up to the endpoint returning; the Server-Timing header adds serialization
     execution_time_ms: int
+    db_time_ms: Optional[float] = None
+    db_query_count: Optional[int] = None
+    ml_time_ms: Optional[float] = None
+    # Set when some sections of a composite response failed or timed out
+    partial: bool = False
+    failed: Optional[Dict[str, str]] = None
 
 class APIResponse(BaseModel, Generic[T]):
     success: bool
     data: Optional[T] = None
     meta: Optional[MetaData] = None
     error: Optional[str] = None
+    # Opaque keyset cursor for the next page of list endpoints; None on the last page
+    next_cursor: Optional[str] = None
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class IngestResult(BaseModel):
+    received: int
+    inserted: int
+    # Already present (same id) or referencing an unknown client
+    skipped: int
+
+class IngestBatchResult(BaseModel):
+    batch: int
+    received: int
+    inserted: int
+    # Id already present, or repeated earlier in the feed
+    duplicates: int
+    # Failed validation or reference an unknown client
+    rejected: int
+    errors: List[str]
+
+class BulkIngestResult(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int
+    rejected: int
+    batches: List[IngestBatchResult]
+    # Set when the feed was malformed part way through; the counts cover the batches before it
+    error: Optional[str] = None
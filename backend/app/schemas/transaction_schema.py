@@ -9,10 +9,7 @@ class TransactionCreate(BaseModel):
     currency: str
     status: str
     transaction_date: datetime
-    region: str
-    merchant_category: str
-    payment_method: str
-    risk_rating: str
+    sla_breach_flag: bool = False
 
 class TransactionResponse(BaseModel):
     transaction_id: str
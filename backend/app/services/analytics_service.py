@@ -1,6 +1,9 @@
+import time
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.parallel_queries import run_parallel
 from app.repositories.analytics_repo import AnalyticsRepository
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 class AnalyticsService:
     def __init__(self):
@@ -17,4 +20,43 @@ class AnalyticsService:
             "risk_distribution": risk_exposure
         }
 
+    async def _run_sections(self, queries: Dict[str, Any], defaults: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run independent sections in parallel and fill failed ones with their defaults.
+        Returns (data, meta); meta lists the failed sections when the result is partial.
+        Raises when every section failed, so the endpoint still answers 500 in that case.
+        """
+        started = time.perf_counter()
+        results, failed = await run_parallel(queries, settings.ANALYTICS_SUBQUERY_TIMEOUT_SECONDS)
+        if not results:
+            raise RuntimeError(f"All sections failed: {failed}")
+
+        data = {name: results.get(name, defaults[name]) for name in queries}
+        meta = {
+            "execution_time_ms": int((time.perf_counter() - started) * 1000),
+            "partial": bool(failed),
+            "failed": failed or None
+        }
+        return data, meta
+
+    async def get_dashboard_data_async(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return await self._run_sections(
+            {
+                "kpis": self.repo.get_kpis_async,
+                "trend": self.repo.get_transaction_trends_async,
+                "risk_distribution": self.repo.get_risk_exposure_async,
+            },
+            defaults={"kpis": None, "trend": [], "risk_distribution": []}
+        )
+
+    async def get_risk_overview_async(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return await self._run_sections(
+            {
+                "regional_risk": self.repo.get_regional_risk_async,
+                "risk_distribution": self.repo.get_rating_distribution_async,
+                "flagged_transactions": self.repo.get_flagged_transactions_async,
+            },
+            defaults={"regional_risk": [], "risk_distribution": [], "flagged_transactions": []}
+        )
+
 analytics_service = AnalyticsService()
@@ -0,0 +1,377 @@
+import io
+import threading
+import time
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Date, cast, select, text
+from sqlalchemy.orm import Session
+from app.core.copy_io import copy_query_to_csv
+from app.core.database import SessionLocal
+from app.core.metrics import errors
+from app.core.response_cache import response_cache, DASHBOARD, RISK_OVERVIEW
+from app.models.client import Client
+from app.models.transaction import Transaction
+
+EPOCH = date(1970, 1, 1)
+
+DAYS_QUERY = text("SELECT day, volume, txn_count FROM transaction_daily_stats")
+
+# Cheap enough for every refresh; clients are mostly only ever inserted
+CLIENT_STATE_QUERY = text("SELECT COUNT(*), MAX(client_id) FROM clients")
+
+# Float sums of the same rows differ slightly with summation order
+VOLUME_TOLERANCE = 0.01
+
+# Consecutive stale days are reloaded together, up to this many per query, which
+# keeps the first load at about a month (one partition) of rows in memory at a time
+MAX_DAYS_PER_LOAD = 31
+
+class _Dictionary:
+    """
+    Dictionary encoding for a categorical column: values get stable codes in order
+    of first appearance, so codes already stored stay valid as new values arrive.
+    """
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    def encode(self, values: pd.Series) -> np.ndarray:
+        values = values.astype(object).where(values.notna(), None)
+        for value in values.unique():
+            if value not in self._codes:
+                self._codes[value] = len(self.values)
+                self.values.append(value)
+        return values.map(self._codes).to_numpy(dtype=np.int16)
+
+class _DayBlock:
+    """
+    One day of transactions, column-wise. client is the row's index into the client
+    dimension and region its client's region code, joined in when the day is loaded
+    (-1 for transactions without a known client).
+    """
+    __slots__ = ("amount", "client", "region", "volume", "count")
+
+    def __init__(self, amount: np.ndarray, client: np.ndarray, region: np.ndarray):
+        self.amount = amount
+        self.client = client
+        self.region = region
+        self.volume = float(amount.sum())
+        self.count = len(amount)
+
+class AnalyticsSnapshot:
+    """
+    Optional in-process columnar copy of the columns the dashboard aggregates:
+    per transaction its amount, day and client (with the client's region
+    pre-joined), and per client its region and risk rating, as NumPy arrays with
+    dictionary-encoded categoricals. About 14 bytes per transaction.
+
+    Refreshed on a daemon thread every ANALYTICS_SNAPSHOT_REFRESH_SECONDS. The
+    transaction_daily_stats rollup is updated in the same transaction as every
+    insert, so each refresh compares every rollup row (one per day, a few thousand
+    at most) with the snapshot's count and volume for that day, and reloads only
+    the days that differ (with the day's range predicate, so one partition and
+    index range). Nothing depends on commit timing, so a long transaction that
+    commits late is picked up by the next refresh like any other. Both tables are
+    read in one REPEATABLE READ transaction, so the rollup and the rows it is
+    compared with agree.
+
+    New clients are appended on any refresh where the client count or the highest
+    client_id moved. Every ANALYTICS_SNAPSHOT_CLIENT_CHECK_SECONDS the whole client
+    table is compared instead: changed risk ratings are patched in place, and a
+    changed region or a deleted client (which a count can't see when matched by an
+    insert) reloads the snapshot from scratch.
+
+    Running totals (per day, per region, per client) are adjusted by the reloaded
+    days only, and the answers are rebuilt from them, so reads are list copies.
+    Until the first load completes `ready` is False and callers use SQL. Each API
+    worker process keeps its own snapshot.
+    """
+
+    def __init__(self):
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reset()
+        # Answers, swapped in whole at the end of a refresh
+        self._trend: Tuple[np.ndarray, np.ndarray, np.ndarray] = (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int64))
+        self._regional: List[Tuple[Any, float, int]] = []
+        self._rating_counts: List[Tuple[Any, int]] = []
+        self.ready = False
+        self.version = 0
+        self.last_refresh_ms = 0.0
+
+    def _reset(self):
+        """
+        Drop the loaded data (not the answers being served); the next comparison
+        then finds every day stale and reloads it.
+        """
+        self._days: Dict[int, _DayBlock] = {}
+        # Client dimension, in load order (an index never changes once assigned)
+        self._client_ids = np.empty(0, dtype=np.int64)
+        self._client_region = np.empty(0, dtype=np.int16)
+        self._client_rating = np.empty(0, dtype=np.int16)
+        self._sorted_ids = np.empty(0, dtype=np.int64)
+        self._sorted_index = np.empty(0, dtype=np.int64)
+        self._regions = _Dictionary()
+        self._ratings = _Dictionary()
+        self._clients_checked_at: Optional[float] = None
+        # Running totals over all loaded days
+        self._region_volume = np.zeros(0, dtype=np.float64)
+        self._client_txns = np.zeros(0, dtype=np.int64)
+
+    # --- loading -------------------------------------------------------------
+
+    def _copy_frame(self, db: Session, query, names: List[str], dtypes: Dict[str, Any]) -> pd.DataFrame:
+        buffer = io.BytesIO()
+        copy_query_to_csv(db, query, buffer)
+        if not buffer.tell():
+            return pd.DataFrame({name: pd.Series(dtype=dtypes.get(name, object)) for name in names})
+        buffer.seek(0)
+        return pd.read_csv(buffer, header=None, names=names, dtype=dtypes)
+
+    def _sync_clients(self, db: Session, full_check: bool) -> bool:
+        """
+        Append clients the dimension doesn't have yet; with `full_check`, also
+        apply changed ratings and start over on a changed region or a deleted client.
+        Returns whether anything changed.
+        """
+        count, max_id = db.execute(CLIENT_STATE_QUERY).one()
+        known_max = int(self._client_ids.max()) if len(self._client_ids) else None
+        if not full_check and count == len(self._client_ids) and max_id == known_max:
+            return False
+        # Fewer clients, or a lower highest id, than loaded: some were deleted
+        full_check = full_check or count < len(self._client_ids) or (known_max is not None and (max_id is None or max_id < known_max))
+        query = select(Client.client_id, Client.region, Client.risk_rating)
+        frame = self._copy_frame(db, query, ["client_id", "region", "risk_rating"], {"client_id": np.int64, "region": object, "risk_rating": object})
+        self._clients_checked_at = time.monotonic()
+        changed = False
+        if full_check and len(self._client_ids):
+            index = self._client_index(frame["client_id"].to_numpy())
+            known = index >= 0
+            region = self._regions.encode(frame["region"][known])
+            if known.sum() < len(self._client_ids) or (region != self._client_region[index[known]]).any():
+                # Already-loaded transactions carry their client's region, so reload them all
+                self._reset()
+                self._clients_checked_at = time.monotonic()
+            else:
+                rating = self._ratings.encode(frame["risk_rating"][known])
+                changed = bool((rating != self._client_rating[index[known]]).any())
+                self._client_rating[index[known]] = rating
+        frame = frame[~np.isin(frame["client_id"].to_numpy(), self._client_ids)]
+        if frame.empty:
+            return changed
+        self._client_ids = np.concatenate([self._client_ids, frame["client_id"].to_numpy()])
+        self._client_region = np.concatenate([self._client_region, self._regions.encode(frame["region"])])
+        self._client_rating = np.concatenate([self._client_rating, self._ratings.encode(frame["risk_rating"])])
+        self._sorted_index = np.argsort(self._client_ids, kind="stable")
+        self._sorted_ids = self._client_ids[self._sorted_index]
+        self._client_txns = np.concatenate([self._client_txns, np.zeros(len(frame), dtype=np.int64)])
+        self._region_volume = np.concatenate([self._region_volume, np.zeros(len(self._regions.values) - len(self._region_volume))])
+        return True
+
+    def _client_index(self, client_ids: np.ndarray) -> np.ndarray:
+        """
+        Dimension index per client id, -1 for ids not in the dimension (or NULL, passed as -1).
+        """
+        if not len(self._sorted_ids):
+            return np.full(len(client_ids), -1, dtype=np.int64)
+        position = np.minimum(np.searchsorted(self._sorted_ids, client_ids), len(self._sorted_ids) - 1)
+        found = self._sorted_ids[position] == client_ids
+        return np.where(found, self._sorted_index[position], -1)
+
+    def _load_days(self, db: Session, first_day: int, last_day: int) -> Dict[int, _DayBlock]:
+        """
+        Blocks for the days in [first_day, last_day] that have transactions.
+        """
+        start = EPOCH + timedelta(days=first_day)
+        end = EPOCH + timedelta(days=last_day + 1)
+        query = (
+            select(
+                cast(Transaction.transaction_date, Date) - cast(EPOCH, Date),
+                Transaction.amount,
+                Transaction.client_id,
+            )
+            .where(Transaction.transaction_date >= start, Transaction.transaction_date < end)
+        )
+        frame = self._copy_frame(db, query, ["day", "amount", "client_id"], {"day": np.int64, "amount": np.float64, "client_id": np.float64})
+        day = frame["day"].to_numpy()
+        # SUM() skips NULL amounts; adding zero does the same
+        amount = np.nan_to_num(frame["amount"].to_numpy())
+        client_ids = frame["client_id"].to_numpy()
+        client = self._client_index(np.where(np.isnan(client_ids), -1, client_ids).astype(np.int64))
+        region = np.where(client >= 0, self._client_region[client], -1).astype(np.int16)
+        client = client.astype(np.int32)
+
+        order = np.argsort(day, kind="stable")
+        day, amount, client, region = day[order], amount[order], client[order], region[order]
+        days, starts = np.unique(day, return_index=True)
+        bounds = list(starts[1:]) + [len(day)]
+        return {
+            int(d): _DayBlock(amount[s:e], client[s:e], region[s:e])
+            for d, s, e in zip(days, starts, bounds)
+        }
+
+    def _apply(self, block: _DayBlock, sign: int):
+        known = block.client >= 0
+        self._client_txns += sign * np.bincount(block.client[known], minlength=len(self._client_txns))
+        self._region_volume += sign * np.bincount(
+            block.region[known], weights=block.amount[known], minlength=len(self._region_volume)
+        )
+
+    def _replace_days(self, db: Session, days: List[int]):
+        """
+        Reload `days` (sorted) in runs of consecutive days, one query per run.
+        """
+        runs: List[List[int]] = []
+        for day in days:
+            if runs and day == runs[-1][-1] + 1 and len(runs[-1]) < MAX_DAYS_PER_LOAD:
+                runs[-1].append(day)
+            else:
+                runs.append([day])
+        for run in runs:
+            loaded = self._load_days(db, run[0], run[-1])
+            for day in run:
+                old = self._days.pop(day, None)
+                if old is not None:
+                    self._apply(old, -1)
+                new = loaded.get(day)
+                if new is not None:
+                    self._apply(new, 1)
+                    self._days[day] = new
+
+    def _stale_days(self, rows) -> List[int]:
+        """
+        Days whose rollup row doesn't match the snapshot, including loaded days
+        the rollup no longer has.
+        """
+        stale = []
+        seen = set()
+        for row in rows:
+            day = (row.day - EPOCH).days
+            seen.add(day)
+            block = self._days.get(day)
+            count, volume = (block.count, block.volume) if block else (0, 0.0)
+            if count != row.txn_count or abs(volume - float(row.volume)) > VOLUME_TOLERANCE:
+                stale.append(day)
+        stale.extend(day for day in self._days if day not in seen)
+        return sorted(stale)
+
+    def _rebuild_answers(self):
+        days = np.array(sorted(self._days), dtype=np.int64)
+        self._trend = (
+            days,
+            np.array([self._days[d].volume for d in days]),
+            np.array([self._days[d].count for d in days], dtype=np.int64),
+        )
+        # Regions of the clients with at least one transaction, as COUNT(DISTINCT client_id)
+        active = self._client_region[self._client_txns > 0]
+        client_counts = np.bincount(active, minlength=len(self._regions.values))
+        self._regional = [
+            (region, float(self._region_volume[code]), int(client_counts[code]))
+            for code, region in enumerate(self._regions.values)
+            if client_counts[code]
+        ]
+        rating_counts = np.bincount(self._client_rating, minlength=len(self._ratings.values))
+        self._rating_counts = [
+            (rating, int(rating_counts[code]))
+            for code, rating in enumerate(self._ratings.values)
+            if rating_counts[code]
+        ]
+
+    def refresh(self, db: Session, client_check_seconds: float = 300) -> int:
+        """
+        Bring the snapshot up to date; the first call loads everything.
+        Returns the number of days reloaded.
+        """
+        with self._refresh_lock:
+            started = time.perf_counter()
+            full_check = self._clients_checked_at is None or time.monotonic() - self._clients_checked_at >= client_check_seconds
+            try:
+                db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+                clients_changed = self._sync_clients(db, full_check)
+                stale = self._stale_days(db.execute(DAYS_QUERY).all())
+                self._replace_days(db, stale)
+            finally:
+                db.rollback()
+
+            changed = bool(stale) or clients_changed
+            if changed or not self.ready:
+                self._rebuild_answers()
+                self.version += 1
+            self.last_refresh_ms = (time.perf_counter() - started) * 1000
+            if changed and self.ready:
+                # Cached responses may have been built from the previous snapshot
+                response_cache.invalidate(DASHBOARD, RISK_OVERVIEW)
+            self.ready = True
+            return len(stale)
+
+    # --- reads -----------------------------------------------------------------
+
+    def transaction_trends(self, days: int = 30) -> List[Tuple[str, float, int]]:
+        """
+        (day, volume, count) from the latest day with data back `days` days, as daily_trend.sql.
+        """
+        day_numbers, volume, count = self._trend
+        if not len(day_numbers):
+            return []
+        start = np.searchsorted(day_numbers, day_numbers[-1] - days)
+        return [
+            ((EPOCH + timedelta(days=int(d))).isoformat(), float(v), int(c))
+            for d, v, c in zip(day_numbers[start:], volume[start:], count[start:])
+        ]
+
+    def regional_risk(self) -> List[Tuple[Any, float, int]]:
+        """
+        (region, total_exposure, client_count), as regional_risk.sql.
+        """
+        return list(self._regional)
+
+    def rating_distribution(self) -> List[Tuple[Any, int]]:
+        """
+        (risk_rating, count) over all clients, as risk_rating_distribution.sql.
+        """
+        return list(self._rating_counts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "version": self.version,
+            "days": len(self._days),
+            "transactions": int(sum(block.count for block in self._days.values())),
+            "clients": len(self._client_ids),
+            "last_refresh_ms": round(self.last_refresh_ms, 2),
+        }
+
+    # --- background refresh ------------------------------------------------------
+
+    def run_once(self, client_check_seconds: float) -> int:
+        db = SessionLocal()
+        try:
+            return self.refresh(db, client_check_seconds)
+        except Exception as e:
+            print(f"Analytics snapshot refresh failed: {e}")
+            errors.inc(source="analytics_snapshot")
+            return 0
+        finally:
+            db.close()
+
+    def start(self, interval_seconds: float, client_check_seconds: float):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def refresh():
+            self.run_once(client_check_seconds)
+            while not self._stop.wait(interval_seconds):
+                self.run_once(client_check_seconds)
+
+        self._thread = threading.Thread(target=refresh, name="analytics-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+analytics_snapshot = AnalyticsSnapshot()
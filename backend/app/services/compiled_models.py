@@ -0,0 +1,144 @@
+import numpy as np
+from typing import List, Dict, Any
+
+class CompiledPreprocessor:
+    """
+    Flat NumPy copy of a fitted ColumnTransformer made of StandardScaler and
+    OneHotEncoder(handle_unknown='ignore') blocks.
+    Produces the same matrix as ColumnTransformer.transform without building a DataFrame.
+    """
+
+    def __init__(self, numeric_features, numeric_columns, mean, scale, categorical_features, category_columns, n_features_out):
+        self.numeric_features = numeric_features
+        self.numeric_columns = numeric_columns
+        self.mean = mean
+        self.scale = scale
+        self.categorical_features = categorical_features
+        # One {category value: output column} map per categorical feature
+        self.category_columns = category_columns
+        self.n_features_out = n_features_out
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor) -> "CompiledPreprocessor":
+        # Imported here so importing the service doesn't pull in sklearn before the models load
+        from sklearn.preprocessing import StandardScaler, OneHotEncoder
+
+        numeric_features, numeric_columns, means, scales = [], [], [], []
+        categorical_features, category_columns = [], []
+        offset = 0
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            if isinstance(transformer, StandardScaler):
+                n = len(columns)
+                mean = transformer.mean_ if transformer.mean_ is not None else np.zeros(n)
+                scale = transformer.scale_ if transformer.scale_ is not None else np.ones(n)
+                numeric_features.extend(columns)
+                numeric_columns.extend(range(offset, offset + n))
+                means.extend(mean)
+                scales.extend(scale)
+                offset += n
+            elif isinstance(transformer, OneHotEncoder):
+                if transformer.handle_unknown != "ignore" or transformer.drop_idx_ is not None:
+                    raise ValueError(f"Unsupported OneHotEncoder configuration in '{name}'")
+                for column, categories in zip(columns, transformer.categories_):
+                    categorical_features.append(column)
+                    category_columns.append({value: offset + i for i, value in enumerate(categories)})
+                    offset += len(categories)
+            else:
+                raise ValueError(f"Unsupported transformer '{name}': {type(transformer).__name__}")
+
+        return cls(
+            numeric_features,
+            np.array(numeric_columns, dtype=np.intp),
+            np.array(means, dtype=np.float64),
+            np.array(scales, dtype=np.float64),
+            categorical_features,
+            category_columns,
+            offset,
+        )
+
+    def same_as(self, other: "CompiledPreprocessor") -> bool:
+        """
+        True when both produce identical output for any input.
+        """
+        return (
+            self.numeric_features == other.numeric_features
+            and np.array_equal(self.numeric_columns, other.numeric_columns)
+            and np.array_equal(self.mean, other.mean)
+            and np.array_equal(self.scale, other.scale)
+            and self.categorical_features == other.categorical_features
+            and self.category_columns == other.category_columns
+            and self.n_features_out == other.n_features_out
+        )
+
+    def transform_one(self, features: Dict[str, Any]) -> np.ndarray:
+        x = np.zeros(self.n_features_out)
+        numeric = np.array([float(features[name]) for name in self.numeric_features])
+        x[self.numeric_columns] = (numeric - self.mean) / self.scale
+        for name, columns in zip(self.categorical_features, self.category_columns):
+            column = columns.get(features[name])
+            if column is not None:
+                x[column] = 1.0
+        return x
+
+    def transform(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        n = len(records)
+        X = np.zeros((n, self.n_features_out))
+        numeric = np.array(
+            [[float(record[name]) for name in self.numeric_features] for record in records],
+            dtype=np.float64,
+        ).reshape(n, len(self.numeric_features))
+        X[:, self.numeric_columns] = (numeric - self.mean) / self.scale
+        for name, columns in zip(self.categorical_features, self.category_columns):
+            hits = [(row, columns.get(record[name])) for row, record in enumerate(records)]
+            rows = [row for row, column in hits if column is not None]
+            cols = [column for _, column in hits if column is not None]
+            X[rows, cols] = 1.0
+        return X
+
+
+class CompiledLogisticModel:
+    """
+    Binary LogisticRegression pipeline reduced to its preprocessing arrays,
+    coefficients and intercept.
+    """
+
+    def __init__(self, preprocessor: CompiledPreprocessor, coef: np.ndarray, intercept: float):
+        self.preprocessor = preprocessor
+        self.coef = coef
+        self.intercept = intercept
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "CompiledLogisticModel":
+        preprocessor = pipeline.named_steps["preprocessor"]
+        classifier = pipeline.named_steps["classifier"]
+        if list(classifier.classes_) != [0, 1] or classifier.coef_.shape[0] != 1:
+            raise ValueError("Only binary classifiers with classes [0, 1] can be compiled")
+        return cls(
+            CompiledPreprocessor.from_column_transformer(preprocessor),
+            np.ascontiguousarray(classifier.coef_[0], dtype=np.float64),
+            float(classifier.intercept_[0]),
+        )
+
+    @staticmethod
+    def _sigmoid(z):
+        # exp(-log(1 + exp(-z))) stays finite for large |z|
+        return np.exp(-np.logaddexp(0.0, -z))
+
+    def predict_proba_one(self, features: Dict[str, Any]) -> float:
+        """
+        Probability of class 1 for a single feature record.
+        """
+        z = self.preprocessor.transform_one(features) @ self.coef + self.intercept
+        return float(self._sigmoid(z))
+
+    def predict_proba(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Probability of class 1 for each record.
+        """
+        return self.predict_proba_from_matrix(self.preprocessor.transform(records))
+
+    def predict_proba_from_matrix(self, X: np.ndarray) -> np.ndarray:
+        return self._sigmoid(X @ self.coef + self.intercept)
@@ -0,0 +1,94 @@
+import threading
+from typing import Optional
+from sqlalchemy.engine import Connection
+from app.core.database import SessionLocal, engine
+from app.core.metrics import errors
+from app.repositories.client_exposure_repo import client_exposure_repo, TRY_RANKING_LOCK_QUERY, RELEASE_RANKING_LOCK_QUERY
+
+class ExposureRanking:
+    """
+    Recomputes client_exposure ranks and quartiles on startup and then every
+    EXPOSURE_RANK_INTERVAL_SECONDS, on a daemon thread. The totals themselves are
+    kept current by the writers; only the ranks lag by up to one interval.
+
+    Every worker process runs this thread, but only the one holding the ranking
+    advisory lock recomputes. The lock is session-level and kept on a dedicated
+    connection, so it is held for as long as that process runs; when it exits the
+    connection closes and another worker takes over on its next tick.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_connection: Optional[Connection] = None
+
+    def _holds_lock(self) -> bool:
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.exec_driver_sql("SELECT 1")
+                self._lock_connection.commit()
+                return True
+            except Exception:
+                # The connection (and the lock with it) is gone; compete for it again
+                self._lock_connection.invalidate()
+                self._lock_connection.close()
+                self._lock_connection = None
+        connection = engine.connect()
+        try:
+            acquired = connection.execute(TRY_RANKING_LOCK_QUERY).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._lock_connection = connection
+        return True
+
+    def _release_lock(self):
+        if self._lock_connection is None:
+            return
+        try:
+            self._lock_connection.execute(RELEASE_RANKING_LOCK_QUERY)
+            self._lock_connection.commit()
+        except Exception:
+            # Don't hand a connection that may still hold the lock back to the pool
+            self._lock_connection.invalidate()
+        self._lock_connection.close()
+        self._lock_connection = None
+
+    def run_once(self) -> int:
+        """
+        Returns the number of clients whose rank changed (0 when another worker ranks).
+        """
+        db = SessionLocal()
+        try:
+            if not self._holds_lock():
+                return 0
+            return client_exposure_repo.recompute_ranks(db)
+        except Exception as e:
+            print(f"Exposure rank recompute failed: {e}")
+            errors.inc(source="exposure_ranks")
+            return 0
+        finally:
+            db.close()
+
+    def start(self, interval_seconds: float):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def rank():
+            self.run_once()
+            while not self._stop.wait(interval_seconds):
+                self.run_once()
+            self._release_lock()
+
+        self._thread = threading.Thread(target=rank, name="exposure-ranking", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+exposure_ranking = ExposureRanking()
@@ -0,0 +1,168 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.request_timing import add_ml_time
+from app.services.ml_service import ml_service
+
+class InferenceQueueFull(Exception):
+    pass
+
+class InferenceUnavailable(Exception):
+    pass
+
+# MLService method -> model it runs ("all" for the fused scorer)
+MODEL_BY_METHOD = {
+    "predict_sla_breach": "sla",
+    "predict_failure": "failure",
+    "detect_anomaly": "anomaly",
+    "score": "all",
+}
+
+inference_latency = metrics.histogram(
+    "finsight_ml_inference_seconds", "MLService call latency as seen by the API, including executor queueing.",
+    ["model", "batch"]
+)
+inference_rejected = metrics.counter(
+    "finsight_ml_inference_rejected_total", "Inference calls rejected because the queue was full."
+)
+
+def _init_worker():
+    # Runs once per worker process: each worker keeps its own copy of the models
+    ml_service.load()
+
+def _invoke(method: str, *args) -> Any:
+    return getattr(ml_service, method)(*args)
+
+def _warm_up() -> Optional[str]:
+    return ml_service.model_version
+
+class InferenceExecutor:
+    """
+    Runs MLService calls off the request workers.
+    With ML_INFERENCE_WORKERS > 0 calls go to a process pool whose workers preload
+    the models, so CPU-heavy scoring neither holds the API process GIL nor competes
+    with the DB-backed routes for the threadpool. With 0 workers calls run on the
+    default threadpool against the in-process service.
+    Admission is bounded: beyond ML_INFERENCE_MAX_PENDING outstanding calls,
+    new ones are rejected instead of queueing without limit.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._pending = 0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            # spawn: the API process runs loader/watcher threads, which fork doesn't mix well with
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        for _ in range(self.workers):
+            pool.submit(_warm_up)
+        return pool
+
+    def start(self):
+        if self.workers <= 0 or self._pool:
+            return
+        self._pool = self._new_pool()
+        ml_service.add_reload_listener(self.restart)
+
+    def restart(self):
+        """
+        Swap in a fresh pool so workers pick up reloaded models.
+        The old pool finishes the calls it already accepted before its processes exit.
+        """
+        if self.workers <= 0:
+            return
+        with self._pool_lock:
+            old_pool = self._pool
+            self._pool = self._new_pool()
+        if old_pool:
+            old_pool.shutdown(wait=False)
+
+    def _replace_broken(self, pool: ProcessPoolExecutor):
+        """
+        Replace a pool whose worker died (crash, OOM kill). Only the first caller
+        to notice replaces it; the others find the new pool already in place.
+        """
+        with self._pool_lock:
+            if self._pool is not pool:
+                return
+            self._pool = self._new_pool()
+        print("Inference worker died; process pool replaced.")
+        pool.shutdown(wait=False)
+
+    async def _run_on_pool(self, method: str, *args) -> Any:
+        """
+        Submit to the current pool, retrying once on the pool that replaced it when
+        a restart shut it down between reading self._pool and submitting, or when
+        its workers broke.
+        """
+        for _ in range(2):
+            pool = self._pool
+            if pool is None:
+                return await run_in_threadpool(getattr(ml_service, method), *args)
+            try:
+                future = pool.submit(_invoke, method, *args)
+            except BrokenProcessPool:
+                self._replace_broken(pool)
+                continue
+            except RuntimeError:
+                # Shut down by restart(), which has already installed the new pool
+                continue
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                self._replace_broken(pool)
+        raise InferenceUnavailable("Inference workers are unavailable, retry later")
+
+    def shutdown(self):
+        with self._pool_lock:
+            pool = self._pool
+            self._pool = None
+        if pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, method: str, *args) -> Any:
+        """
+        Call ml_service.<method>(*args) on the configured executor.
+        Raises InferenceQueueFull when too many calls are already outstanding, and
+        InferenceUnavailable when the process pool fails twice in a row.
+        """
+        # Only touched from the event loop thread, so a plain counter is enough
+        if self._pending >= self.max_pending:
+            inference_rejected.inc()
+            raise InferenceQueueFull()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await self._run_on_pool(method, *args)
+        finally:
+            self._pending -= 1
+            elapsed = time.perf_counter() - started
+            add_ml_time(elapsed * 1000)
+            batch = method.endswith("_batch")
+            model = MODEL_BY_METHOD.get(method[:-len("_batch")] if batch else method, method)
+            inference_latency.observe(elapsed, model=model, batch=str(batch).lower())
+
+inference_executor = InferenceExecutor(settings.ML_INFERENCE_WORKERS, settings.ML_INFERENCE_MAX_PENDING)
+
+metrics.gauge(
+    "finsight_ml_inference_pending", "Inference calls currently outstanding.",
+    collect=lambda: [((), inference_executor.pending)]
+)
@@ -0,0 +1,278 @@
+import io
+import json
+import codecs
+import itertools
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.core.response_cache import response_cache, DASHBOARD, RISK_OVERVIEW
+from app.repositories.ingest_repo import ingest_repo
+
+INGEST_FORMATS = ("json", "ndjson", "csv")
+
+REQUIRED_TRANSACTION_FIELDS = ("transaction_id", "client_id", "amount", "currency", "status", "transaction_date")
+
+# clients.client_id is a 32-bit INTEGER
+CLIENT_ID_RANGE = (-2**31, 2**31 - 1)
+
+# JSON arrays are decoded element by element from chunks of this size; an element
+# that is still incomplete after this much text is rejected rather than buffered further
+JSON_READ_CHUNK = 64 * 1024
+MAX_JSON_ELEMENT_CHARS = 1024 * 1024
+
+BOOLEAN_VALUES = {"true": True, "t": True, "1": True, "yes": True, "false": False, "f": False, "0": False, "no": False}
+
+class IngestService:
+    """
+    Bulk transaction ingest: the feed is read in INGEST_BATCH_SIZE batches, each
+    batch is validated column-wise with pandas, and the valid rows are COPYed and
+    merged (see IngestRepository). Every batch commits on its own, so one bad
+    batch doesn't undo the ones before it.
+    """
+
+    def _batched(self, records: Iterable[Any], batch_size: int) -> Iterator[Tuple[pd.DataFrame, List[str]]]:
+        batch: List[Any] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield self._records_frame(batch)
+                batch = []
+        if batch:
+            yield self._records_frame(batch)
+
+    def _json_array(self, source: IO[bytes]) -> Iterator[Any]:
+        """
+        The elements of a top-level JSON array, decoded one at a time so the body
+        is never parsed (or held) as a whole.
+        """
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        buffer = ""
+        position = 0
+
+        def more() -> bool:
+            nonlocal buffer, position
+            chunk = source.read(JSON_READ_CHUNK)
+            buffer = buffer[position:] + text_decoder.decode(chunk, final=not chunk)
+            position = 0
+            return bool(chunk)
+
+        def peek() -> str:
+            # Next non-whitespace character, "" at the end of the body
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in " \t\r\n":
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not more():
+                    return ""
+
+        if peek() != "[":
+            raise ValueError("Expected a JSON array of transactions")
+        position += 1
+        if peek() == "]":
+            position += 1
+        else:
+            element = 0
+            while True:
+                element += 1
+                if peek() == "":
+                    raise ValueError("Invalid JSON: the array is not closed")
+                while True:
+                    try:
+                        record, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError as e:
+                        if len(buffer) - position > MAX_JSON_ELEMENT_CHARS or not more():
+                            raise ValueError(f"Invalid JSON in element {element}: {e.msg}")
+                        continue
+                    # A number cut off by the end of the chunk ("12", "1.", "1e") decodes
+                    # short; read on until something that can't continue it follows
+                    number = isinstance(record, (int, float)) and not isinstance(record, bool)
+                    if number and (end == len(buffer) or buffer[end] in "0123456789.eE+-") and more():
+                        continue
+                    break
+                position = end
+                yield record
+                separator = peek()
+                position += 1
+                if separator == "]":
+                    break
+                if separator != ",":
+                    raise ValueError(f"Invalid JSON after element {element}: expected ',' or ']'")
+        if peek() != "":
+            raise ValueError("Invalid JSON: extra data after the array")
+
+    def _json_batches(self, source: IO[bytes], batch_size: int) -> Iterator[Tuple[pd.DataFrame, List[str]]]:
+        return self._batched(self._json_array(source), batch_size)
+
+    def _ndjson_records(self, source: IO[bytes]) -> Iterator[Any]:
+        for line in source:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+    def _ndjson_batches(self, source: IO[bytes], batch_size: int) -> Iterator[Tuple[pd.DataFrame, List[str]]]:
+        return self._batched(self._ndjson_records(source), batch_size)
+
+    def _csv_batches(self, source: IO[bytes], batch_size: int) -> Iterator[Tuple[pd.DataFrame, List[str]]]:
+        try:
+            for frame in pd.read_csv(source, dtype=str, chunksize=batch_size):
+                yield frame.reset_index(drop=True), [""] * len(frame)
+        except pd.errors.EmptyDataError:
+            return
+        except pd.errors.ParserError as e:
+            raise ValueError(f"Invalid CSV: {e}")
+
+    def _records_frame(self, records: List[Any]) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Frame of the object records, plus a pre-set error for entries that aren't objects.
+        """
+        errors = ["" if isinstance(record, dict) else "not a JSON object" for record in records]
+        return pd.DataFrame.from_records([record if isinstance(record, dict) else {} for record in records]), errors
+
+    def _validate(self, frame: pd.DataFrame, errors: List[str]) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Column-wise checks and conversions for a batch. Returns the converted frame
+        (model columns) and the first error per row ("" for valid rows).
+        """
+        error = pd.Series(errors, index=frame.index, dtype=object)
+
+        def flag(mask: pd.Series, message: str):
+            error[mask & (error == "")] = message
+
+        for field in REQUIRED_TRANSACTION_FIELDS:
+            if field not in frame:
+                frame[field] = None
+        if "sla_breach_flag" not in frame:
+            frame["sla_breach_flag"] = None
+
+        def text_column(name: str) -> pd.Series:
+            values = frame[name].astype("string").str.strip()
+            flag(values.isna() | (values == ""), f"missing {name}")
+            return values
+
+        out = pd.DataFrame(index=frame.index)
+        out["transaction_id"] = text_column("transaction_id")
+
+        client_id = pd.to_numeric(frame["client_id"], errors="coerce")
+        # Out-of-range ids are row errors here; the Int64 cast below can't hold them
+        client_id = client_id.where((client_id % 1 == 0) & client_id.between(*CLIENT_ID_RANGE))
+        flag(client_id.isna(), "invalid client_id")
+        out["client_id"] = client_id.astype("Int64")
+
+        amount = pd.to_numeric(frame["amount"], errors="coerce")
+        flag(amount.isna() | ~np.isfinite(amount.fillna(0)), "invalid amount")
+        out["amount"] = amount
+
+        out["currency"] = text_column("currency")
+        out["status"] = text_column("status")
+
+        # Offsets are converted to UTC; naive timestamps are taken as UTC already
+        transaction_date = pd.to_datetime(frame["transaction_date"], errors="coerce", utc=True, format="ISO8601")
+        flag(transaction_date.isna(), "invalid transaction_date")
+        out["transaction_date"] = transaction_date.dt.tz_convert(None)
+
+        # Optional, defaults to False like the model column
+        sla_breach_flag = frame["sla_breach_flag"].map(self._parse_flag)
+        flag(sla_breach_flag.isna(), "invalid sla_breach_flag")
+        out["sla_breach_flag"] = sla_breach_flag
+
+        return out, error
+
+    def _parse_flag(self, value: Any):
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value)
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return False
+        return BOOLEAN_VALUES.get(str(value).strip().lower())
+
+    def _batch_csv(self, frame: pd.DataFrame) -> io.BytesIO:
+        buffer = io.StringIO()
+        frame.to_csv(
+            buffer, header=False, index=False,
+            columns=ingest_repo.columns("transactions"),
+            date_format="%Y-%m-%d %H:%M:%S.%f"
+        )
+        return io.BytesIO(buffer.getvalue().encode())
+
+    def ingest_transactions(self, db: Session, source: IO[bytes], fmt: str) -> Dict[str, Any]:
+        """
+        Ingest a transaction feed. Returns totals plus per batch: received,
+        inserted, duplicates (id already present or repeated in the feed),
+        rejected (failed validation or unknown client) and sample errors.
+        A feed that turns out to be malformed part way through stops there:
+        the batches already committed are returned, with `error` saying why
+        the rest wasn't read. Raises ValueError if not even the first batch
+        could be read.
+        """
+        readers = {"json": self._json_batches, "ndjson": self._ndjson_batches, "csv": self._csv_batches}
+        max_errors = settings.INGEST_MAX_ERRORS_PER_BATCH
+        batches = []
+        row_offset = 0
+        stopped: Optional[str] = None
+        reader = readers[fmt](source, settings.INGEST_BATCH_SIZE)
+        try:
+            for number in itertools.count(1):
+                try:
+                    frame, errors = next(reader)
+                except StopIteration:
+                    break
+                except ValueError as e:
+                    if not batches:
+                        raise
+                    stopped = f"Stopped after row {row_offset}: {e}"
+                    break
+                batches.append(self._load_batch(db, number, frame, errors, row_offset, max_errors))
+                row_offset += len(frame)
+        finally:
+            if any(batch["inserted"] for batch in batches):
+                response_cache.invalidate(DASHBOARD, RISK_OVERVIEW)
+
+        totals = {key: sum(batch[key] for batch in batches) for key in ("received", "inserted", "duplicates", "rejected")}
+        return {**totals, "batches": batches, "error": stopped}
+
+    def _load_batch(self, db: Session, number: int, frame: pd.DataFrame, errors: List[str], row_offset: int, max_errors: int) -> Dict[str, Any]:
+        frame, error = self._validate(frame, errors)
+        valid = error == ""
+        result = {
+            "batch": number,
+            "received": len(frame),
+            "inserted": 0,
+            "duplicates": 0,
+            "rejected": int((~valid).sum()),
+            "errors": [
+                f"row {row_offset + index + 1}: {message}"
+                for index, message in error[~valid].head(max_errors).items()
+            ],
+        }
+        if not valid.any():
+            return result
+
+        try:
+            loaded = ingest_repo.load_transaction_batch(db, self._batch_csv(frame[valid]))
+            db.commit()
+        except ValueError as e:
+            # Postgres refused the batch as a whole; earlier batches stay committed
+            db.rollback()
+            result["rejected"] = len(frame)
+            result["errors"] = (result["errors"] + [str(e)])[-max_errors:]
+            return result
+        except Exception:
+            db.rollback()
+            raise
+
+        result["inserted"] = loaded["inserted"]
+        result["rejected"] += loaded["unknown_client"]
+        result["duplicates"] = int(valid.sum()) - loaded["inserted"] - loaded["unknown_client"]
+        if loaded["unknown_client"] and len(result["errors"]) < max_errors:
+            result["errors"].append(f"{loaded['unknown_client']} rows reference an unknown client_id")
+        return result
+
+ingest_service = IngestService()
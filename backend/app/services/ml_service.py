@@ -1,55 +1,311 @@
 import os
+import json
+import hashlib
+import threading
+from datetime import datetime
 import joblib
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional, Callable
+from app.core.config import settings
+from app.core.metrics import metrics, errors
+from app.core.ml_paths import MODELS_DIR, MANIFEST_FILE
+from app.services.compiled_models import CompiledLogisticModel, CompiledPreprocessor
+from app.services.prediction_cache import PredictionCache
+
+# Raw features the trained pipelines read (see scripts/train_models.py)
+REQUIRED_FEATURES = ("amount", "risk_rating", "region")
+
+MODEL_FILES = ("sla_model.joblib", "failure_model.joblib", "anomaly_model.joblib")
+
+class ModelBundle:
+    """
+    One loaded generation of the three model artifacts.
+    A bundle is never mutated after construction; reloads build a new one and swap
+    the reference, so requests already holding the old bundle finish on it.
+    """
+
+    def __init__(self, version: str, sla_model, failure_model, anomaly_model, anomaly_preprocessor):
+        self.version = version
+        self.loaded_at = datetime.utcnow()
+        self.sla_model = sla_model
+        self.failure_model = failure_model
+        self.anomaly_model = anomaly_model
+        # We don't need 'preprocessor' separately if we use the pipeline,
+        # but for Anomaly detection, the model itself doesn't include the preprocessor inside an sklearn Pipeline object
+        # as cleanly as classifiers in my training script.
+        # In training script:
+        # processed_data = preprocessor.fit_transform(data)
+        # iso_forest.fit(processed_data)
+        # So we need the preprocessor to transform new data before passing to iso_forest.predict
+        self.anomaly_preprocessor = anomaly_preprocessor
+
+        # NumPy fast paths extracted from the sklearn artifacts (None -> use sklearn)
+        self.sla_compiled = None
+        self.failure_compiled = None
+        self.anomaly_compiled_preprocessor = None
+        if settings.ML_COMPILED_INFERENCE:
+            self._compile_models()
+
+        # True when all three artifacts carry the same fitted ColumnTransformer,
+        # so one transformed matrix can feed every model
+        self.shared_preprocessing = self._preprocessors_match()
+
+    def _compile_models(self):
+        """
+        Extract scaler, one-hot and coefficient arrays from the loaded pipelines.
+        Any model whose structure can't be compiled keeps using the sklearn path.
+        """
+        try:
+            self.sla_compiled = CompiledLogisticModel.from_pipeline(self.sla_model)
+            self.failure_compiled = CompiledLogisticModel.from_pipeline(self.failure_model)
+            self.anomaly_compiled_preprocessor = CompiledPreprocessor.from_column_transformer(self.anomaly_preprocessor)
+            print("Compiled inference enabled.")
+        except (ValueError, AttributeError, KeyError) as e:
+            self.sla_compiled = None
+            self.failure_compiled = None
+            self.anomaly_compiled_preprocessor = None
+            print(f"Compiled inference unavailable, using sklearn pipelines: {e}")
+
+    def _preprocessors_match(self) -> bool:
+        """
+        train_models.py fits one ColumnTransformer for all three models; check the
+        pickled copies still agree before sharing a single transform between them.
+        """
+        try:
+            compiled = [
+                CompiledPreprocessor.from_column_transformer(preprocessor)
+                for preprocessor in (
+                    self.sla_model.named_steps['preprocessor'],
+                    self.failure_model.named_steps['preprocessor'],
+                    self.anomaly_preprocessor,
+                )
+            ]
+        except (ValueError, AttributeError, KeyError):
+            return False
+        return all(c.same_as(compiled[0]) for c in compiled[1:])
+
 
 class MLService:
     def __init__(self):
-        self.models_dir = os.path.join(os.path.dirname(__file__), '../ml_models')
-        self.sla_model = None
-        self.failure_model = None
-        self.anomaly_model = None
-        self.preprocessor = None
-        self._load_models()
-
-    def _load_models(self):
-        try:
-            print("Loading ML models...")
-            self.sla_model = joblib.load(os.path.join(self.models_dir, 'sla_model.joblib'))
-            self.failure_model = joblib.load(os.path.join(self.models_dir, 'failure_model.joblib'))
-            
-            anomaly_data = joblib.load(os.path.join(self.models_dir, 'anomaly_model.joblib'))
-            self.anomaly_model = anomaly_data['model']
-            # We don't need 'preprocessor' separately if we use the pipeline, 
-            # but for Anomaly detection, the model itself doesn't include the preprocessor inside an sklearn Pipeline object 
-            # as cleanly as classifiers in my training script.
-            # In training script: 
-            # processed_data = preprocessor.fit_transform(data) 
-            # iso_forest.fit(processed_data)
-            # So we need the preprocessor to transform new data before passing to iso_forest.predict
-            self.anomaly_preprocessor = anomaly_data['preprocessor']
-
-            print("ML models loaded successfully.")
-        except Exception as e:
-            print(f"Error loading models: {e}")
-            # In production, we might want to fail hard or fallback to a dummy service
+        self.models_dir = MODELS_DIR
+        # Loading happens off the import path: see load() / start_background_load()
+        self._bundle: Optional[ModelBundle] = None
+        # Artifact fingerprint as of the last load, so the watcher only reloads on a change
+        self._loaded_fingerprint: Optional[Tuple] = None
+        self.status = "not_loaded"  # not_loaded -> loading -> ready | failed
+        self.last_error: Optional[str] = None
+        self._load_lock = threading.Lock()
+        self._loader_thread: Optional[threading.Thread] = None
+        self._watcher_thread: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._reload_listeners: List[Callable[[], None]] = []
+        self.cache = (
+            PredictionCache(settings.ML_CACHE_MAX_SIZE, settings.ML_CACHE_TTL_SECONDS)
+            if settings.ML_CACHE_ENABLED else None
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        return self._bundle is not None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        bundle = self._bundle
+        return bundle.version if bundle else None
+
+    def _artifact_dir(self) -> str:
+        manifest = os.path.join(self.models_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest):
+            return self.models_dir
+        with open(manifest) as f:
+            return os.path.join(self.models_dir, json.load(f)["generation"])
+
+    def _artifact_paths(self, artifact_dir: str) -> List[str]:
+        return [os.path.join(artifact_dir, name) for name in MODEL_FILES]
+
+    def _fingerprint(self) -> Tuple:
+        """
+        Cheap change detector for the watcher: the current generation directory and
+        the size + mtime of each artifact in it.
+        """
+        artifact_dir = self._artifact_dir()
+        return (artifact_dir,) + tuple((os.path.getsize(p), os.path.getmtime(p)) for p in self._artifact_paths(artifact_dir))
+
+    def _artifact_version(self, artifact_dir: str) -> str:
+        """
+        Version label derived from the artifacts themselves: the newest file date
+        plus a content hash, so two workers loading the same files report the same version.
+        """
+        digest = hashlib.sha256()
+        newest = 0.0
+        for path in self._artifact_paths(artifact_dir):
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            newest = max(newest, os.path.getmtime(path))
+        return f"{datetime.utcfromtimestamp(newest):%Y%m%d}-{digest.hexdigest()[:10]}"
+
+    def _build_bundle(self, artifact_dir: str, version: str) -> ModelBundle:
+        sla_model = joblib.load(os.path.join(artifact_dir, 'sla_model.joblib'))
+        failure_model = joblib.load(os.path.join(artifact_dir, 'failure_model.joblib'))
+        anomaly_data = joblib.load(os.path.join(artifact_dir, 'anomaly_model.joblib'))
+        return ModelBundle(version, sla_model, failure_model, anomaly_data['model'], anomaly_data['preprocessor'])
+
+    def load(self, force: bool = False) -> bool:
+        """
+        Load (or reload) the artifacts and atomically swap them in.
+        Requests already running keep the bundle they started with. A failed reload
+        leaves the current models in place. Returns True if a new bundle was installed.
+        """
+        with self._load_lock:
+            current = self._bundle
+            try:
+                # Taken before reading, so a change made meanwhile still differs from it
+                fingerprint = self._fingerprint()
+                artifact_dir = fingerprint[0]
+                version = self._artifact_version(artifact_dir)
+                if current and not force and version == current.version:
+                    self._loaded_fingerprint = fingerprint
+                    return False
+                if not current:
+                    self.status = "loading"
+                print("Loading ML models...")
+                bundle = self._build_bundle(artifact_dir, version)
+            except Exception as e:
+                print(f"Error loading models: {e}")
+                errors.inc(source="ml_model_load")
+                self.last_error = str(e)
+                if not current:
+                    self.status = "failed"
+                return False
+
+            self._bundle = bundle
+            self._loaded_fingerprint = fingerprint
+            self.status = "ready"
+            if self.cache:
+                # Keys also carry the version; clearing just frees the stale entries now
+                self.cache.clear()
+            self.last_error = None
+            print(f"ML models loaded successfully (version {bundle.version}).")
+
+        if current:
+            for listener in self._reload_listeners:
+                listener()
+        return True
+
+    def add_reload_listener(self, listener: Callable[[], None]):
+        """
+        Register a callback run after a new bundle replaces a loaded one.
+        """
+        self._reload_listeners.append(listener)
+
+    def start_background_load(self):
+        """
+        Load the models on a daemon thread so application startup doesn't block on joblib.
+        """
+        if self._bundle or (self._loader_thread and self._loader_thread.is_alive()):
+            return
+        self.status = "loading"
+        self._loader_thread = threading.Thread(target=self.load, name="ml-model-loader", daemon=True)
+        self._loader_thread.start()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        if self._loader_thread:
+            self._loader_thread.join(timeout)
+        return self.is_ready
+
+    def start_watcher(self, interval_seconds: float):
+        """
+        Poll the artifact files and hot-reload when they change.
+        A change must be seen on two consecutive polls before reloading, so a file
+        that is still being written isn't picked up half-way; unchanged polls only
+        stat the files.
+        """
+        if self._watcher_thread and self._watcher_thread.is_alive():
+            return
+        self._stop_watching.clear()
+
+        def watch():
+            last_seen = None
+            while not self._stop_watching.wait(interval_seconds):
+                try:
+                    fingerprint = self._fingerprint()
+                except OSError:
+                    continue
+                if fingerprint == last_seen and fingerprint != self._loaded_fingerprint and self._bundle:
+                    self.load()
+                last_seen = fingerprint
+
+        self._watcher_thread = threading.Thread(target=watch, name="ml-model-watcher", daemon=True)
+        self._watcher_thread.start()
+
+    def stop_watcher(self):
+        self._stop_watching.set()
+
+    def status_info(self) -> Dict[str, Any]:
+        bundle = self._bundle
+        return {
+            "status": self.status,
+            "model_version": bundle.version if bundle else None,
+            "loaded_at": bundle.loaded_at if bundle else None,
+            "compiled_inference": bool(bundle and bundle.sla_compiled),
+            "shared_preprocessing": bool(bundle and bundle.shared_preprocessing),
+            "last_error": self.last_error,
+            "cache": self.cache.stats() if self.cache else None,
+        }
+
+    def _unavailable(self) -> Dict[str, Any]:
+        if self.status in ("loading", "not_loaded"):
+            return {"error": "Models are still loading"}
+        return {"error": "Model not loaded"}
+
+    def _normalize_features(self, features: Dict[str, Any]) -> Tuple[Tuple, Dict[str, Any]]:
+        """
+        Cache key and the features actually scored. Only the inputs the models read
+        are part of the key; amount is rounded to ML_CACHE_AMOUNT_BUCKET and the
+        rounded value is what gets scored, so a cached result is exact for its key.
+        """
+        amount = float(features["amount"])
+        bucket = settings.ML_CACHE_AMOUNT_BUCKET
+        if bucket > 0:
+            amount = round(amount / bucket) * bucket
+        normalized = {**features, "amount": amount}
+        return tuple(normalized[name] for name in REQUIRED_FEATURES), normalized
+
+    def _cached(self, kind: str, features: Dict[str, Any], predict) -> Dict[str, Any]:
+        bundle = self._bundle
+        if not bundle:
+            return self._unavailable()
+        if not self.cache:
+            return predict(bundle, features)
+
+        feature_key, normalized = self._normalize_features(features)
+        key = (kind, bundle.version) + feature_key
+        result = self.cache.get(key)
+        if result is None:
+            result = predict(bundle, normalized)
+            self.cache.set(key, result)
+        return result
 
     def predict_sla_breach(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """
         Predict probability of SLA breach.
         Features must include: amount, risk_rating, region
         """
-        if not self.sla_model:
-            return {"error": "Model not loaded"}
-        
-        df = pd.DataFrame([features])
-        prob = self.sla_model.predict_proba(df)[0][1] # Probability of class 1 (Breach)
+        return self._cached("sla", features, self._predict_sla_breach)
+
+    def _predict_sla_breach(self, bundle: ModelBundle, features: Dict[str, Any]) -> Dict[str, Any]:
+        if bundle.sla_compiled:
+            prob = bundle.sla_compiled.predict_proba_one(features)
+        else:
+            df = pd.DataFrame([features])
+            prob = bundle.sla_model.predict_proba(df)[0][1] # Probability of class 1 (Breach)
         prediction = int(prob > 0.5)
-        
+
         return {
             "prediction": prediction,
             "probability": float(prob),
-            "model_version": "v1"
+            "model_version": bundle.version
         }
 
     def predict_failure(self, features: Dict[str, Any]) -> Dict[str, Any]:
@@ -57,17 +313,20 @@ class MLService:
         Predict probability of transaction failure.
         Features must include: amount, risk_rating, region
         """
-        if not self.failure_model:
-            return {"error": "Model not loaded"}
-        
-        df = pd.DataFrame([features])
-        prob = self.failure_model.predict_proba(df)[0][1] # Probability of class 1 (Failure)
+        return self._cached("failure", features, self._predict_failure)
+
+    def _predict_failure(self, bundle: ModelBundle, features: Dict[str, Any]) -> Dict[str, Any]:
+        if bundle.failure_compiled:
+            prob = bundle.failure_compiled.predict_proba_one(features)
+        else:
+            df = pd.DataFrame([features])
+            prob = bundle.failure_model.predict_proba(df)[0][1] # Probability of class 1 (Failure)
         prediction = int(prob > 0.5)
-        
+
         return {
             "prediction": prediction,
             "probability": float(prob),
-            "model_version": "v1"
+            "model_version": bundle.version
         }
 
     def detect_anomaly(self, features: Dict[str, Any]) -> Dict[str, Any]:
@@ -75,27 +334,200 @@ class MLService:
         Detect if transaction is anomalous.
         Features must include: amount, risk_rating, region
         """
-        if not self.anomaly_model:
-            return {"error": "Model not loaded"}
-        
-        df = pd.DataFrame([features])
-        
+        return self._cached("anomaly", features, self._detect_anomaly)
+
+    def _detect_anomaly(self, bundle: ModelBundle, features: Dict[str, Any]) -> Dict[str, Any]:
         # Transform features using the saved preprocessor
-        X_processed = self.anomaly_preprocessor.transform(df)
-        
-        # Isolation Forest: -1 for anomalies, 1 for normal
-        prediction = self.anomaly_model.predict(X_processed)[0]
-        
-        # Convert to 1 (Anomaly) vs 0 (Normal)
-        is_anomaly = 1 if prediction == -1 else 0
-        
-        # Score_samples gives negative score, lower is more anomalous
-        score = self.anomaly_model.score_samples(X_processed)[0]
-        
+        X_processed = self._transform_anomaly_features(bundle, [features])
+
+        is_anomaly, score = self._anomaly_scores(bundle, X_processed)
+
         return {
-            "is_anomaly": is_anomaly,
-            "anomaly_score": float(score),
-            "model_version": "v1"
+            "is_anomaly": int(is_anomaly[0]),
+            "anomaly_score": float(score[0]),
+            "model_version": bundle.version
         }
 
+    def score(self, features: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the SLA, failure and anomaly models on one transaction.
+        Features must include: amount, risk_rating, region
+        """
+        return self._cached("score", features, lambda bundle, f: self._fused_score(bundle, [f])[0])
+
+    def _transform_anomaly_features(self, bundle: ModelBundle, rows: List[Dict[str, Any]]):
+        if bundle.anomaly_compiled_preprocessor:
+            return bundle.anomaly_compiled_preprocessor.transform(rows)
+        return bundle.anomaly_preprocessor.transform(pd.DataFrame(rows))
+
+    def _anomaly_scores(self, bundle: ModelBundle, X_processed):
+        """
+        Anomaly labels (1 = anomaly) and scores from a single forest traversal.
+        IsolationForest.predict flags rows whose score_samples falls below offset_,
+        so deriving the label here avoids walking the trees a second time.
+        """
+        # Score_samples gives negative score, lower is more anomalous
+        scores = bundle.anomaly_model.score_samples(X_processed)
+        is_anomaly = (scores - bundle.anomaly_model.offset_ < 0).astype(int)
+        return is_anomaly, scores
+
+    def _pipeline_proba(self, model, compiled, rows: List[Dict[str, Any]]):
+        if compiled:
+            return compiled.predict_proba(rows)
+        return model.predict_proba(pd.DataFrame(rows))[:, 1]
+
+    def _head_proba(self, model, compiled, X_processed):
+        """
+        Class 1 probability from an already transformed feature matrix.
+        """
+        if compiled:
+            return compiled.predict_proba_from_matrix(X_processed)
+        return model.named_steps['classifier'].predict_proba(X_processed)[:, 1]
+
+    def _fused_score(self, bundle: ModelBundle, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        X_processed = self._transform_anomaly_features(bundle, rows)
+        if bundle.shared_preprocessing:
+            sla_probs = self._head_proba(bundle.sla_model, bundle.sla_compiled, X_processed)
+            failure_probs = self._head_proba(bundle.failure_model, bundle.failure_compiled, X_processed)
+        else:
+            sla_probs = self._pipeline_proba(bundle.sla_model, bundle.sla_compiled, rows)
+            failure_probs = self._pipeline_proba(bundle.failure_model, bundle.failure_compiled, rows)
+        is_anomaly, scores = self._anomaly_scores(bundle, X_processed)
+
+        return [
+            {
+                "sla_prediction": int(sla_prob > 0.5),
+                "sla_probability": float(sla_prob),
+                "failure_prediction": int(failure_prob > 0.5),
+                "failure_probability": float(failure_prob),
+                "is_anomaly": int(anomaly),
+                "anomaly_score": float(score),
+                "model_version": bundle.version
+            }
+            for sla_prob, failure_prob, anomaly, score in zip(sla_probs, failure_probs, is_anomaly, scores)
+        ]
+
+    def _validate_batch(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int], Dict[int, str]]:
+        """
+        Validate a batch of feature records.
+        Returns the usable rows, their input positions and an error message per rejected position.
+        """
+        rows = []
+        positions = []
+        item_errors = {}
+        for i, record in enumerate(records):
+            missing = [name for name in REQUIRED_FEATURES if record.get(name) is None]
+            if missing:
+                item_errors[i] = f"Missing features: {', '.join(missing)}"
+                continue
+            try:
+                amount = float(record["amount"])
+            except (TypeError, ValueError):
+                item_errors[i] = "Invalid amount"
+                continue
+            rows.append({**record, "amount": amount})
+            positions.append(i)
+        return rows, positions, item_errors
+
+    def _score_batch(self, records: List[Dict[str, Any]], score_fn) -> List[Dict[str, Any]]:
+        """
+        Run score_fn once over every valid record and return results in input order.
+        If the vectorized call fails, rows are re-scored one by one so a single bad
+        record only fails its own slot.
+        """
+        rows, positions, item_errors = self._validate_batch(records)
+        results = [{"error": item_errors[i]} if i in item_errors else None for i in range(len(records))]
+        if not positions:
+            return results
+
+        try:
+            scored = score_fn(rows)
+        except Exception:
+            scored = []
+            for row in rows:
+                try:
+                    scored.append(score_fn([row])[0])
+                except Exception as e:
+                    scored.append({"error": f"Scoring failed: {e}"})
+
+        for position, result in zip(positions, scored):
+            results[position] = result
+        return results
+
+    def _classifier_batch(self, bundle: ModelBundle, model, compiled, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        def score(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            probs = self._pipeline_proba(model, compiled, rows)
+            return [
+                {"prediction": int(prob > 0.5), "probability": float(prob), "model_version": bundle.version}
+                for prob in probs
+            ]
+        return self._score_batch(records, score)
+
+    def predict_sla_breach_batch(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Predict SLA breach probability for many transactions with one predict_proba call.
+        Results are returned in input order; invalid records carry an "error" entry.
+        """
+        bundle = self._bundle
+        if not bundle:
+            return self._unavailable()
+        return {"results": self._classifier_batch(bundle, bundle.sla_model, bundle.sla_compiled, records)}
+
+    def predict_failure_batch(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Predict failure probability for many transactions with one predict_proba call.
+        Results are returned in input order; invalid records carry an "error" entry.
+        """
+        bundle = self._bundle
+        if not bundle:
+            return self._unavailable()
+        return {"results": self._classifier_batch(bundle, bundle.failure_model, bundle.failure_compiled, records)}
+
+    def detect_anomaly_batch(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run anomaly detection for many transactions with one transform and one forest pass per call.
+        Results are returned in input order; invalid records carry an "error" entry.
+        """
+        bundle = self._bundle
+        if not bundle:
+            return self._unavailable()
+
+        def score(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            is_anomaly, scores = self._anomaly_scores(bundle, self._transform_anomaly_features(bundle, rows))
+            return [
+                {"is_anomaly": int(anomaly), "anomaly_score": float(score), "model_version": bundle.version}
+                for anomaly, score in zip(is_anomaly, scores)
+            ]
+        return {"results": self._score_batch(records, score)}
+
+    def score_batch(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run all three models over many transactions with one shared preprocessing pass.
+        Results are returned in input order; invalid records carry an "error" entry.
+        """
+        bundle = self._bundle
+        if not bundle:
+            return self._unavailable()
+        return {"results": self._score_batch(records, lambda rows: self._fused_score(bundle, rows))}
+
 ml_service = MLService()
+
+def _prediction_cache_samples(field: str):
+    if not ml_service.cache:
+        return []
+    stats = ml_service.cache.stats()
+    return [((), stats[field])]
+
+# Only populated when inference runs in this process (ML_INFERENCE_WORKERS=0)
+metrics.counter(
+    "finsight_prediction_cache_hits_total", "Prediction cache hits.",
+    collect=lambda: _prediction_cache_samples("hits")
+)
+metrics.counter(
+    "finsight_prediction_cache_misses_total", "Prediction cache misses.",
+    collect=lambda: _prediction_cache_samples("misses")
+)
+metrics.gauge(
+    "finsight_prediction_cache_hit_ratio", "Prediction cache hit ratio since startup.",
+    collect=lambda: _prediction_cache_samples("hit_ratio")
+)
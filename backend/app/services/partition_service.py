@@ -0,0 +1,52 @@
+import threading
+from typing import Optional
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import errors
+from app.repositories.partition_repo import partition_repo
+
+class PartitionMaintenance:
+    """
+    Keeps transactions partitions created ahead of the data: on startup and then
+    every PARTITION_MAINTENANCE_INTERVAL_SECONDS, on a daemon thread.
+    Rows that landed in the default partition (months without a partition yet)
+    are moved into new partitions, so date filters keep pruning.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        db = SessionLocal()
+        try:
+            created = partition_repo.ensure_partitions(db, settings.TRANSACTION_PARTITION_MONTHS_AHEAD)
+            db.commit()
+            if created:
+                print(f"Created {created} transaction partitions.")
+            return created
+        except Exception as e:
+            db.rollback()
+            print(f"Partition maintenance failed: {e}")
+            errors.inc(source="partitions")
+            return 0
+        finally:
+            db.close()
+
+    def start(self, interval_seconds: float):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def maintain():
+            self.run_once()
+            while not self._stop.wait(interval_seconds):
+                self.run_once()
+
+        self._thread = threading.Thread(target=maintain, name="partition-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+partition_maintenance = PartitionMaintenance()
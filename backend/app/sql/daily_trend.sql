@@ -0,0 +1,8 @@
+-- Daily volume and count from the rollup, one row per day
+SELECT
+    TO_CHAR(day, 'YYYY-MM-DD') as day,
+    volume,
+    txn_count as count
+FROM transaction_daily_stats
+WHERE day >= :start_date
+ORDER BY day ASC;
@@ -0,0 +1,13 @@
+-- Recent High Risk Transactions
+SELECT
+    t.transaction_id,
+    c.name as client_name,
+    t.amount,
+    c.region,
+    t.transaction_date,
+    t.status
+FROM transactions t
+JOIN clients c ON t.client_id = c.client_id
+WHERE t.amount > 50000 OR t.status = 'Failed'
+ORDER BY t.transaction_date DESC
+LIMIT 10;
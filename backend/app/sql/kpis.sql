@@ -3,7 +3,7 @@ WITH TransactionStats AS (
     SELECT 
         COUNT(*) AS total_txns,
         SUM(amount) AS total_vol,
-        SUM(CASE WHEN sla_breach_flag = true THEN 1 ELSE 0 END) AS breach_count
+        COUNT(*) FILTER (WHERE sla_breach_flag) AS breach_count
     FROM transactions
 ),
 RiskStats AS (
@@ -16,5 +16,6 @@ SELECT
     ts.total_vol AS total_volume,
     ts.total_txns AS total_transactions,
     rs.high_risk_clients AS high_risk_count,
+    ts.breach_count AS breach_count,
     (CAST(ts.breach_count AS FLOAT) / NULLIF(ts.total_txns, 0)) * 100 AS sla_breach_rate
 FROM TransactionStats ts, RiskStats rs;
@@ -0,0 +1,2 @@
+-- Latest day present in the transaction_daily_stats rollup
+SELECT MAX(day) FROM transaction_daily_stats;
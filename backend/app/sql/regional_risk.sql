@@ -0,0 +1,5 @@
+-- Risk by Region (Heatmap data), from the client_exposure rollup (one row per client with transactions)
+SELECT c.region, SUM(e.total_exposure) as total_exposure, COUNT(*) as client_count
+FROM client_exposure e
+JOIN clients c ON e.client_id = c.client_id
+GROUP BY c.region;
@@ -0,0 +1,4 @@
+-- Risk Rating Distribution
+SELECT risk_rating, COUNT(*) as count
+FROM clients
+GROUP BY risk_rating;
@@ -0,0 +1,16 @@
+-- Medium/High risk clients with the largest total exposure, from the client_exposure rollup.
+-- Walks idx_client_exposure_total from the top, so it stops after 50 matches instead of
+-- aggregating every transaction; ranks are as of the last periodic recompute.
+SELECT
+    c.client_id,
+    c.name,
+    c.region,
+    c.risk_rating,
+    e.total_exposure,
+    e.region_rank,
+    e.exposure_quartile
+FROM client_exposure e
+JOIN clients c ON c.client_id = e.client_id
+WHERE c.risk_rating IN ('High', 'Medium')
+ORDER BY e.total_exposure DESC
+LIMIT 50;
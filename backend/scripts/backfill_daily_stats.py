@@ -0,0 +1,31 @@
+import sys
+import os
+import time
+import argparse
+from datetime import date
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import SessionLocal
+from app.repositories.daily_stats_repo import daily_stats_repo
+
+def backfill_daily_stats(start_day: date = None, end_day: date = None):
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = daily_stats_repo.backfill(db, start_day, end_day)
+        elapsed = time.perf_counter() - started
+        scope = f"{start_day or 'beginning'} .. {end_day or 'latest'}"
+        print(f"Rebuilt {written} day rows ({scope}) in {elapsed:.2f}s")
+    except Exception as e:
+        print(f"Backfill Failed: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild transaction_daily_stats from the transactions table.")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    backfill_daily_stats(args.start, args.end)
@@ -0,0 +1,68 @@
+import sys
+import os
+import time
+import argparse
+import statistics
+import tracemalloc
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import SessionLocal
+from app.core.sql_registry import sql_registry
+from app.repositories.analytics_repo import AnalyticsRepository
+from app.services.analytics_snapshot import AnalyticsSnapshot
+
+def timed(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return result, statistics.median(samples), samples[max(int(len(samples) * 0.95) - 1, 0)]
+
+def rounded(rows):
+    # Float sums differ in the last digits with summation order
+    return sorted(tuple(round(value, 2) if isinstance(value, float) else value for value in row.values()) for row in rows)
+
+def sql_rows(db, name: str):
+    return sql_registry.execute(db, name).fetchall()
+
+def benchmark(runs: int):
+    db = SessionLocal()
+    repo = AnalyticsRepository()
+    snapshot = AnalyticsSnapshot()
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        snapshot.refresh(db)
+        load_s = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = snapshot.stats()
+        print(f"Loaded {stats['transactions']} transactions over {stats['days']} days and {stats['clients']} clients "
+              f"in {load_s:.2f}s ({current / 2**20:.0f} MiB held, {peak / 2**20:.0f} MiB peak)")
+        _, refresh_p50, _ = timed(lambda: snapshot.refresh(db), 5)
+        print(f"Refresh with nothing new: {refresh_p50:.1f}ms\n")
+
+        # The SQL side is what the repository runs without the snapshot
+        cases = [
+            ("transaction trends", lambda: repo._trend_rows(snapshot.transaction_trends(30)), lambda: repo.get_transaction_trends(db)),
+            ("regional risk", lambda: repo._regional_risk_rows(snapshot.regional_risk()), lambda: repo._regional_risk_rows(sql_rows(db, "regional_risk"))),
+            ("rating distribution", lambda: repo._rating_rows(snapshot.rating_distribution()), lambda: repo._rating_rows(sql_rows(db, "risk_rating_distribution"))),
+        ]
+        print(f"{'read':<22} {'snapshot p50':>13} {'snapshot p95':>13} {'sql p50':>10} {'sql p95':>10}  same result")
+        for label, from_snapshot, from_sql in cases:
+            fast, fast_p50, fast_p95 = timed(from_snapshot, runs)
+            slow, slow_p50, slow_p95 = timed(from_sql, runs)
+            db.rollback()
+            print(f"{label:<22} {fast_p50:>11.3f}ms {fast_p95:>11.3f}ms {slow_p50:>8.2f}ms {slow_p95:>8.2f}ms  {rounded(fast) == rounded(slow)}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the analytics snapshot, check it against SQL and time both.")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    benchmark(args.runs)
@@ -0,0 +1,104 @@
+import sys
+import os
+import time
+import argparse
+import statistics
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+from app.core.database import SessionLocal
+from app.repositories.client_repo import ClientRepository
+
+TIER_NAMES = ["name prefix", "region prefix", "ranked substring", "substring by id"]
+
+# Synthetic clients get ids from here up so --cleanup can remove exactly them
+BENCH_ID_START = 10_000_000
+
+# First keystrokes (common, rare, region), name and region prefixes, mid-name
+# substrings (broad and narrow) and terms that match nothing
+TERMS = ["cl", "x", "zq", "ap", "client 1", "tech", "apac", "mea", "ent 1", "client 1000424", "retail)", "9999", "zzz"]
+
+# What /clients?search= ran before the trigram indexes: a leading-wildcard ILIKE.
+# Timed with index scans disabled, which is the plan it got without them.
+LEGACY_QUERY = text("""
+    SELECT * FROM clients
+    WHERE name ILIKE :pattern OR region ILIKE :pattern
+    LIMIT 50
+""")
+
+def seed(db, total: int):
+    existing = db.execute(text("SELECT COUNT(*) FROM clients")).scalar()
+    missing = total - existing
+    if missing <= 0:
+        print(f"clients already has {existing} rows")
+        return
+    print(f"Inserting {missing} synthetic clients...")
+    started = time.perf_counter()
+    # Low/Medium only, so the high-risk KPI counter is unaffected
+    db.execute(text("""
+        INSERT INTO clients (client_id, name, region, risk_rating, joined_date)
+        SELECT
+            g,
+            'Client ' || g || ' (' || (ARRAY['Tech', 'Retail', 'Energy', 'Finance', 'Healthcare'])[1 + g % 5] || ')',
+            (ARRAY['APAC', 'EMEA', 'LATAM'])[1 + g % 3],
+            (ARRAY['Low', 'Medium'])[1 + g % 2],
+            NOW()
+        FROM generate_series(:start, :stop) g
+    """), {"start": BENCH_ID_START, "stop": BENCH_ID_START + missing - 1})
+    db.commit()
+    db.execute(text("ANALYZE clients"))
+    db.commit()
+    print(f"Inserted in {time.perf_counter() - started:.1f}s")
+
+def cleanup(db):
+    deleted = db.execute(text("DELETE FROM clients WHERE client_id >= :start"), {"start": BENCH_ID_START}).rowcount
+    db.commit()
+    print(f"Removed {deleted} synthetic clients")
+
+def timed(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return result, statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+def benchmark(runs: int):
+    db = SessionLocal()
+    repo = ClientRepository()
+    try:
+        total = db.execute(text("SELECT COUNT(*) FROM clients")).scalar()
+        print(f"clients: {total} rows, {runs} runs per term\n")
+        print(f"{'term':<18} {'new p50':>10} {'new p95':>10} {'legacy p50':>11} {'legacy p95':>11} {'hits':>5}  tiers read")
+        for term in TERMS:
+            (rows, _), new_p50, new_p95 = timed(lambda: repo.get_clients_page(db, limit=50, search=term), runs)
+            db.execute(text("SET enable_bitmapscan = off"))
+            db.execute(text("SET enable_indexscan = off"))
+            _, old_p50, old_p95 = timed(lambda: db.execute(LEGACY_QUERY, {"pattern": f"%{term}%"}).fetchall(), runs)
+            db.execute(text("RESET enable_bitmapscan"))
+            db.execute(text("RESET enable_indexscan"))
+
+            tiers = sorted({row.tier for row in repo._search(db, term, 51)})
+            print(f"{term!r:<18} {new_p50:>8.2f}ms {new_p95:>8.2f}ms {old_p50:>9.2f}ms {old_p95:>9.2f}ms {len(rows):>5}  {', '.join(TIER_NAMES[tier] for tier in tiers) or '-'}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time /clients search against a large clients table.")
+    parser.add_argument("--clients", type=int, default=1_000_000, help="Top the table up to this many rows with synthetic clients")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--cleanup", action="store_true", help="Remove the synthetic clients and exit")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            sys.exit(0)
+        seed(db, args.clients)
+    finally:
+        db.close()
+    benchmark(args.runs)
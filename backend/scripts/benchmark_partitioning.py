@@ -0,0 +1,254 @@
+import sys
+import os
+import time
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+from app.core.database import SessionLocal, engine
+
+# The same synthetic data is loaded twice: into a plain table (the layout before the
+# partitioning migration) and into a table partitioned by month (the layout after it).
+# Each layout lives in its own schema, so the benchmarked queries run unchanged
+# against either one through search_path.
+LAYOUTS = {
+    "plain": "bench_plain",
+    "partitioned": "bench_partitioned",
+}
+
+# Rows are generated in chunks of this size so progress is visible and no single
+# statement has to hold the whole load
+LOAD_CHUNK = 5_000_000
+
+CLIENTS_DDL = """
+    CREATE TABLE {schema}.clients (
+        client_id INTEGER PRIMARY KEY,
+        name VARCHAR,
+        region VARCHAR,
+        risk_rating VARCHAR,
+        joined_date TIMESTAMP WITHOUT TIME ZONE
+    )
+"""
+
+TRANSACTIONS_DDL = """
+    CREATE TABLE {schema}.transactions (
+        transaction_id VARCHAR NOT NULL,
+        client_id INTEGER,
+        amount DOUBLE PRECISION,
+        currency VARCHAR,
+        status VARCHAR,
+        transaction_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        sla_breach_flag BOOLEAN,
+        PRIMARY KEY ({key})
+    ) {partitioning}
+"""
+
+# The indexes the benchmarked queries can use, named as in the app schema
+BENCH_INDEXES = [
+    ("idx_transaction_client_date", ["client_id", "transaction_date"]),
+    ("idx_transaction_timestamp", ["transaction_date"]),
+    ("ix_transactions_client_id", ["client_id"]),
+]
+
+# Synthetic transactions spread evenly over the `months` months up to now
+GENERATE_TRANSACTIONS_QUERY = """
+    INSERT INTO bench_plain.transactions (transaction_id, client_id, amount, currency, status, transaction_date, sla_breach_flag)
+    SELECT
+        'BT' || g,
+        1 + CAST(g AS BIGINT) * 7919 % :clients,
+        round((random() * 10000)::numeric, 2),
+        (ARRAY['USD', 'EUR', 'GBP', 'JPY'])[1 + g % 4],
+        (ARRAY['Completed', 'Completed', 'Completed', 'Pending', 'Failed'])[1 + g % 5],
+        CAST(:start AS TIMESTAMP) + (CAST(g AS BIGINT) * :span / :rows) * interval '1 second',
+        random() < 0.05
+    FROM generate_series(:first, :last) g
+"""
+
+GENERATE_CLIENTS_QUERY = """
+    INSERT INTO {schema}.clients (client_id, name, region, risk_rating, joined_date)
+    SELECT
+        g,
+        'Client ' || g,
+        (ARRAY['APAC', 'EMEA', 'LATAM', 'NA'])[1 + g % 4],
+        (ARRAY['Low', 'Low', 'Medium', 'High'])[1 + g % 4],
+        CAST(:start AS TIMESTAMP)
+    FROM generate_series(1, :clients) g
+"""
+
+# Rolling 7-day trend over [:start_ts, :end_ts), the pre-rollup dashboard trend read.
+# Bare range predicates on transaction_date (no function around the column) so the
+# planner prunes to the monthly partitions the window touches.
+TRANSACTION_TREND_QUERY = """
+    WITH DailyStats AS (
+        SELECT
+            CAST(transaction_date AS DATE) as day,
+            SUM(amount) as daily_vol,
+            COUNT(*) as daily_count
+        FROM transactions
+        WHERE transaction_date >= :start_ts
+          AND transaction_date < :end_ts
+        GROUP BY CAST(transaction_date AS DATE)
+    ),
+    RollingStats AS (
+        SELECT
+            day,
+            daily_vol,
+            daily_count,
+            AVG(daily_vol) OVER (
+                ORDER BY day
+                ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
+            ) as rolling_7d_avg
+        FROM DailyStats
+    )
+    SELECT day, daily_vol as volume, daily_count as count, rolling_7d_avg
+    FROM RollingStats
+    ORDER BY day DESC
+"""
+
+# Medium/High risk clients with the largest total exposure, aggregated over every
+# transaction (the read client_exposure replaced; a full scan on either layout)
+TOP_RISK_EXPOSURE_QUERY = """
+    SELECT c.client_id, c.name, c.region, c.risk_rating, SUM(t.amount) as total_exposure
+    FROM clients c
+    JOIN transactions t ON c.client_id = t.client_id
+    WHERE c.risk_rating IN ('High', 'Medium')
+    GROUP BY c.client_id, c.name, c.region, c.risk_rating
+    ORDER BY total_exposure DESC
+    LIMIT 50
+"""
+
+def month_starts(first: datetime, last: datetime):
+    month = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while month <= last:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+def table_rows(db, schema: str) -> int:
+    if db.execute(text("SELECT to_regclass(:name)"), {"name": f"{schema}.transactions"}).scalar() is None:
+        return -1
+    return db.execute(text(f"SELECT COUNT(*) FROM {schema}.transactions")).scalar()
+
+def cleanup(db):
+    for schema in LAYOUTS.values():
+        db.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    db.commit()
+    print(f"Dropped schemas {', '.join(LAYOUTS.values())}")
+
+def build(db, rows: int, clients: int, months: int):
+    end = datetime.utcnow().replace(microsecond=0)
+    start = end - timedelta(days=30 * months)
+    span = int((end - start).total_seconds())
+    cleanup(db)
+
+    for layout, schema in LAYOUTS.items():
+        db.execute(text(f"CREATE SCHEMA {schema}"))
+        db.execute(text(CLIENTS_DDL.format(schema=schema)))
+        db.execute(text(GENERATE_CLIENTS_QUERY.format(schema=schema)), {"clients": clients, "start": start})
+        if layout == "plain":
+            db.execute(text(TRANSACTIONS_DDL.format(schema=schema, key="transaction_id", partitioning="")))
+        else:
+            db.execute(text(TRANSACTIONS_DDL.format(
+                schema=schema,
+                key="transaction_id, transaction_date",
+                partitioning="PARTITION BY RANGE (transaction_date)"
+            )))
+            for month in month_starts(start, end):
+                following = (month + timedelta(days=32)).replace(day=1)
+                db.execute(text(
+                    f"CREATE TABLE {schema}.transactions_{month:%Y_%m} PARTITION OF {schema}.transactions "
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{following:%Y-%m-%d}')"
+                ))
+    db.commit()
+
+    print(f"Generating {rows} transactions over {months} months for {clients} clients...")
+    started = time.perf_counter()
+    for first in range(1, rows + 1, LOAD_CHUNK):
+        last = min(first + LOAD_CHUNK - 1, rows)
+        db.execute(text(GENERATE_TRANSACTIONS_QUERY), {
+            "clients": clients, "start": start, "span": span, "rows": rows, "first": first, "last": last
+        })
+        db.commit()
+        print(f"  {last} rows ({time.perf_counter() - started:.0f}s)")
+    db.execute(text("INSERT INTO bench_partitioned.transactions SELECT * FROM bench_plain.transactions"))
+    db.commit()
+
+    for schema in LAYOUTS.values():
+        for name, columns in BENCH_INDEXES:
+            db.execute(text(f"CREATE INDEX {name} ON {schema}.transactions ({', '.join(columns)})"))
+        db.commit()
+    # VACUUM can't run inside a transaction; it also sets the visibility map for index-only scans
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for schema in LAYOUTS.values():
+            conn.execute(text(f"VACUUM ANALYZE {schema}.clients"))
+            conn.execute(text(f"VACUUM ANALYZE {schema}.transactions"))
+    print(f"Built both layouts in {time.perf_counter() - started:.0f}s\n")
+
+def timed(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[max(int(len(samples) * 0.95) - 1, 0)]
+
+def scanned_tables(plan) -> set:
+    """
+    Tables read by a JSON plan (partitions count separately; pruned ones don't appear).
+    """
+    tables = set()
+    if "Relation Name" in plan:
+        tables.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables |= scanned_tables(child)
+    return tables
+
+def benchmark(runs: int, window_days: int):
+    db = SessionLocal()
+    try:
+        end = db.execute(text("SELECT MAX(transaction_date) FROM bench_plain.transactions")).scalar()
+        cases = [
+            (f"trend (last {window_days}d)", TRANSACTION_TREND_QUERY, {"start_ts": end - timedelta(days=window_days), "end_ts": end + timedelta(seconds=1)}),
+            ("top risk exposure", TOP_RISK_EXPOSURE_QUERY, {}),
+        ]
+        print(f"{runs} runs per query\n")
+        print(f"{'query':<22} {'layout':<12} {'p50':>10} {'p95':>10} {'tables scanned':>15}")
+        for label, sql, params in cases:
+            query = text(sql)
+            for layout, schema in LAYOUTS.items():
+                db.execute(text(f"SET search_path TO {schema}, public"))
+                # Warm the cache so every layout is timed from the same state
+                db.execute(query, params).fetchall()
+                p50, p95 = timed(lambda: db.execute(query, params).fetchall(), runs)
+                plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+                scanned = scanned_tables(plan[0]["Plan"]) - {"clients"}
+                print(f"{label:<22} {layout:<12} {p50:>8.1f}ms {p95:>8.1f}ms {len(scanned):>15}")
+        db.execute(text("RESET search_path"))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare trend and exposure latency on a plain vs a monthly-partitioned transactions table.")
+    parser.add_argument("--rows", type=int, default=50_000_000, help="Synthetic transactions loaded into each layout")
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--months", type=int, default=24, help="Months of history the transactions are spread over")
+    parser.add_argument("--window-days", type=int, default=30, help="Trend window, ending at the latest transaction")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--reuse", action="store_true", help="Benchmark the existing bench schemas if they hold --rows rows")
+    parser.add_argument("--cleanup", action="store_true", help="Drop the bench schemas and exit")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            cleanup(db)
+            sys.exit(0)
+        if not (args.reuse and table_rows(db, "bench_plain") == args.rows == table_rows(db, "bench_partitioned")):
+            build(db, args.rows, args.clients, args.months)
+    finally:
+        db.close()
+    benchmark(args.runs, args.window_days)
@@ -7,6 +7,7 @@ from app.services.ml_service import ml_service
 
 def debug_ml():
     print("Testing ML Service...")
+    ml_service.load()
     
     # Test SLA Prediction
     req = {
@@ -0,0 +1,37 @@
+import sys
+import os
+import argparse
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.partition_repo import partition_repo
+
+def manage_partitions(months_ahead: int, list_only: bool = False):
+    """
+    Create the upcoming monthly transactions partitions and split months out of
+    the default partition. For cron, when the API's own maintenance is disabled.
+    """
+    db = SessionLocal()
+    try:
+        if not list_only:
+            created = partition_repo.ensure_partitions(db, months_ahead)
+            db.commit()
+            print(f"Created {created} partitions.")
+        for partition in partition_repo.list_partitions(db):
+            print(f"{partition['name']:<26} {partition['estimated_rows']:>12}  {partition['bounds']}")
+    except Exception as e:
+        db.rollback()
+        print(f"Partition maintenance failed: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of transactions.")
+    parser.add_argument("--months-ahead", type=int, default=settings.TRANSACTION_PARTITION_MONTHS_AHEAD,
+                        help="Months after the current one to create partitions for")
+    parser.add_argument("--list", action="store_true", help="Only list the partitions and their estimated row counts")
+    args = parser.parse_args()
+    manage_partitions(args.months_ahead, args.list)
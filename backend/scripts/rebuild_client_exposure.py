@@ -0,0 +1,31 @@
+import sys
+import os
+import time
+import argparse
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import SessionLocal
+from app.repositories.client_exposure_repo import client_exposure_repo
+
+def rebuild_client_exposure(ranks_only: bool = False):
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if ranks_only:
+            changed = client_exposure_repo.recompute_ranks(db)
+            print(f"Re-ranked client exposure ({changed} clients changed) in {time.perf_counter() - started:.2f}s")
+        else:
+            written = client_exposure_repo.rebuild(db)
+            print(f"Rebuilt exposure for {written} clients in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        print(f"Rebuild Failed: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild client_exposure from the transactions table.")
+    parser.add_argument("--ranks-only", action="store_true", help="Only recompute region ranks and quartiles from the current totals")
+    args = parser.parse_args()
+    rebuild_client_exposure(args.ranks_only)
@@ -0,0 +1,42 @@
+import sys
+import os
+import argparse
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import SessionLocal
+from app.repositories.kpi_repo import kpi_repo
+
+def reconcile_kpis(fix: bool = False) -> bool:
+    """
+    Compare the kpi_counters running totals with a full recompute from kpis.sql.
+    Returns True when there is no drift.
+    """
+    db = SessionLocal()
+    try:
+        report = kpi_repo.reconcile(db, fix=fix)
+        drifted = False
+        for field, values in report.items():
+            marker = "DRIFT" if values["drift"] else "ok"
+            drifted = drifted or bool(values["drift"])
+            print(f"{field:<20} counter={values['counter']:<22} actual={values['actual']:<22} drift={values['drift']:<12} {marker}")
+
+        if drifted and fix:
+            print("Drift added to the counters.")
+        elif drifted:
+            print("Drift detected; rerun with --fix to correct the counters.")
+        else:
+            print("Counters match kpis.sql.")
+        return not drifted
+    except Exception as e:
+        print(f"Reconciliation Failed: {e}")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check kpi_counters against kpis.sql.")
+    parser.add_argument("--fix", action="store_true", help="Add the drift to the counters so they match the recomputed totals")
+    args = parser.parse_args()
+    sys.exit(0 if reconcile_kpis(args.fix) else 1)
@@ -1,18 +1,232 @@
 import sys
 import os
+import io
+import time
+import argparse
+import numpy as np
 import pandas as pd
 import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from app.core.copy_io import copy_csv_into
 from app.core.database import SessionLocal, engine, Base
 from app.models.client import Client
 from app.models.transaction import Transaction
 from app.models.operation import Operation
+from app.repositories.client_exposure_repo import client_exposure_repo
+from app.repositories.daily_stats_repo import daily_stats_repo
+from app.repositories.kpi_repo import kpi_repo
+from app.repositories.partition_repo import partition_repo
+from app.repositories.transaction_repo import transaction_repo
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+REGIONS = np.array(['North America', 'Europe', 'APAC', 'LATAM'])
+
+# table -> (source CSV, model)
+SOURCES = {
+    "clients": ("finsight2_clients.csv", Client),
+    "transactions": ("finsight2_transactions.csv", Transaction),
+    "operations": ("finsight2_operations.csv", Operation),
+}
+
+# Per loader session, for rebuilding the deferred indexes
+INDEX_BUILD_MEMORY = "256MB"
+
+# Secondary indexes, and the primary/unique constraints with their indexes
+INDEX_DEFINITIONS_QUERY = text("""
+    SELECT c.relname, pg_get_indexdef(x.indexrelid)
+    FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+    WHERE x.indrelid = CAST(:table AS regclass)
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = x.indexrelid)
+""")
+KEY_DEFINITIONS_QUERY = text("""
+    SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+    WHERE conrelid = CAST(:table AS regclass) AND contype IN ('p', 'u')
+""")
+# Foreign keys on or pointing at any of the loaded tables (not the copies on partitions)
+FOREIGN_KEYS_QUERY = text("""
+    SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint
+    WHERE contype = 'f' AND conparentid = 0
+      AND (conrelid::regclass::text = ANY(:tables) OR confrelid::regclass::text = ANY(:tables))
+""")
+
+def derive_clients(chunk: pd.DataFrame, rng: np.random.Generator, now: datetime) -> pd.DataFrame:
+    # Columns: client_id, industry, risk_rating, revenue_band, compliance_score
+    return pd.DataFrame({
+        "client_id": chunk["client_id"],
+        "name": "Client " + chunk["client_id"].astype(str) + " (" + chunk["industry"].astype(str) + ")",
+        "region": rng.choice(REGIONS, size=len(chunk)),
+        "risk_rating": chunk["risk_rating"],
+        "joined_date": pd.Timestamp(now) - pd.to_timedelta(rng.integers(0, 1001, size=len(chunk)), unit="D"),
+    })
+
+def derive_transactions(chunk: pd.DataFrame, rng: np.random.Generator, now: datetime) -> pd.DataFrame:
+    # Columns: transaction_id, client_id, region, asset_class, channel, transaction_value, transaction_timestamp, risk_rating, failed, status
+    return pd.DataFrame({
+        "transaction_id": chunk["transaction_id"].astype(str),
+        "client_id": chunk["client_id"],
+        "amount": chunk["transaction_value"],
+        "currency": "USD",
+        "status": chunk["status"],
+        "transaction_date": pd.to_datetime(chunk["transaction_timestamp"]),
+        # Synthetic: 5% of transactions breach their SLA
+        "sla_breach_flag": rng.random(len(chunk)) < 0.05,
+    })
+
+def derive_operations(chunk: pd.DataFrame, rng: np.random.Generator, now: datetime) -> pd.DataFrame:
+    # Columns: transaction_id, validation_time, risk_check_time, execution_time, settlement_time, total_processing_time, sla_breach_flag, manual_intervention_flag
+    status = np.select(
+        [chunk["manual_intervention_flag"].astype(bool), chunk["sla_breach_flag"].astype(bool)],
+        ["Intervention Required", "SLA Breach"],
+        "Operational"
+    )
+    return pd.DataFrame({
+        "operation_id": chunk["transaction_id"].astype(str),
+        "region": rng.choice(REGIONS, size=len(chunk)),
+        "status": status,
+        "last_updated": now,
+        "details": "Total Time: " + chunk["total_processing_time"].astype(str) + "s",
+    })
+
+DERIVE = {
+    "clients": derive_clients,
+    "transactions": derive_transactions,
+    "operations": derive_operations,
+}
+
+def load_table(table: str, path: str, chunk_size: int, seed: np.random.SeedSequence) -> Dict[str, float]:
+    """
+    Load one empty table in a single transaction: drop its indexes and keys, COPY
+    the CSV chunk by chunk, then rebuild them. Runs in a worker process.
+    """
+    # Connections inherited from the parent process must not be reused here
+    engine.dispose(close=False)
+    rng = np.random.default_rng(seed)
+    columns = [column.name for column in SOURCES[table][1].__table__.columns]
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.execute(text(f"SET LOCAL maintenance_work_mem = '{INDEX_BUILD_MEMORY}'"))
+        # Partitioned indexes come back as "ON ONLY"; rebuilt without it, they cover the partitions too
+        indexes = [(name, definition.replace(" ON ONLY ", " ON ", 1)) for name, definition in db.execute(INDEX_DEFINITIONS_QUERY, {"table": table}).all()]
+        partitioned = table == "transactions" and partition_repo.is_partitioned(db)
+        keys = db.execute(KEY_DEFINITIONS_QUERY, {"table": table}).all()
+        for name, _ in indexes:
+            db.execute(text(f'DROP INDEX "{name}"'))
+        for name, _ in keys:
+            db.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"'))
+
+        started = time.perf_counter()
+        rows = 0
+        for chunk in pd.read_csv(path, chunksize=chunk_size):
+            frame = DERIVE[table](chunk, rng, now)
+            if partitioned:
+                # Monthly partitions for the chunk's dates, so nothing lands in the default partition
+                dates = frame["transaction_date"]
+                partition_repo.ensure_range(db, dates.min().date(), dates.max().date())
+            data = frame.to_csv(header=False, index=False, columns=columns, date_format="%Y-%m-%d %H:%M:%S.%f")
+            copy_csv_into(db, table, columns, io.BytesIO(data.encode()))
+            rows += len(frame)
+            print(f"{table}: {rows} rows copied...")
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for name, definition in keys:
+            db.execute(text(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}'))
+        for _, definition in indexes:
+            db.execute(text(definition))
+        db.commit()
+        index_seconds = time.perf_counter() - started
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return {"rows": rows, "load_seconds": load_seconds, "index_seconds": index_seconds}
 
-def seed_data():
+def seed_data_copy(data_dir: str = "..", chunk_size: int = 100_000, workers: int = 3, seed: Optional[int] = None):
+    """
+    Load the CSVs into whichever tables are empty. Columns are derived with
+    vectorized pandas/NumPy per chunk and streamed into COPY; the tables load
+    in parallel worker processes with their indexes built after the load.
+    """
+    db: Session = SessionLocal()
+    try:
+        tables: List[str] = []
+        for table in SOURCES:
+            if db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar():
+                print(f"{table.capitalize()} already seeded.")
+            else:
+                tables.append(table)
+        if not tables:
+            return
+
+        # Tables load concurrently, so foreign keys are only checked once at the end
+        foreign_keys = db.execute(FOREIGN_KEYS_QUERY, {"tables": tables}).all()
+        for owner, name, _ in foreign_keys:
+            db.execute(text(f'ALTER TABLE {owner} DROP CONSTRAINT "{name}"'))
+        db.commit()
+        # The workers must not inherit the pooled connection
+        db.close()
+        engine.dispose()
+
+        started = time.perf_counter()
+        results: Dict[str, Dict[str, float]] = {}
+        try:
+            seeds = np.random.SeedSequence(seed).spawn(len(tables))
+            with ProcessPoolExecutor(max_workers=min(workers, len(tables))) as pool:
+                futures = {
+                    table: pool.submit(load_table, table, os.path.join(data_dir, SOURCES[table][0]), chunk_size, table_seed)
+                    for table, table_seed in zip(tables, seeds)
+                }
+                for table, future in futures.items():
+                    try:
+                        results[table] = future.result()
+                    except Exception as e:
+                        print(f"Error seeding {table}: {e}")
+        finally:
+            for owner, name, definition in foreign_keys:
+                try:
+                    db.execute(text(f'ALTER TABLE {owner} ADD CONSTRAINT "{name}" {definition}'))
+                    db.commit()
+                except Exception as e:
+                    # Keep checking new rows; the loaded ones need fixing before VALIDATE CONSTRAINT
+                    print(f"Error restoring foreign key {name} on {owner}, re-added as NOT VALID: {e}")
+                    db.rollback()
+                    db.execute(text(f'ALTER TABLE {owner} ADD CONSTRAINT "{name}" {definition} NOT VALID'))
+                    db.commit()
+        elapsed = time.perf_counter() - started
+
+        for table in results:
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+        if "transactions" in results:
+            ids = transaction_repo.register_ids(db)
+            print(f"Registered {ids} transaction ids.")
+            days = daily_stats_repo.backfill(db)
+            print(f"Daily stats rebuilt for {days} days.")
+            exposed = client_exposure_repo.rebuild(db)
+            print(f"Client exposure rebuilt for {exposed} clients.")
+        # COPY bypasses the repositories, so reset the KPI counters from the loaded data
+        kpi_repo.reconcile(db, fix=True)
+        print("KPI counters reconciled.")
+
+        print(f"\n{'table':<14} {'rows':>10} {'load s':>8} {'index s':>8} {'rows/s':>10}")
+        for table, result in results.items():
+            rate = result["rows"] / result["load_seconds"] if result["load_seconds"] else 0
+            print(f"{table:<14} {result['rows']:>10} {result['load_seconds']:>8.1f} {result['index_seconds']:>8.1f} {rate:>10.0f}")
+        total = sum(result["rows"] for result in results.values())
+        print(f"{'total':<14} {total:>10} {elapsed:>17.1f} {total / elapsed if elapsed else 0:>10.0f}  (wall clock, incl. indexes and keys)")
+    finally:
+        db.close()
+
+def seed_data(data_dir: str = ".."):
     db: Session = SessionLocal()
     
     # Check Clients
@@ -21,7 +235,7 @@ def seed_data():
             print("Clients already seeded.")
         else:
             print("Loading Clients...")
-            clients_df = pd.read_csv('../finsight2_clients.csv')
+            clients_df = pd.read_csv(os.path.join(data_dir, 'finsight2_clients.csv'))
             # Columns: client_id, industry, risk_rating, revenue_band, compliance_score
             
             # Map client_id to region from transactions?
@@ -57,7 +271,7 @@ def seed_data():
         else:
             print("Loading Transactions...")
             # Columns: transaction_id, client_id, region, asset_class, channel, transaction_value, transaction_timestamp, risk_rating, failed, status
-            txns_df = pd.read_csv('../finsight2_transactions.csv')
+            txns_df = pd.read_csv(os.path.join(data_dir, 'finsight2_transactions.csv'))
             txns_df['transaction_timestamp'] = pd.to_datetime(txns_df['transaction_timestamp'])
             
             txns = []
@@ -96,10 +310,25 @@ def seed_data():
                 db.commit()
             print("\nTransactions loaded.")
 
+            # bulk_save_objects bypasses the repository, so register the ids and rebuild the rollups in one pass
+            ids = transaction_repo.register_ids(db)
+            print(f"Registered {ids} transaction ids.")
+            days = daily_stats_repo.backfill(db)
+            print(f"Daily stats rebuilt for {days} days.")
+            exposed = client_exposure_repo.rebuild(db)
+            print(f"Client exposure rebuilt for {exposed} clients.")
+
     except Exception as e:
         print(f"Error seeding transactions: {e}")
         db.rollback()
 
+    # Bulk loads bypass the repositories, so reset the KPI counters from the loaded data
+    try:
+        kpi_repo.reconcile(db, fix=True)
+        print("KPI counters reconciled.")
+    except Exception as e:
+        print(f"Error reconciling KPI counters: {e}")
+
     # Check Operations
     try:
         if db.query(Operation).count() > 0:
@@ -107,7 +336,7 @@ def seed_data():
         else:
             print("Loading Operations...")
             # Columns: transaction_id, validation_time, risk_check_time, execution_time, settlement_time, total_processing_time, sla_breach_flag, manual_intervention_flag
-            ops_df = pd.read_csv('../finsight2_operations.csv')
+            ops_df = pd.read_csv(os.path.join(data_dir, 'finsight2_operations.csv'))
             
             ops = []
             for i, row in ops_df.iterrows():
@@ -146,4 +375,15 @@ def seed_data():
         db.close()
 
 if __name__ == "__main__":
-    seed_data()
+    parser = argparse.ArgumentParser(description="Load the finsight2 CSVs into the empty tables")
+    parser.add_argument("--mode", choices=["copy", "orm"], default="copy",
+                        help="copy: vectorized, parallel COPY load (default); orm: the original row-by-row loader")
+    parser.add_argument("--data-dir", default="..", help="Directory holding the finsight2_*.csv files")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="CSV rows per COPY chunk")
+    parser.add_argument("--workers", type=int, default=3, help="Tables loaded in parallel")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the synthetic columns")
+    args = parser.parse_args()
+    if args.mode == "copy":
+        seed_data_copy(args.data_dir, args.chunk_size, args.workers, args.seed)
+    else:
+        seed_data(args.data_dir)
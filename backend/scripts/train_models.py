@@ -1,10 +1,17 @@
 import sys
 import os
+import time
+import json
+import shutil
+import argparse
+import tempfile
+import tracemalloc
 import pandas as pd
 import numpy as np
 import joblib
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy import create_engine
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler, OneHotEncoder, LabelEncoder
 from sklearn.compose import ColumnTransformer
@@ -15,8 +22,91 @@ from sklearn.impute import SimpleImputer
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.core.config import settings
+from app.core.ml_paths import MODELS_DIR, MANIFEST_FILE
 
-def train_models():
+NUMERIC_FEATURES = ['amount']
+CATEGORICAL_FEATURES = ['risk_rating', 'region']
+
+TRAINING_QUERY = """
+    SELECT t.amount, t.status, t.sla_breach_flag, c.risk_rating, c.region
+    FROM transactions t
+    JOIN clients c ON t.client_id = c.client_id
+"""
+
+def save_models(clf_sla, clf_failure, preprocessor, iso_forest):
+    """
+    Write the three artifacts to a new generation directory, then point the
+    manifest at it with one rename, so a hot-reloading API never sees a mix of
+    old and new models. The previous generation is kept for workers that may still
+    be loading it; older ones are removed.
+    """
+    generation = f"generation-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+    save_dir = os.path.join(MODELS_DIR, generation)
+    os.makedirs(save_dir)
+
+    print(f"Saving models to {save_dir}...")
+    joblib.dump(clf_sla, os.path.join(save_dir, 'sla_model.joblib'))
+    joblib.dump(clf_failure, os.path.join(save_dir, 'failure_model.joblib'))
+    # IsolationForest is not a transformer, so it is bundled with the preprocessor it needs
+    joblib.dump({'preprocessor': preprocessor, 'model': iso_forest}, os.path.join(save_dir, 'anomaly_model.joblib'))
+
+    manifest_path = os.path.join(MODELS_DIR, MANIFEST_FILE)
+    previous = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)["generation"]
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"generation": generation}, f)
+    os.replace(tmp_path, manifest_path)
+
+    for name in os.listdir(MODELS_DIR):
+        if name.startswith("generation-") and name not in (generation, previous):
+            shutil.rmtree(os.path.join(MODELS_DIR, name), ignore_errors=True)
+
+def build_preprocessor(categories=None) -> ColumnTransformer:
+    """
+    The one preprocessor all three models share. Dense output (sparse_threshold=0)
+    so the transformed matrix can be saved once and memory-mapped by the workers.
+    """
+    encoder = OneHotEncoder(categories=categories, handle_unknown='ignore') if categories else OneHotEncoder(handle_unknown='ignore')
+    return ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), NUMERIC_FEATURES),
+            ('cat', encoder, CATEGORICAL_FEATURES)
+        ],
+        sparse_threshold=0)
+
+def fit_model(name: str, estimator, matrix_path: str, target=None):
+    """
+    Fit one model on the shared transformed matrix. Runs in a worker process;
+    the matrix is memory-mapped, not copied per job.
+    Returns (name, fitted estimator, wall seconds, peak traced bytes of the fit).
+    """
+    X = np.load(matrix_path, mmap_mode='r')
+    tracemalloc.start()
+    started = time.perf_counter()
+    if target is None:
+        estimator.fit(X)
+    else:
+        estimator.fit(X, target)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return name, estimator, seconds, peak
+
+def save_matrix(X, directory: str) -> str:
+    path = os.path.join(directory, 'features.npy')
+    np.save(path, np.ascontiguousarray(X, dtype=np.float64))
+    return path
+
+def print_report(timings, elapsed: float):
+    print(f"\n{'model':<10} {'wall s':>8} {'peak MB':>9}")
+    for name, (seconds, peak) in timings.items():
+        print(f"{name:<10} {seconds:>8.2f} {peak / 1024 / 1024:>9.1f}")
+    print(f"{'total':<10} {elapsed:>8.2f}  (wall clock)")
+
+def train_models(limit: int = 50000, workers: int = 3):
     print("Connecting to database...")
     # Create engine directly to use with pandas
     engine = create_engine(settings.sqlalchemy_database_uri)
@@ -25,17 +115,7 @@ def train_models():
         # 1. Fetch Data
         print("Fetching training data...")
         # Actually join transaction and client tables
-        query = """
-        SELECT 
-            t.amount, 
-            t.status, 
-            t.sla_breach_flag,
-            c.risk_rating, 
-            c.region
-        FROM transactions t
-        JOIN clients c ON t.client_id = c.client_id
-        LIMIT 50000
-        """
+        query = f"{TRAINING_QUERY} LIMIT {limit}"
         
         # Use pandas read_sql with connection context
         with engine.connect() as conn:
@@ -43,68 +123,197 @@ def train_models():
         
         print(f"Data shape: {df.shape}")
 
-        # Preprocessing
-        # Target 1: SLA Breach (Binary)
-        # Target 2: Status (Failed vs Success) -> Binary
-        
-        df['target_sla'] = df['sla_breach_flag'].astype(int)
-        df['target_failure'] = (df['status'] == 'Failed').astype(int)
-        
-        # Features
-        # Numerical: amount
-        # Categorical: risk_rating, region
-        
-        numeric_features = ['amount']
-        categorical_features = ['risk_rating', 'region']
-
-        preprocessor = ColumnTransformer(
-            transformers=[
-                ('num', StandardScaler(), numeric_features),
-                ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-            ])
-
-        # --- Model 1: SLA Breach Predictor (Logistic Regression) ---
-        print("Training SLA Breach Predictor...")
-        clf_sla = Pipeline(steps=[('preprocessor', preprocessor),
-                                  ('classifier', LogisticRegression(max_iter=1000, class_weight='balanced'))])
-        
-        # If dataset is too imbalanced or small, this might be weak, but sufficient for demo
-        clf_sla.fit(df[numeric_features + categorical_features], df['target_sla'])
-        
-        # --- Model 2: Failure Predictor (Logistic Regression) ---
-        print("Training Failure Predictor...")
-        clf_failure = Pipeline(steps=[('preprocessor', preprocessor),
-                                      ('classifier', LogisticRegression(max_iter=1000, class_weight='balanced'))])
-        
-        clf_failure.fit(df[numeric_features + categorical_features], df['target_failure'])
+        # Targets: SLA breach, and failed vs. not failed
+        target_sla = df['sla_breach_flag'].astype(int).to_numpy()
+        target_failure = (df['status'] == 'Failed').astype(int).to_numpy()
 
-        # --- Model 3: Anomaly Detector (Isolation Forest) ---
-        print("Training Anomaly Detector...")
-        # Isolation Forest only needs features, unsupervised
-        # We process features first manually to pass to IF which doesn't support pipelines easily with raw data mixed types usually needs transforming first if we want to pipe.
-        # But we can use the same preprocessor transform.
-        
-        X_processed = preprocessor.fit_transform(df[numeric_features + categorical_features])
-        iso_forest = IsolationForest(contamination=0.05, random_state=42)
-        iso_forest.fit(X_processed)
+        # Fit and apply the preprocessor once; every model trains on the same matrix
+        preprocessor = build_preprocessor()
+        X_processed = preprocessor.fit_transform(df[NUMERIC_FEATURES + CATEGORICAL_FEATURES])
+        del df
 
-        # Save Models
-        save_dir = os.path.join(os.path.dirname(__file__), '../app/ml_models')
-        os.makedirs(save_dir, exist_ok=True)
-        
-        print(f"Saving models to {save_dir}...")
-        joblib.dump(clf_sla, os.path.join(save_dir, 'sla_model.joblib'))
-        joblib.dump(clf_failure, os.path.join(save_dir, 'failure_model.joblib'))
-        # Save preprocessor and iso_forest separately or together? 
-        # For IF, we need the preprocessor. Let's save a pipeline-like object or just valid objects.
-        # Actually IF is not a transformer, it's an estimator.
-        # We can bundle the preprocessor and the model.
-        joblib.dump({'preprocessor': preprocessor, 'model': iso_forest}, os.path.join(save_dir, 'anomaly_model.joblib'))
-        
+        jobs = {
+            'sla': (LogisticRegression(max_iter=1000, class_weight='balanced'), target_sla),
+            'failure': (LogisticRegression(max_iter=1000, class_weight='balanced'), target_failure),
+            'anomaly': (IsolationForest(contamination=0.05, random_state=42, n_jobs=-1), None),
+        }
+        print("Training SLA, failure and anomaly models in parallel...")
+        started = time.perf_counter()
+        fitted, timings = {}, {}
+        with tempfile.TemporaryDirectory() as directory:
+            matrix_path = save_matrix(X_processed, directory)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(fit_model, name, estimator, matrix_path, target) for name, (estimator, target) in jobs.items()]
+                for future in futures:
+                    name, estimator, seconds, peak = future.result()
+                    fitted[name] = estimator
+                    timings[name] = (seconds, peak)
+        print_report(timings, time.perf_counter() - started)
+
+        # Pipelines around the already fitted preprocessor, as the API loads them
+        clf_sla = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', fitted['sla'])])
+        clf_failure = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', fitted['failure'])])
+        iso_forest = fitted['anomaly']
+
+        save_models(clf_sla, clf_failure, preprocessor, iso_forest)
+        print("Training complete.")
+
+    except Exception as e:
+        print(f"Error training models: {e}")
+
+class Reservoir:
+    """
+    Uniform random sample of fixed size over a stream of DataFrame chunks
+    (Algorithm R, vectorized per chunk). Kept as one array per column.
+    """
+
+    def __init__(self, size: int, rng: np.random.Generator):
+        self.size = size
+        self.rng = rng
+        self.seen = 0
+        self.columns = None
+
+    def add(self, chunk: pd.DataFrame):
+        positions = self.seen + np.arange(len(chunk))
+        # The first `size` rows fill the sample; row i after that replaces a random slot with probability size / (i + 1)
+        slots = np.where(positions < self.size, positions, self.rng.integers(0, positions + 1))
+        keep = slots < self.size
+        if self.columns is None:
+            self.columns = {name: np.empty(self.size, dtype=chunk[name].to_numpy().dtype) for name in chunk}
+        for name, values in self.columns.items():
+            values[slots[keep]] = chunk[name].to_numpy()[keep]
+        self.seen += len(chunk)
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        filled = min(self.seen, self.size)
+        return pd.DataFrame({name: values[:filled] for name, values in self.columns.items()})
+
+def stream_training_data(engine, chunk_size: int):
+    """
+    The training join in chunks from a server-side cursor.
+    """
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+        for chunk in pd.read_sql(TRAINING_QUERY, conn, chunksize=chunk_size):
+            yield chunk.dropna(subset=NUMERIC_FEATURES + CATEGORICAL_FEATURES)
+
+def balanced_weights(counts: np.ndarray) -> np.ndarray:
+    # What class_weight='balanced' computes, from the full-table class counts
+    total = counts.sum()
+    return np.where(counts > 0, total / (len(counts) * np.maximum(counts, 1)), 1.0)
+
+def train_models_chunked(chunk_size: int = 100_000, sample_size: int = 100_000, epochs: int = 1):
+    """
+    Train on the full transaction history in two streaming passes, holding at
+    most one chunk plus the anomaly sample in memory:
+    1. fit the scaler with partial_fit, collect the categories and class counts,
+       and keep a reservoir sample for the IsolationForest (which fits on a
+       sample anyway: max_samples per tree);
+    2. train the classifiers with SGDClassifier(loss='log_loss').partial_fit,
+       a logistic regression like the sample mode's, so the compiled inference
+       path applies unchanged. The IsolationForest trains on the sample in a
+       worker process meanwhile.
+    """
+    print("Connecting to database...")
+    engine = create_engine(settings.sqlalchemy_database_uri)
+    rng = np.random.default_rng(42)
+
+    try:
+        started = time.perf_counter()
+        print("Pass 1: scaler, categories and anomaly sample...")
+        scaler = StandardScaler()
+        categories = {feature: set() for feature in CATEGORICAL_FEATURES}
+        sla_counts = np.zeros(2)
+        failure_counts = np.zeros(2)
+        reservoir = Reservoir(sample_size, rng)
+        rows = 0
+        for chunk in stream_training_data(engine, chunk_size):
+            scaler.partial_fit(chunk[NUMERIC_FEATURES])
+            for feature in CATEGORICAL_FEATURES:
+                categories[feature].update(chunk[feature].unique())
+            sla_counts += np.bincount(chunk['sla_breach_flag'].astype(int), minlength=2)
+            failure_counts += np.bincount((chunk['status'] == 'Failed').astype(int), minlength=2)
+            reservoir.add(chunk[NUMERIC_FEATURES + CATEGORICAL_FEATURES])
+            rows += len(chunk)
+            print(f"  {rows} rows...", end='\r')
+        print(f"\n  {rows} rows in {time.perf_counter() - started:.1f}s")
+        if rows == 0:
+            print("No training data.")
+            return
+
+        # Fitted on the sample so the encoder gets the full-table categories,
+        # then given the scaler statistics of the full table
+        preprocessor = build_preprocessor([sorted(categories[f]) for f in CATEGORICAL_FEATURES])
+        sample = reservoir.sample
+        preprocessor.fit(sample)
+        fitted_scaler = preprocessor.named_transformers_['num']
+        for attribute in ('mean_', 'var_', 'scale_', 'n_samples_seen_'):
+            setattr(fitted_scaler, attribute, getattr(scaler, attribute))
+
+        with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor(max_workers=1) as pool:
+            # The anomaly model only needs the sample, so it trains while pass 2 streams
+            print(f"Training Anomaly Detector on a {len(sample)} row sample in the background...")
+            matrix_path = save_matrix(preprocessor.transform(sample), directory)
+            anomaly_future = pool.submit(fit_model, 'anomaly', IsolationForest(contamination=0.05, random_state=42, n_jobs=-1), matrix_path)
+            del sample
+
+            print("Pass 2: SLA breach and failure classifiers...")
+            # The balanced weights put large steps on the rare positive rows; a small fixed
+            # step with weight averaging lands on the logistic regression optimum
+            classifiers = {
+                'sla': SGDClassifier(loss='log_loss', learning_rate='adaptive', eta0=0.01, average=True, random_state=42),
+                'failure': SGDClassifier(loss='log_loss', learning_rate='adaptive', eta0=0.01, average=True, random_state=42),
+            }
+            weights = {'sla': balanced_weights(sla_counts), 'failure': balanced_weights(failure_counts)}
+            classes = np.array([0, 1])
+            timings = {name: [0.0, 0] for name in classifiers}
+            started = time.perf_counter()
+            for epoch in range(epochs):
+                epoch_started = time.perf_counter()
+                for chunk in stream_training_data(engine, chunk_size):
+                    # The join comes back in storage order; shuffle within the chunk for SGD
+                    chunk = chunk.sample(frac=1, random_state=rng.integers(2**32))
+                    # One transform per chunk, shared by both classifiers
+                    X = preprocessor.transform(chunk[NUMERIC_FEATURES + CATEGORICAL_FEATURES])
+                    targets = {
+                        'sla': chunk['sla_breach_flag'].astype(int).to_numpy(),
+                        'failure': (chunk['status'] == 'Failed').astype(int).to_numpy(),
+                    }
+                    for name, classifier in classifiers.items():
+                        # Traced around the fit only; tracing the streaming as well would slow it down
+                        tracemalloc.start()
+                        fit_started = time.perf_counter()
+                        classifier.partial_fit(X, targets[name], classes=classes, sample_weight=weights[name][targets[name]])
+                        timings[name][0] += time.perf_counter() - fit_started
+                        timings[name][1] = max(timings[name][1], tracemalloc.get_traced_memory()[1])
+                        tracemalloc.stop()
+                print(f"  epoch {epoch + 1}/{epochs} in {time.perf_counter() - epoch_started:.1f}s")
+
+            _, iso_forest, seconds, peak = anomaly_future.result()
+            timings['anomaly'] = (seconds, peak)
+        print_report({name: tuple(timing) for name, timing in timings.items()}, time.perf_counter() - started)
+
+        clf_sla = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifiers['sla'])])
+        clf_failure = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifiers['failure'])])
+
+        save_models(clf_sla, clf_failure, preprocessor, iso_forest)
         print("Training complete.")
 
     except Exception as e:
         print(f"Error training models: {e}")
 
 if __name__ == "__main__":
-    train_models()
+    parser = argparse.ArgumentParser(description="Train the SLA, failure and anomaly models")
+    parser.add_argument("--mode", choices=["chunked", "sample"], default="chunked",
+                        help="chunked: stream the full history (default); sample: in-memory fit on the first --limit rows")
+    parser.add_argument("--limit", type=int, default=50000, help="Rows for --mode sample")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per streamed chunk")
+    parser.add_argument("--sample-size", type=int, default=100_000, help="Reservoir size for the anomaly model")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the data for the classifiers")
+    parser.add_argument("--workers", type=int, default=3, help="Worker processes for --mode sample")
+    args = parser.parse_args()
+    if args.mode == "chunked":
+        train_models_chunked(args.chunk_size, args.sample_size, args.epochs)
+    else:
+        train_models(args.limit, args.workers)
@@ -0,0 +1,57 @@
+import sys
+import os
+import io
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, select, values
+from datetime import datetime
+from app.core.columnar import columnar_export, require_pyarrow
+
+# Strings a CSV reader might take for NULL, next to real NULLs and empty strings.
+# Every one has to come back exactly as stored.
+TRICKY_STRINGS = ["NA", "N/A", "n/a", "null", "NULL", "NaN", "nan", "#N/A", "None", "-", "", None, "plain", "with,comma", 'with "quotes"', "multi\nline"]
+
+COLUMNS = [
+    Column("id", Integer),
+    Column("label", String),
+    Column("amount", Float),
+    Column("flag", Boolean),
+    Column("created_at", DateTime),
+]
+
+def expected_rows():
+    return [
+        (i, label, None if i % 5 == 0 else i * 1.5, None if i % 3 == 0 else i % 2 == 0, None if i % 4 == 0 else datetime(2024, 1, 1 + i % 28, 12, 30))
+        for i, label in enumerate(TRICKY_STRINGS)
+    ]
+
+def round_trip(fmt: str):
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+
+    rows = expected_rows()
+    query = select(values(*[Column(c.name, c.type) for c in COLUMNS], name="rows").data(rows)).order_by("id")
+    data = io.BytesIO(b"".join(columnar_export(fmt, query, COLUMNS, block_size=64)))
+    table = pq.read_table(data) if fmt == "parquet" else pa_ipc.open_stream(data).read_all()
+    return rows, [tuple(row[c.name] for c in COLUMNS) for row in table.to_pylist()]
+
+def validate_columnar_export() -> bool:
+    require_pyarrow()
+    ok = True
+    for fmt in ("arrow", "parquet"):
+        rows, exported = round_trip(fmt)
+        mismatched = [(want, got) for want, got in zip(rows, exported) if want != got]
+        if len(rows) != len(exported):
+            mismatched.append((f"{len(rows)} rows", f"{len(exported)} rows"))
+        ok = ok and not mismatched
+        print(f"{fmt}: {len(exported)} rows, {len(mismatched)} mismatched")
+        for want, got in mismatched:
+            print(f"  expected {want!r}\n  got      {got!r}")
+
+    print("Round trip OK" if ok else "Round trip FAILED")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if validate_columnar_export() else 1)
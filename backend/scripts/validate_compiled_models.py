@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import itertools
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ml_service import ml_service
+from app.services.compiled_models import CompiledLogisticModel, CompiledPreprocessor
+
+TOLERANCE = 1e-9
+
+def build_records(bundle):
+    """
+    Every known category combination (plus an unseen one) across a spread of amounts.
+    """
+    preprocessor = bundle.anomaly_preprocessor.named_transformers_['cat']
+    risk_ratings = list(preprocessor.categories_[0]) + ["Unknown"]
+    regions = list(preprocessor.categories_[1]) + ["Unknown"]
+    amounts = [0.0, 1.0, 250.5, 5000.0, 50000.0, 118576.56, 1e6, 5e7]
+    return [
+        {"amount": amount, "risk_rating": rating, "region": region, "hour_of_day": 12, "transaction_type": "Transfer"}
+        for amount, rating, region in itertools.product(amounts, risk_ratings, regions)
+    ]
+
+def time_per_call(fn, records, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            fn(record)
+        best = min(best, time.perf_counter() - start)
+    return best / len(records) * 1e6
+
+def validate_compiled_models():
+    ml_service.load()
+    bundle = ml_service._bundle
+    if not bundle:
+        print("Models not loaded.")
+        return False
+
+    records = build_records(bundle)
+    df = pd.DataFrame(records)
+    ok = True
+
+    for name, pipeline in [("sla", bundle.sla_model), ("failure", bundle.failure_model)]:
+        compiled = CompiledLogisticModel.from_pipeline(pipeline)
+        expected = pipeline.predict_proba(df)[:, 1]
+        batch = compiled.predict_proba(records)
+        single = np.array([compiled.predict_proba_one(r) for r in records])
+        diff = max(np.abs(expected - batch).max(), np.abs(expected - single).max())
+        ok = ok and diff <= TOLERANCE
+
+        sklearn_us = time_per_call(lambda r: pipeline.predict_proba(pd.DataFrame([r])), records)
+        compiled_us = time_per_call(compiled.predict_proba_one, records)
+        print(f"{name}: max |diff| = {diff:.3e} | sklearn {sklearn_us:.1f} us/call, compiled {compiled_us:.1f} us/call")
+
+    compiled_pre = CompiledPreprocessor.from_column_transformer(bundle.anomaly_preprocessor)
+    diff = np.abs(bundle.anomaly_preprocessor.transform(df) - compiled_pre.transform(records)).max()
+    ok = ok and diff <= TOLERANCE
+    print(f"anomaly preprocessor: max |diff| = {diff:.3e}")
+
+    print("Parity OK" if ok else f"Parity FAILED (tolerance {TOLERANCE})")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if validate_compiled_models() else 1)
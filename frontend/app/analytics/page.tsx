@@ -48,7 +48,7 @@ export default function AnalyticsPage() {
     // Calculated metrics
     const totalVolume = data.kpis.total_volume;
     const avgTransactionSize = totalVolume / data.kpis.total_transactions;
-    const successRate = ((1 - data.kpis.sla_breach_rate) * 100).toFixed(1);
+    const successRate = (100 - data.kpis.sla_breach_rate).toFixed(1);
 
     return (
         <DashboardLayout>
@@ -168,7 +168,7 @@ export default function Dashboard() {
                       key={idx}
                       className="hover:bg-white/5 transition-colors group cursor-default"
                     >
-                      <td className="px-6 py-4 font-mono text-white">#{item.region_rank}</td>
+                      <td className="px-6 py-4 font-mono text-white">{item.region_rank === null ? '—' : `#${item.region_rank}`}</td>
                       <td className="px-6 py-4 font-medium text-white group-hover:text-primary-teal transition-colors">
                         {item.name}
                       </td>
@@ -184,7 +184,7 @@ export default function Dashboard() {
                       <td className="px-6 py-4 text-right text-white font-mono">
                         ${item.total_exposure.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 2 })}
                       </td>
-                      <td className="px-6 py-4 text-right">Q{item.exposure_quartile}</td>
+                      <td className="px-6 py-4 text-right">{item.exposure_quartile === null ? '—' : `Q${item.exposure_quartile}`}</td>
                     </tr>
                   ))
                 )}
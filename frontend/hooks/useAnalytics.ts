@@ -22,11 +22,18 @@ type AnalyticsData = {
         risk_rating: string;
         region: string;
         total_exposure: number;
-        region_rank: number;
-        exposure_quartile: number;
+        region_rank: number | null;
+        exposure_quartile: number | null;
     }>;
 };
 
+const EMPTY_KPIS: AnalyticsData["kpis"] = {
+    total_volume: 0,
+    total_transactions: 0,
+    high_risk_count: 0,
+    sla_breach_rate: 0,
+};
+
 export function useAnalytics(pollIntervalMs = 30000) {
     const [data, setData] = useState<AnalyticsData | null>(null);
     const [isLoading, setIsLoading] = useState(true);
@@ -39,7 +46,16 @@ export function useAnalytics(pollIntervalMs = 30000) {
             const response = await api.get<APIResponse<AnalyticsData>>('/analytics/dashboard');
 
             if (response.data.success) {
-                setData(response.data.data);
+                const next = response.data.data;
+                const failed = Object.keys(response.data.meta?.failed ?? {}) as Array<keyof AnalyticsData>;
+                // On a partial response keep the previous values of the sections that failed
+                setData(prev => {
+                    const merged = { ...next };
+                    for (const section of failed) {
+                        if (prev) (merged as any)[section] = prev[section];
+                    }
+                    return { ...merged, kpis: merged.kpis ?? EMPTY_KPIS };
+                });
                 setLastUpdated(new Date());
                 setError(null);
             } else {
@@ -14,8 +14,14 @@ export interface APIResponse<T> {
   data: T;
   meta?: {
     execution_time_ms: number;
+    db_time_ms?: number | null;
+    db_query_count?: number | null;
+    ml_time_ms?: number | null;
+    partial?: boolean;
+    failed?: Record<string, string> | null;
   };
   error?: string | null;
+  next_cursor?: string | null;
 }
 
 export const endpoints = {
@@ -26,12 +32,15 @@ export const endpoints = {
     predictSla: (data: any) => api.post<APIResponse<any>>('/ml/predict-sla', data),
     predictFailure: (data: any) => api.post<APIResponse<any>>('/ml/predict-failure', data),
     detectAnomaly: (data: any) => api.post<APIResponse<any>>('/ml/detect-anomaly', data),
+    score: (data: any) => api.post<APIResponse<any>>('/ml/score', data),
   },
   transactions: {
     list: (skip = 0, limit = 50) => api.get<APIResponse<any>>(`/transactions/?skip=${skip}&limit=${limit}`),
+    page: (cursor = "", limit = 50) => api.get<APIResponse<any>>(`/transactions/?limit=${limit}${cursor ? `&cursor=${cursor}` : ""}`),
   },
   clients: {
     list: (skip = 0, limit = 50, search = "") => api.get<APIResponse<any>>(`/clients/?skip=${skip}&limit=${limit}&search=${search}`),
+    page: (cursor = "", limit = 50, search = "") => api.get<APIResponse<any>>(`/clients/?limit=${limit}&search=${search}${cursor ? `&cursor=${cursor}` : ""}`),
   },
   risk: {
     overview: () => api.get<APIResponse<any>>('/risk/overview'),